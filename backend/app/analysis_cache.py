@@ -0,0 +1,134 @@
+"""
+Process-wide cache for grievance analysis results.
+
+Forwarded messages mean the same text is often submitted many times. This
+cache sits in front of the analyzer and is keyed by a hash of the
+normalized text plus the analyzer version, so edits to the keyword tables
+automatically stop old results from being served. Entries are bounded by
+an LRU limit and a TTL, and hit/miss counters are kept for monitoring.
+When micro-batching is enabled (batching.py), misses are analyzed through
+the batcher.
+
+Results are stored frozen (a read-only mapping with suggested_schemes as a
+tuple) and every call gets a shallow copy of the top level, with its own
+suggested_schemes list. Callers may replace or extend top-level fields,
+which is what the create endpoints do. The nested analysis_explanation is
+shared between calls and must be treated as read-only. Deep-copying it on
+every hit cost about as much as analyzing the text again.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from .ml_engine import analyzer as default_analyzer, normalize_text
+from .batching import analysis_batcher
+
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "10000"))
+ANALYSIS_CACHE_TTL_SECONDS = float(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "3600"))
+
+
+def _freeze(result):
+    """Read-only stored form of an analysis result"""
+    return MappingProxyType({**result, "suggested_schemes": tuple(result.get("suggested_schemes", ()))})
+
+
+def _thaw(frozen):
+    """Caller's copy of a stored result (top level only)"""
+    result = dict(frozen)
+    result["suggested_schemes"] = list(frozen["suggested_schemes"])
+    return result
+
+
+class AnalysisCache:
+    """Bounded LRU/TTL cache around GrievanceAnalyzer.analyze"""
+
+    def __init__(self, analyzer=default_analyzer, maxsize=ANALYSIS_CACHE_SIZE, ttl=ANALYSIS_CACHE_TTL_SECONDS):
+        self.analyzer = analyzer
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(text: str, version: str) -> str:
+        """Hash of analyzer version and normalized text"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalize_text(text).encode("utf-8"))
+        return digest.hexdigest()
+
+    def analyze(self, text: str):
+        """Return the analysis for text, running the analyzer only on a miss"""
+        version = self.analyzer.version
+        key = self.make_key(text or "", version)
+
+        with self._lock:
+            if version != self._version:
+                # Keyword tables changed: everything cached is stale
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._version = version
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, result = entry
+                if time.monotonic() - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _thaw(result)
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        # Analyze outside the lock; errors (e.g. too-short text) are not cached
+        result = _freeze(self.analyzer.analyze(text))
+
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = (time.monotonic(), result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return _thaw(result)
+
+    def clear(self):
+        """Drop all cached results"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss metrics for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "analyzer_version": self._version,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
+
+
+analysis_cache = AnalysisCache(analysis_batcher or default_analyzer)
+
+
+def analyze(text: str):
+    """Analyze text through the process-wide cache"""
+    return analysis_cache.analyze(text)
@@ -0,0 +1,138 @@
+"""
+Versioned, memory-mapped model artifacts.
+
+Trained analyzer artifacts (weight matrices, vocabularies, embedding
+indexes) are stored as plain .npy files and opened with np.load(mmap_mode="r").
+Every uvicorn worker that opens the same file shares one copy in the OS
+page cache instead of holding a private copy on its heap, and only the
+pages a prediction touches are read from disk, so start-up is near instant.
+
+Layout of an artifact directory:
+
+    <directory>/
+        CURRENT            name of the published version (swapped atomically)
+        v000007/
+            meta.json      version number plus free-form metadata
+            coef.npy       one .npy file per array
+            ...
+
+A version directory is written completely before CURRENT points to it and
+is never modified afterwards, so readers never see a partial artifact.
+Superseded versions are pruned; a worker that still has one mapped keeps
+a valid mapping after the files are unlinked.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+
+CURRENT_FILE = "CURRENT"
+META_FILE = "meta.json"
+
+# Published versions kept on disk (older ones are pruned)
+KEEP_VERSIONS = 3
+
+
+class Artifact:
+    """One published artifact version: metadata and read-only arrays"""
+
+    __slots__ = ("version", "meta", "arrays", "path")
+
+    def __init__(self, version, meta, arrays, path):
+        self.version = version
+        self.meta = meta
+        self.arrays = arrays
+        self.path = path
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+
+def _version_dir(version):
+    return f"v{version:06d}"
+
+
+def current_version(directory):
+    """Published version number in directory, or None if nothing is published"""
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as f:
+            return int(f.read().strip().lstrip("v"))
+    except (OSError, ValueError):
+        return None
+
+
+def publish(directory, version, arrays, meta=None, keep=KEEP_VERSIONS):
+    """
+    Write arrays as a new artifact version and make it current.
+
+    Args:
+        directory: Artifact directory (created if missing)
+        version: Integer version, higher than any published one
+        arrays: Mapping of name -> numpy array (object arrays are not allowed)
+        meta: JSON-serializable metadata stored with the version
+        keep: Published versions to keep on disk
+
+    Returns:
+        Path of the new version directory
+    """
+    name = _version_dir(version)
+    final_path = os.path.join(directory, name)
+    tmp_path = os.path.join(directory, f".{name}.tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    for array_name, array in arrays.items():
+        # C-contiguous so a memory map can be sliced without copying
+        np.save(os.path.join(tmp_path, f"{array_name}.npy"), np.ascontiguousarray(array), allow_pickle=False)
+    with open(os.path.join(tmp_path, META_FILE), "w", encoding="utf-8") as f:
+        json.dump({"version": version, **(meta or {})}, f, ensure_ascii=False)
+
+    shutil.rmtree(final_path, ignore_errors=True)
+    os.replace(tmp_path, final_path)
+
+    pointer_tmp = os.path.join(directory, f".{CURRENT_FILE}.tmp")
+    with open(pointer_tmp, "w") as f:
+        f.write(name)
+    os.replace(pointer_tmp, os.path.join(directory, CURRENT_FILE))
+
+    prune(directory, keep)
+    return final_path
+
+
+def load(directory, version=None, mmap=True):
+    """
+    Open a published artifact.
+
+    Args:
+        directory: Artifact directory
+        version: Version to open (default: CURRENT)
+        mmap: Map arrays read-only instead of reading them into memory
+
+    Returns:
+        Artifact, or None if nothing is published
+    """
+    version = current_version(directory) if version is None else version
+    if version is None:
+        return None
+    path = os.path.join(directory, _version_dir(version))
+    with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+        meta = json.load(f)
+    arrays = {
+        filename[:-len(".npy")]: np.load(
+            os.path.join(path, filename), mmap_mode="r" if mmap else None, allow_pickle=False
+        )
+        for filename in sorted(os.listdir(path)) if filename.endswith(".npy")
+    }
+    return Artifact(version, meta, arrays, path)
+
+
+def prune(directory, keep=KEEP_VERSIONS):
+    """Delete all but the newest `keep` version directories"""
+    versions = sorted(
+        name for name in os.listdir(directory)
+        if name.startswith("v") and name[1:].isdigit()
+    )
+    for name in versions[:-keep] if keep > 0 else []:
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
@@ -0,0 +1,166 @@
+"""
+Dynamic micro-batching in front of the analyzer.
+
+A model-based analyzer is much cheaper per text when it runs on a batch
+(one vectorized prediction instead of many). Requests are handled one per
+thread, though, so each would analyze its own text alone. The batcher
+collects concurrent analyze() calls on a queue: a background thread takes
+the first waiting text, keeps collecting for up to ANALYSIS_BATCH_WINDOW_MS
+or until ANALYSIS_BATCH_MAX_SIZE texts are waiting, runs them through
+analyze_batch() in one call and resolves each caller's future.
+
+Batching trades a little latency (at most the window) for throughput. It
+is off by default (ANALYSIS_BATCH_WINDOW_MS=0): the keyword analyzer gains
+nothing from batches. Realized batch sizes and the queueing delay added to
+each call are recorded for GET /admin/analysis-batching.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from .ml_engine import analyzer as default_analyzer
+from .shadow import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# How long (milliseconds) the first text of a batch waits for others; 0 disables batching
+ANALYSIS_BATCH_WINDOW_MS = float(os.getenv("ANALYSIS_BATCH_WINDOW_MS", "0"))
+ANALYSIS_BATCH_MAX_SIZE = int(os.getenv("ANALYSIS_BATCH_MAX_SIZE", "64"))
+
+# A caller gives up after this long (seconds) if the worker is stuck
+ANALYSIS_BATCH_TIMEOUT = float(os.getenv("ANALYSIS_BATCH_TIMEOUT", "10"))
+
+
+class MicroBatcher:
+    """Collects concurrent analyze() calls into analyze_batch() calls"""
+
+    def __init__(self, analyzer=default_analyzer, window_ms=ANALYSIS_BATCH_WINDOW_MS,
+                 max_batch_size=ANALYSIS_BATCH_MAX_SIZE, timeout=ANALYSIS_BATCH_TIMEOUT):
+        self.analyzer = analyzer
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self.reset()
+
+    @property
+    def version(self):
+        """Version of the wrapped analyzer (so caches can sit in front of the batcher)"""
+        return self.analyzer.version
+
+    def reset(self):
+        """Clear the metrics"""
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        self.max_realized = 0
+        self.batch_sizes = {}
+        self.queue_delay = LatencyHistogram()
+        self.batch_latency = LatencyHistogram()
+        self.started_at = datetime.utcnow()
+
+    def analyze(self, text: str):
+        """
+        Analyze one text as part of the next batch (blocks until it is done).
+
+        Returns the same result as analyzer.analyze(text) and raises the
+        same errors.
+        """
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((text, future, time.perf_counter()))
+        return future.result(timeout=self.timeout)
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="analysis-batcher", daemon=True)
+                self._worker.start()
+
+    def _collect(self):
+        """Block for the first waiting text, then gather more until the window closes or the batch is full"""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                self.run_batch(batch)
+            except Exception as e:
+                logger.error(f"Analysis batch failed: {str(e)}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def run_batch(self, batch):
+        """Analyze (text, future, enqueued_at) items together and resolve their futures"""
+        started = time.perf_counter()
+        texts = [text for text, _, _ in batch]
+        try:
+            results = [(result, None) for result in self.analyzer.analyze_batch(texts)]
+        except Exception:
+            # One bad text (e.g. too short) must not fail the others
+            results = []
+            for text in texts:
+                try:
+                    results.append((self.analyzer.analyze(text), None))
+                except Exception as e:
+                    results.append((None, e))
+        finished = time.perf_counter()
+
+        with self._lock:
+            self.batches += 1
+            self.items += len(batch)
+            self.max_realized = max(self.max_realized, len(batch))
+            bucket = 1 << (len(batch) - 1).bit_length()
+            self.batch_sizes[bucket] = self.batch_sizes.get(bucket, 0) + 1
+            self.batch_latency.record((finished - started) * 1000)
+            self.errors += sum(1 for _, error in results if error is not None)
+            for _, _, enqueued_at in batch:
+                self.queue_delay.record((started - enqueued_at) * 1000)
+
+        for (_, future, _), (result, error) in zip(batch, results):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stats(self):
+        """Realized batch sizes and the queueing delay added per call"""
+        with self._lock:
+            return {
+                "enabled": True,
+                "window_ms": self.window * 1000,
+                "max_batch_size": self.max_batch_size,
+                "batches": self.batches,
+                "items": self.items,
+                "errors": self.errors,
+                "mean_batch_size": round(self.items / self.batches, 2) if self.batches else None,
+                "max_realized_batch_size": self.max_realized,
+                "batch_sizes": [
+                    {"le": size, "batches": count} for size, count in sorted(self.batch_sizes.items())
+                ],
+                "queue_delay": self.queue_delay.to_dict(),
+                "batch_latency": self.batch_latency.to_dict(),
+                "queued": self._queue.qsize(),
+                "since": self.started_at.isoformat()
+            }
+
+
+analysis_batcher = MicroBatcher() if ANALYSIS_BATCH_WINDOW_MS > 0 else None
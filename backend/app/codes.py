@@ -0,0 +1,221 @@
+"""
+Small-integer codes for the grievance category, priority and status columns.
+
+These three columns repeat one of a handful of names on every grievance
+row (and in every index entry on them). They are stored as SMALLINT codes
+instead, with the names in lookup tables (grievance_categories,
+grievance_priorities, grievance_statuses). The CodedString column type
+converts both ways, so the ORM, filters and GROUP BYs keep working with
+names: Grievance.status == "Resolved" binds the code of "Resolved" and a
+selected status comes back as "Resolved".
+
+Names are normalized when written (case, whitespace, "_" and "-"), so
+"In progress", "in_progress" and "In Progress" are one status instead of
+three groups.
+
+The codes of the names the application ships with are fixed here and
+never depend on the database. Other names live only in the lookup tables:
+categories introduced by a new analyzer config are registered the first
+time they are written, and legacy values kept by migrate_enum_codes.py can
+be read and filtered on. Writing an unknown priority or status is an error.
+
+Only writes register names. A filter value (Grievance.category == "X",
+status.in_([...])) is looked up without registering or raising: an
+unknown name binds UNKNOWN_CODE, which matches no row.
+"""
+
+import logging
+import threading
+
+from sqlalchemy import SmallInteger, column, func, insert, select, table
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.types import TypeDecorator
+
+from .database import engine as default_engine
+from .ml_engine import analyzer as default_analyzer
+
+logger = logging.getLogger(__name__)
+
+# Fixed codes 1..n; only ever append to these lists
+CATEGORIES = (
+    "Healthcare", "Education", "Water Supply", "Roads & Transport",
+    "Electricity", "Sanitation", "General"
+)
+PRIORITIES = ("High", "Medium", "Low")
+STATUSES = ("Pending", "In Progress", "Resolved")
+
+# Bound for filter values that have no code; no row ever stores it
+UNKNOWN_CODE = -1
+
+
+def normalize_name(name):
+    """Comparison key of a name: case-folded, "_"/"-" as spaces, whitespace collapsed"""
+    return " ".join(name.replace("_", " ").replace("-", " ").split()).casefold()
+
+
+class CodeTable:
+    """Two-way name <-> code map of one lookup table"""
+
+    def __init__(self, table_name, names, extensible=False, bind=default_engine):
+        self.table = table(table_name, column("id"), column("name"))
+        self.fixed = tuple(names)
+        self.extensible = extensible
+        self.bind = bind
+        self._lock = threading.Lock()
+        self._set({code: name for code, name in enumerate(self.fixed, start=1)})
+
+    @property
+    def name(self):
+        return self.table.name
+
+    def _set(self, names):
+        # Swapped as a whole, so readers never see a half-built map
+        self._names = names
+        self._codes = {normalize_name(name): code for code, name in names.items()}
+
+    def names(self):
+        """Every known name by code"""
+        return dict(self._names)
+
+    def load(self, connection=None):
+        """
+        Seed the fixed names into the lookup table and read back any others.
+
+        Called on startup; lookups of unknown names and codes call it again.
+        """
+        with self._lock:
+            if connection is None:
+                with self.bind.begin() as conn:
+                    self._load(conn)
+            else:
+                self._load(connection)
+
+    def _load(self, conn):
+        stored = {code: name for code, name in conn.execute(select(self.table.c.id, self.table.c.name))}
+        missing = [
+            {"id": code, "name": name}
+            for code, name in enumerate(self.fixed, start=1) if code not in stored
+        ]
+        if missing:
+            conn.execute(insert(self.table), missing)
+        names = {code: name for code, name in enumerate(self.fixed, start=1)}
+        for code, name in stored.items():
+            if code not in names:
+                names[code] = name
+            elif normalize_name(names[code]) != normalize_name(name):
+                logger.error(f"{self.name} code {code} is {name!r} in the database, expected {names[code]!r}")
+        self._set(names)
+
+    def _register(self, name):
+        """Add a name under the next free code (another process may race us to it)"""
+        for _ in range(3):
+            try:
+                with self.bind.begin() as conn:
+                    self._load(conn)
+                    code = self._codes.get(normalize_name(name))
+                    if code is not None:
+                        return code
+                    code = (conn.execute(select(func.max(self.table.c.id))).scalar() or 0) + 1
+                    conn.execute(insert(self.table).values(id=code, name=name))
+                logger.info(f"Registered {self.name} code {code} for {name!r}")
+                self._set({**self._names, code: name})
+                return code
+            except IntegrityError:
+                continue
+        raise ValueError(f"Could not register {name!r} in {self.name}")
+
+    def code(self, name):
+        """Code of a name (normalized); unknown names are registered if the table is extensible"""
+        code = self._codes.get(normalize_name(name))
+        if code is not None:
+            return code
+        with self._lock:
+            code = self._codes.get(normalize_name(name))
+            if code is not None:
+                return code
+            if self.extensible:
+                return self._register(" ".join(name.split()))
+            with self.bind.begin() as conn:
+                self._load(conn)
+        code = self._codes.get(normalize_name(name))
+        if code is None:
+            raise ValueError(f"Unknown value {name!r} for {self.name}; expected one of {sorted(self._names.values())}")
+        return code
+
+    def find(self, name):
+        """Code of a name (normalized) for filtering; UNKNOWN_CODE if it has none (never registers)"""
+        code = self._codes.get(normalize_name(name))
+        if code is None and self.extensible:
+            # Another process may have registered it since we last loaded
+            self.load()
+            code = self._codes.get(normalize_name(name))
+        return UNKNOWN_CODE if code is None else code
+
+    def lookup(self, code):
+        """Name of a code (None if it is not in the lookup table)"""
+        name = self._names.get(code)
+        if name is None:
+            self.load()
+            name = self._names.get(code)
+            if name is None:
+                logger.error(f"Unknown {self.name} code {code}")
+        return name
+
+
+category_codes = CodeTable("grievance_categories", CATEGORIES, extensible=True)
+priority_codes = CodeTable("grievance_priorities", PRIORITIES)
+status_codes = CodeTable("grievance_statuses", STATUSES)
+
+
+def load_codes(categories=None):
+    """
+    Seed and load every lookup table, and register the analyzer's categories
+    (call after create_all, before the first request writes a grievance).
+    """
+    for codes in (category_codes, priority_codes, status_codes):
+        codes.load()
+    for category in (default_analyzer.categories if categories is None else categories):
+        category_codes.code(category)
+
+
+class CodedString(TypeDecorator):
+    """String column stored as the SMALLINT code of a CodeTable"""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, codes):
+        super().__init__()
+        self.codes = codes
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self.codes.code(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self.codes.lookup(value)
+
+    def process_literal_param(self, value, dialect):
+        return str(self.process_bind_param(value, dialect))
+
+    def coerce_compared_value(self, op, value):
+        # Values compared against the column (filters) are looked up, not registered
+        return CodedFilter(self.codes)
+
+    @property
+    def python_type(self):
+        return str
+
+
+class CodedFilter(CodedString):
+    """Bind type of values compared against a CodedString column"""
+
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self.codes.find(value)
@@ -0,0 +1,103 @@
+"""
+Compact stored form of the analysis explanation.
+
+The analyzer explains each result with formatted sentences and a keyword
+count for every category. Storing that in analysis_metadata repeats the
+same strings and category names on every grievance. Only the facts are
+stored instead, for example:
+
+    {"analyzer_version": "v1-088b539a", "category": 3, "confidence": 1.0,
+     "hits": [0, 0, 4], "high": ["burst"], "languages": ["en"]}
+
+- category: code of the category the analyzer picked (codes.py)
+- confidence: the confidence_score the analysis reported
+- hits: keyword matches per category, at index code - 1, trailing zeros dropped
+- high: matched high-priority terms; low: true if a low-priority term
+  matched instead
+- source: "learner" with learner_version when the online learner picked
+  the category (keyword analyses leave both out)
+- lemmatized and fuzzy ([token, corrected, distance] lists) only when
+  they apply
+
+expand() rebuilds the readable explanation with ml_engine.explain(), the
+same function the analyzer uses, so it only runs for detail views. The
+confidence and category detection come from the stored confidence and
+source, not from the hit counts, so they match what was reported. Rows
+stored before this format come back unchanged.
+"""
+
+from .codes import category_codes
+from .ml_engine import analyzer as default_analyzer, explain
+
+
+def compact(analysis):
+    """Stored form of an analyze() result"""
+    explanation = analysis["analysis_explanation"]
+    hits = []
+    for category, count in explanation.get("relevant_keywords", {}).items():
+        if count:
+            index = category_codes.code(category) - 1
+            hits.extend([0] * (index + 1 - len(hits)))
+            hits[index] = count
+
+    stored = {
+        "analyzer_version": explanation.get("analyzer_version"),
+        "category": category_codes.code(analysis["category"]),
+        "confidence": analysis.get("confidence_score", 0.0),
+        "hits": hits,
+        "languages": list(explanation.get("languages", [])),
+    }
+    if explanation.get("high_keywords"):
+        stored["high"] = list(explanation["high_keywords"])
+    elif analysis["priority"] == "Low":
+        stored["low"] = True
+    if explanation.get("lemmatized"):
+        stored["lemmatized"] = True
+    if explanation.get("fuzzy_matches"):
+        stored["fuzzy"] = [[m["token"], m["corrected"], m["distance"]] for m in explanation["fuzzy_matches"]]
+    if explanation.get("learner_version") is not None:
+        stored["source"] = "learner"
+        stored["learner_version"] = explanation["learner_version"]
+    return stored
+
+
+def is_compact(metadata):
+    return isinstance(metadata, dict) and "hits" in metadata
+
+
+def expand(metadata, categories=None):
+    """
+    Readable explanation of stored analysis_metadata.
+
+    Args:
+        metadata: Stored analysis_metadata (compact or the older verbose form)
+        categories: Categories listed with zero counts (default: the
+            current analyzer config's)
+    """
+    if not is_compact(metadata):
+        return metadata or {}
+
+    names = category_codes.names()
+    counts = dict.fromkeys(default_analyzer.categories if categories is None else categories, 0)
+    for index, count in enumerate(metadata["hits"]):
+        if count:
+            counts[names.get(index + 1) or f"#{index + 1}"] = count
+
+    category = category_codes.lookup(metadata["category"])
+    learner_version = metadata.get("learner_version")
+    explanation = explain(
+        category, counts, metadata.get("high", []), metadata.get("low", False),
+        metadata.get("languages", []), metadata.get("analyzer_version"),
+        lemmatized=metadata.get("lemmatized", False),
+        fuzzy_matches=[
+            {"token": token, "corrected": corrected, "distance": distance}
+            for token, corrected, distance in metadata.get("fuzzy", [])
+        ],
+        # Facts stored before the confidence was kept fall back to the hit counts
+        confidence=metadata.get("confidence")
+    )
+    if metadata.get("source") == "learner" or learner_version is not None:
+        # As learner.OnlineCategoryLearner._apply words it
+        explanation["category_detection"] = f"Learned model v{learner_version} predicted '{category}'"
+        explanation["learner_version"] = learner_version
+    return explanation
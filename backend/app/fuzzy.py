@@ -0,0 +1,167 @@
+"""
+Fuzzy keyword lookup with a symmetric-delete (SymSpell) index.
+
+Misspelled keywords ("hospitl", "electrisity", "garbege") never match the
+exact substring check. Comparing every word against every keyword with
+Levenshtein distance would be far too slow, so every keyword's deletions
+(up to the allowed edit distance) are precomputed into a dictionary. A
+text token then only needs its own deletions looked up: candidates share
+a deletion with the token, and just those few are verified with a real
+(Damerau-)Levenshtein distance. Results are memoized per token, so common
+words cost a single dict lookup after the first time.
+
+To keep ordinary words from being "corrected" into keywords:
+- the allowed distance grows with keyword length (short keywords are exact only)
+- the first letter must match (misspellings rarely change it)
+- tokens that already contain the keyword are left to the exact matcher
+- known real words are never corrected ("outrage" is not a misspelled
+  "outage", "bride" not a misspelled "bridge"); the bundled
+  data/fuzzy_real_words.txt lists the near misses of the shipped keywords,
+  and a full word list can be added with load_words()
+"""
+
+import os
+import re
+from itertools import combinations
+
+FUZZY_MAX_DISTANCE = 2
+
+# Allowed edit distance by keyword length: shorter keywords only match exactly.
+# Five-letter keywords are too close to ordinary words ("death"/"depth",
+# "clean"/"clear", "delay"/"decay") to be corrected.
+MIN_LENGTH_FOR_DISTANCE = {1: 6, 2: 9}
+
+REAL_WORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "fuzzy_real_words.txt")
+
+# Tokens whose lookup result is memoized per index
+FUZZY_CACHE_SIZE = 50000
+
+_WORD = re.compile(r"[a-z]+")
+
+
+def load_words(path):
+    """Lower-cased words of a word list (one per line, "#" comments)"""
+    with open(path, encoding="utf-8") as f:
+        return frozenset(
+            word for word in (line.split("#", 1)[0].strip().lower() for line in f) if word
+        )
+
+
+def _deletes(word, distance):
+    """Every string obtained by deleting up to `distance` characters after the first"""
+    head, tail = word[0], word[1:]
+    results = {word}
+    for n in range(1, min(distance, len(tail)) + 1):
+        for positions in combinations(range(len(tail)), n):
+            results.add(head + "".join(c for i, c in enumerate(tail) if i not in positions))
+    return results
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance (adjacent transpositions count 1), or limit + 1 if larger"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+            row_min = min(row_min, current[j])
+        if row_min > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def allowed_distance(keyword, max_distance=FUZZY_MAX_DISTANCE):
+    distance = 0
+    for d, min_length in sorted(MIN_LENGTH_FOR_DISTANCE.items()):
+        if d <= max_distance and len(keyword) >= min_length:
+            distance = d
+    return distance
+
+
+class FuzzyKeywordIndex:
+    """
+    Symmetric-delete index over single-word Latin keywords.
+
+    Args:
+        keywords: Mapping of keyword -> roles (whatever the caller needs back
+            for a hit, e.g. the categories and priority levels it belongs to)
+        max_distance: Largest edit distance corrected (0 disables correction)
+        cache_size: Distinct tokens whose lookup result is memoized
+        known_words: Real words that are never corrected
+    """
+
+    def __init__(self, keywords, max_distance=FUZZY_MAX_DISTANCE, cache_size=FUZZY_CACHE_SIZE, known_words=()):
+        self.max_distance = max_distance
+        self.cache_size = cache_size
+        self.known_words = frozenset(known_words)
+        self.roles = {}
+        self.allowed = {}
+        self.deletes = {}
+        for keyword, roles in keywords.items():
+            distance = allowed_distance(keyword, max_distance)
+            if distance == 0 or not _WORD.fullmatch(keyword):
+                continue
+            self.allowed[keyword] = distance
+            self.roles[keyword] = roles
+            for deleted in _deletes(keyword, distance):
+                self.deletes.setdefault(deleted, set()).add(keyword)
+        self.min_length = min((len(k) - self.allowed[k] for k in self.allowed), default=0)
+        self.max_length = max((len(k) + self.allowed[k] for k in self.allowed), default=0)
+        self._memo = {}
+
+    def lookup(self, token):
+        """
+        Closest keyword within its allowed distance of a token.
+
+        Returns:
+            Tuple of (keyword, distance), or None if no keyword is close enough
+            (an exact keyword returns None: the exact matcher already has it,
+            and neither is a known real word corrected)
+        """
+        if not self.min_length <= len(token) <= self.max_length:
+            return None
+        if token in self._memo:
+            return self._memo[token]
+        result = None
+        if token not in self.allowed and token not in self.known_words:
+            candidates = set()
+            for deleted in _deletes(token, self.max_distance):
+                candidates.update(self.deletes.get(deleted, ()))
+            best = None
+            for keyword in candidates:
+                distance = edit_distance(token, keyword, self.allowed[keyword])
+                if distance <= self.allowed[keyword] and (best is None or (distance, keyword) < best):
+                    best = (distance, keyword)
+            # A longer form of the keyword ("schools") is already an exact match
+            if best is not None and best[1] not in token:
+                result = (best[1], best[0])
+        if len(self._memo) < self.cache_size:
+            self._memo[token] = result
+        return result
+
+    def find(self, text_lower):
+        """
+        Misspelled keywords in normalized text.
+
+        Returns:
+            List of (token, keyword, distance), at most one entry per keyword,
+            and only for keywords that do not also occur exactly
+        """
+        hits = {}
+        for token in set(_WORD.findall(text_lower)):
+            found = self.lookup(token)
+            if found is not None:
+                keyword, distance = found
+                if keyword in text_lower:
+                    continue
+                if keyword not in hits or distance < hits[keyword][2]:
+                    hits[keyword] = (token, keyword, distance)
+        return sorted(hits.values(), key=lambda hit: hit[1])
@@ -0,0 +1,340 @@
+"""
+Offline gazetteer geocoder for Indian place names.
+
+Places (cities, towns, localities and districts) are loaded from a bundled
+CSV file. All names and aliases, including native-script spellings, are
+compiled into a single trie-structured regular expression so a free-text
+location is resolved in one pass instead of a per-city loop. Resolved
+strings are memoized in an LRU cache and results are deterministic: the
+same text always yields the same coordinates and confidence.
+"""
+
+import csv
+import os
+from bisect import bisect_left
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+GAZETTEER_PATH = os.getenv(
+    "GAZETTEER_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "india_gazetteer.csv")
+)
+
+# More specific kinds win when several places are mentioned
+KIND_RANK = {"locality": 3, "city": 2, "district": 1, "state": 0}
+
+# Base confidence for a match of each kind
+KIND_CONFIDENCE = {"locality": 0.9, "city": 0.85, "district": 0.6, "state": 0.3}
+
+RESOLVE_CACHE_SIZE = 10000
+
+# Autocomplete limits; one- and two-character prefixes match too many
+# spellings to rank per keystroke, so their top results are precomputed
+SUGGEST_LIMIT = 10
+SUGGEST_MAX_LIMIT = 20
+PRECOMPUTED_PREFIX_LENGTH = 2
+
+
+@dataclass(frozen=True)
+class Place:
+    """A gazetteer entry"""
+    name: str
+    kind: str
+    district: str
+    state: str
+    latitude: float
+    longitude: float
+    population: int
+    aliases: Tuple[str, ...] = ()
+
+    @property
+    def label(self) -> str:
+        """Human-readable name with its district and state, e.g. for autocomplete"""
+        parts = [self.name]
+        if self.district and self.district != self.name:
+            parts.append(self.district)
+        if self.state and self.state != self.name:
+            parts.append(self.state)
+        return ", ".join(parts)
+
+
+@dataclass(frozen=True)
+class GeocodeResult:
+    """Outcome of resolving a free-text location"""
+    latitude: float
+    longitude: float
+    place: Place
+    confidence: float
+    matched: str
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize text for matching.
+
+    Case-folds, applies NFC, strips zero-width joiners and replaces
+    punctuation and symbols with spaces. Letters and combining marks
+    (needed for Devanagari, Telugu and Tamil) are preserved.
+    """
+    text = unicodedata.normalize("NFC", text).casefold()
+    text = text.replace("\u200c", "").replace("\u200d", "")
+    chars = [
+        " " if unicodedata.category(ch)[0] in "PSZC" else ch
+        for ch in text
+    ]
+    return " ".join("".join(chars).split())
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """Build a regex alternation from a trie of words (shared prefixes are factored out)"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        if "" in node and len(node) == 1:
+            return None
+        alternatives = []
+        single_chars = []
+        optional = False
+        for ch in sorted(node):
+            if ch == "":
+                optional = True
+                continue
+            sub = build(node[ch])
+            if sub is None:
+                single_chars.append(re.escape(ch))
+            else:
+                alternatives.append(re.escape(ch) + sub)
+        chars_only = not alternatives
+        if single_chars:
+            alternatives.append(single_chars[0] if len(single_chars) == 1 else "[" + "".join(single_chars) + "]")
+        pattern = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+        if optional:
+            pattern = pattern + "?" if chars_only else "(?:" + pattern + ")?"
+        return pattern
+
+    return build(trie) or ""
+
+
+class Gazetteer:
+    """Multi-pattern matcher over gazetteer place names"""
+
+    def __init__(self, places: List[Place], cache_size: int = RESOLVE_CACHE_SIZE):
+        self.places = list(places)
+        self.places.extend(self._state_places(self.places))
+
+        # Normalized name/alias -> candidate places sharing that spelling
+        self.index: Dict[str, List[Place]] = {}
+        for place in self.places:
+            for name in (place.name,) + place.aliases:
+                key = normalize(name)
+                candidates = self.index.setdefault(key, []) if key else None
+                if candidates is not None and place not in candidates:
+                    candidates.append(place)
+
+        # Longest spellings first keeps the trie greedy; a name must start at a
+        # word boundary and must not run into a following Latin letter or digit
+        # (native-script names may carry attached case suffixes)
+        pattern = _trie_pattern(sorted(self.index, key=len, reverse=True))
+        self.matcher = re.compile(r"(?<!\S)(" + pattern + r")(?![a-z0-9])")
+
+        self._resolve = lru_cache(maxsize=cache_size)(self._geocode_uncached)
+        self._build_suggest_index()
+
+    @staticmethod
+    def _state_places(places: List[Place]) -> List[Place]:
+        """Synthesize one entry per state located at the mean of its places"""
+        by_state: Dict[str, List[Place]] = {}
+        for place in places:
+            by_state.setdefault(place.state, []).append(place)
+        return [
+            Place(
+                name=state,
+                kind="state",
+                district="",
+                state=state,
+                latitude=round(sum(p.latitude for p in members) / len(members), 4),
+                longitude=round(sum(p.longitude for p in members) / len(members), 4),
+                population=sum(p.population for p in members),
+            )
+            for state, members in sorted(by_state.items())
+        ]
+
+    @classmethod
+    def from_csv(cls, path: str = GAZETTEER_PATH) -> "Gazetteer":
+        """Load places from a CSV with name, kind, district, state, latitude, longitude, population, aliases"""
+        places = []
+        with open(path, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                places.append(Place(
+                    name=row["name"].strip(),
+                    kind=row["kind"].strip(),
+                    district=row["district"].strip(),
+                    state=row["state"].strip(),
+                    latitude=float(row["latitude"]),
+                    longitude=float(row["longitude"]),
+                    population=int(row["population"] or 0),
+                    aliases=tuple(a.strip() for a in (row.get("aliases") or "").split("|") if a.strip()),
+                ))
+        return cls(places)
+
+    def find_all(self, text: str) -> List[Tuple[str, List[Place]]]:
+        """Return every (matched spelling, candidate places) found in the text"""
+        normalized = normalize(text or "")
+        return [(m.group(1), self.index[m.group(1)]) for m in self.matcher.finditer(normalized)]
+
+    def geocode(self, text: Optional[str]) -> Optional[GeocodeResult]:
+        """
+        Resolve a free-text location to coordinates.
+
+        Returns None when no known place is mentioned.
+        """
+        if not text:
+            return None
+        return self._resolve(normalize(text))
+
+    def cache_info(self):
+        """LRU cache statistics for resolved strings"""
+        return self._resolve.cache_info()
+
+    @staticmethod
+    def _suggest_rank(place: Place):
+        return (-place.population, -KIND_RANK.get(place.kind, 0), place.name)
+
+    def _build_suggest_index(self):
+        """Sorted (spelling, place) array for bisect prefix search, plus top results for short prefixes"""
+        entries = []
+        for place in self.places:
+            if place.kind == "state":
+                continue  # Suggestions should name a specific place
+            for spelling in dict.fromkeys((place.name,) + place.aliases):
+                key = normalize(spelling)
+                if key:
+                    entries.append((key, spelling, place))
+        entries.sort(key=lambda entry: (entry[0], self._suggest_rank(entry[2])))
+        self._suggest_keys = [key for key, _, _ in entries]
+        self._suggest_entries = [(spelling, place) for _, spelling, place in entries]
+
+        short: Dict[str, Dict[Place, str]] = {}
+        for key, spelling, place in entries:
+            for length in range(1, min(len(key), PRECOMPUTED_PREFIX_LENGTH) + 1):
+                short.setdefault(key[:length], {}).setdefault(place, spelling)
+        self._short_prefix_top = {
+            prefix: sorted(
+                ((spelling, place) for place, spelling in matches.items()),
+                key=lambda item: self._suggest_rank(item[1])
+            )[:SUGGEST_MAX_LIMIT]
+            for prefix, matches in short.items()
+        }
+
+    def suggest(self, query: Optional[str], limit: int = SUGGEST_LIMIT) -> List[Tuple[str, Place]]:
+        """
+        Autocomplete a partially typed place name.
+
+        Matches the start of any name or alias (including Hindi, Telugu and
+        Tamil spellings) and ranks places by population.
+
+        Returns:
+            List of (matched spelling, place), one entry per place
+        """
+        prefix = normalize(query or "")
+        limit = max(1, min(limit, SUGGEST_MAX_LIMIT))
+        if not prefix:
+            return []
+        if len(prefix) <= PRECOMPUTED_PREFIX_LENGTH:
+            return self._short_prefix_top.get(prefix, [])[:limit]
+
+        start = bisect_left(self._suggest_keys, prefix)
+        end = bisect_left(self._suggest_keys, prefix + "\U0010ffff", start)
+        matches: Dict[Place, str] = {}
+        for spelling, place in self._suggest_entries[start:end]:
+            matches.setdefault(place, spelling)
+        ranked = sorted(matches.items(), key=lambda item: self._suggest_rank(item[0]))
+        return [(spelling, place) for place, spelling in ranked[:limit]]
+
+    def _geocode_uncached(self, normalized: str) -> Optional[GeocodeResult]:
+        matches = [(m.group(1), self.index[m.group(1)]) for m in self.matcher.finditer(normalized)]
+        if not matches:
+            return None
+
+        best = None
+        for spelling, candidates in matches:
+            # Other mentioned places (a different spelling) can corroborate a candidate
+            others = [p for other, places in matches if other != spelling for p in places]
+            states = {p.state for p in others if p.kind == "state"}
+            districts = {p.district for p in others if p.kind in ("district", "city")}
+            places_named = sum(1 for p in candidates if p.kind != "state")
+            for place in candidates:
+                corroborated = (
+                    (place.kind != "state" and place.state in states)
+                    or (place.kind == "locality" and place.district in districts)
+                )
+                score = (corroborated, KIND_RANK.get(place.kind, 0), place.population)
+                if best is None or score > best[0]:
+                    best = (score, spelling, place, places_named)
+
+        (corroborated, _, _), spelling, place, places_named = best
+        confidence = KIND_CONFIDENCE.get(place.kind, 0.5)
+        if corroborated:
+            confidence += 0.05
+        elif places_named > 1:
+            # Same spelling names several places and nothing else disambiguates
+            confidence -= 0.2
+
+        return GeocodeResult(
+            latitude=place.latitude,
+            longitude=place.longitude,
+            place=place,
+            confidence=round(max(0.0, min(1.0, confidence)), 2),
+            matched=spelling,
+        )
+
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """Return the process-wide gazetteer, loading it on first use"""
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = Gazetteer.from_csv()
+    return _gazetteer
+
+
+def geocode(text: Optional[str]) -> Optional[GeocodeResult]:
+    """Resolve a free-text location with the process-wide gazetteer"""
+    return get_gazetteer().geocode(text)
+
+
+def suggest_locations(query: Optional[str], limit: int = SUGGEST_LIMIT) -> List[Tuple[str, Place]]:
+    """Autocomplete a partially typed place name with the process-wide gazetteer"""
+    return get_gazetteer().suggest(query, limit)
+
+
+def resolve_coordinates(location: Optional[str], latitude: Optional[float], longitude: Optional[float]):
+    """
+    Decide the coordinates stored for a new grievance.
+
+    Picked GPS coordinates are kept as-is with full confidence; otherwise the
+    location text is geocoded once here, at write time.
+
+    Returns:
+        Tuple of (latitude, longitude, confidence); all None if unresolved
+    """
+    if latitude is not None and longitude is not None:
+        return latitude, longitude, 1.0
+    result = geocode(location)
+    if result is None:
+        return None, None, None
+    return result.latitude, result.longitude, result.confidence
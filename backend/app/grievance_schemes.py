@@ -0,0 +1,66 @@
+"""
+Suggested schemes of grievances, stored in the grievance_schemes join table.
+
+A grievance links to the schemes suggested for it by scheme id, in
+suggestion order, instead of keeping its own JSON copy of their names. So
+"which grievances were pointed to scheme X" is one indexed query, and a
+renamed scheme shows its new name everywhere.
+
+Suggestions also come from the analyzer config (schemes_mapping), whose
+names need not be in the schemes table yet. Such a name gets a reference
+row the first time it is suggested. The row has no domain, so the
+precomputed recommendations never pick it up on their own.
+
+Pages of grievances load their scheme names with with_schemes(), one IN
+query per page; Grievance.suggested_schemes on a single grievance loads
+them on first access.
+"""
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import selectinload
+
+from . import models
+
+REFERENCE_DESCRIPTION = "Suggested by the analyzer configuration"
+
+
+def with_schemes(query):
+    """Load the suggested scheme names of every grievance in the query with one batched IN query"""
+    return query.options(selectinload(models.Grievance.schemes).load_only(models.Scheme.name))
+
+
+def scheme_ids(db, names):
+    """
+    Scheme id per name (one IN query); names without a scheme get a reference row.
+
+    Reference rows are inserted with ON CONFLICT(name) DO NOTHING and then
+    selected, so a scheme another request created meanwhile is reused
+    instead of failing on the unique name.
+    """
+    names = list(dict.fromkeys(name for name in names if name))
+    if not names:
+        return {}
+    ids = dict(db.query(models.Scheme.name, models.Scheme.id).filter(models.Scheme.name.in_(names)))
+    missing = [name for name in names if name not in ids]
+    if missing:
+        upsert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        db.execute(upsert(models.Scheme.__table__).values([
+            {"name": name, "description": REFERENCE_DESCRIPTION} for name in missing
+        ]).on_conflict_do_nothing(index_elements=["name"]))
+        ids.update(db.query(models.Scheme.name, models.Scheme.id).filter(models.Scheme.name.in_(missing)))
+    return ids
+
+
+def set_schemes(db, grievance_id, names):
+    """Replace the suggested schemes of a grievance, in order (within the caller's transaction)"""
+    names = list(dict.fromkeys(name for name in names if name))
+    ids = scheme_ids(db, names)
+    db.query(models.GrievanceScheme).filter(
+        models.GrievanceScheme.grievance_id == grievance_id
+    ).delete(synchronize_session=False)
+    if names:
+        db.execute(insert(models.GrievanceScheme), [
+            {"grievance_id": grievance_id, "scheme_id": ids[name], "position": position}
+            for position, name in enumerate(names)
+        ])
@@ -0,0 +1,114 @@
+"""
+Heatmap density grid aggregation for grievance locations.
+
+Grievance coordinates are binned into a fixed-resolution lat/lon grid over
+India with NumPy's vectorized histogramming. Results are cached per
+(filters, resolution) and invalidated whenever grievances are written.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import numpy as np
+from . import models
+
+# Fixed grid extent (min_lon, min_lat, max_lon, max_lat) so cells are stable across queries
+GRID_BBOX = (68.0, 6.5, 97.5, 37.5)
+
+# Allowed cell sizes in degrees (0.1 degree is roughly 11 km)
+MIN_RESOLUTION = 0.01
+MAX_RESOLUTION = 2.0
+DEFAULT_RESOLUTION = 0.1
+
+CACHE_TTL_SECONDS = 60
+CACHE_MAX_ENTRIES = 256
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def invalidate_cache():
+    """Drop all cached grids (call after grievances are created, changed or deleted)"""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _cache_get(key):
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > CACHE_TTL_SECONDS:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return value
+
+
+def _cache_put(key, value):
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), value)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def compute_heatmap(db, resolution=DEFAULT_RESOLUTION, category=None, priority=None, days=None):
+    """
+    Bin grievance coordinates into a density grid.
+
+    Args:
+        db: Database session
+        resolution: Cell size in degrees
+        category: Optional category filter
+        priority: Optional priority filter
+        days: Optional window, only grievances from the last N days
+
+    Returns:
+        Dict with the non-empty cells as [lat, lon, count] plus grid metadata
+    """
+    resolution = min(max(float(resolution), MIN_RESOLUTION), MAX_RESOLUTION)
+    key = (round(resolution, 4), category, priority, days)
+
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    query = db.query(models.Grievance.latitude, models.Grievance.longitude).filter(
+        models.Grievance.latitude.isnot(None),
+        models.Grievance.longitude.isnot(None)
+    )
+    if category:
+        query = query.filter(models.Grievance.category == category)
+    if priority:
+        query = query.filter(models.Grievance.priority == priority)
+    if days:
+        query = query.filter(models.Grievance.created_at >= datetime.utcnow() - timedelta(days=days))
+
+    coords = np.array(query.all(), dtype=np.float64).reshape(-1, 2)
+
+    min_lon, min_lat, max_lon, max_lat = GRID_BBOX
+    lat_edges = min_lat + np.arange(int(np.ceil((max_lat - min_lat) / resolution)) + 1) * resolution
+    lon_edges = min_lon + np.arange(int(np.ceil((max_lon - min_lon) / resolution)) + 1) * resolution
+    counts, _, _ = np.histogram2d(coords[:, 0], coords[:, 1], bins=(lat_edges, lon_edges))
+
+    # Only ship non-empty cells, located at their centres
+    rows, cols = np.nonzero(counts)
+    cells = np.column_stack((
+        lat_edges[rows] + resolution / 2,
+        lon_edges[cols] + resolution / 2,
+        counts[rows, cols]
+    ))
+
+    result = {
+        "resolution": resolution,
+        "bbox": list(GRID_BBOX),
+        "filters": {"category": category, "priority": priority, "days": days},
+        "total": int(counts.sum()),
+        "max_count": int(counts.max()) if cells.size else 0,
+        "cells": [[round(lat, 5), round(lon, 5), int(n)] for lat, lon, n in cells.tolist()]
+    }
+    _cache_put(key, result)
+    return result
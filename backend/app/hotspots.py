@@ -0,0 +1,187 @@
+"""
+Geographic hotspot detection for recent grievances.
+
+Recent grievances of each category are clustered with DBSCAN to find
+places where many similar complaints appeared within a few days (a sewage
+overflow, a broken water main). Neighbour search uses a uniform grid with
+cells of the neighbourhood radius, so each point only compares against the
+points in its own and the eight adjacent cells and the job stays
+near-linear instead of O(n^2). Grievances at the same coordinates are
+collapsed into one weighted point first, so a pile of identical points
+never becomes one huge cell.
+
+Only precisely located grievances are clustered. Coordinates geocoded
+from the location text (geocode_confidence below 1.0) are a place centroid,
+and a few grievances that merely mention the same city would otherwise
+form a zero-radius "hotspot" at its centre.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+import os
+import numpy as np
+from sqlalchemy import or_
+from . import models
+from .reverse_geocoder import resolve_place
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Defaults can be tuned per deployment through the environment
+HOTSPOT_WINDOW_DAYS = int(os.getenv("HOTSPOT_WINDOW_DAYS", "7"))
+HOTSPOT_EPS_KM = float(os.getenv("HOTSPOT_EPS_KM", "0.5"))
+HOTSPOT_MIN_SAMPLES = int(os.getenv("HOTSPOT_MIN_SAMPLES", "5"))
+HOTSPOT_MIN_GEOCODE_CONFIDENCE = float(os.getenv("HOTSPOT_MIN_GEOCODE_CONFIDENCE", "1.0"))
+
+NOISE = -1
+
+# Points per block when computing distances inside one (possibly very dense) cell
+DISTANCE_BLOCK = 512
+
+
+def _project_km(lat, lon):
+    """Project degrees to local equirectangular kilometres (accurate at neighbourhood scale)"""
+    lat_rad = np.radians(lat)
+    return np.column_stack((
+        EARTH_RADIUS_KM * np.radians(lon) * np.cos(lat_rad),
+        EARTH_RADIUS_KM * lat_rad
+    ))
+
+
+def _grid_neighbours(xy, eps):
+    """Return, for every point, the indices of all points within eps (itself included)"""
+    cells = np.floor(xy / eps).astype(np.int64)
+    buckets = defaultdict(list)
+    for i, (cx, cy) in enumerate(cells.tolist()):
+        buckets[(cx, cy)].append(i)
+    buckets = {cell: np.array(members) for cell, members in buckets.items()}
+
+    eps_sq = eps * eps
+    neighbours = [None] * len(xy)
+    for (cx, cy), members in buckets.items():
+        candidates = np.concatenate([
+            buckets[(cx + dx, cy + dy)]
+            for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+            if (cx + dx, cy + dy) in buckets
+        ])
+        # Distances from this cell's points to every candidate, a block at a time
+        for start in range(0, len(members), DISTANCE_BLOCK):
+            block = members[start:start + DISTANCE_BLOCK]
+            diff = xy[block][:, None, :] - xy[candidates][None, :, :]
+            within = (diff ** 2).sum(axis=2) <= eps_sq
+            for row, i in enumerate(block.tolist()):
+                neighbours[i] = candidates[within[row]]
+    return neighbours
+
+
+def dbscan(lat, lon, eps_km=HOTSPOT_EPS_KM, min_samples=HOTSPOT_MIN_SAMPLES):
+    """
+    Density-based clustering of coordinates.
+
+    Args:
+        lat, lon: Arrays of coordinates in degrees
+        eps_km: Neighbourhood radius in kilometres
+        min_samples: Points (including itself) a core point needs within eps_km
+
+    Returns:
+        Array of cluster labels per point, NOISE (-1) for unclustered points
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    if not len(lat):
+        return np.full(0, NOISE, dtype=np.int64)
+
+    # Cluster distinct coordinates, each weighted by how many points share it
+    points, inverse, weights = np.unique(
+        np.column_stack((lat, lon)), axis=0, return_inverse=True, return_counts=True
+    )
+    labels = np.full(len(points), NOISE, dtype=np.int64)
+
+    neighbours = _grid_neighbours(_project_km(points[:, 0], points[:, 1]), eps_km)
+    is_core = np.array([weights[n].sum() >= min_samples for n in neighbours])
+
+    cluster = 0
+    for start in np.flatnonzero(is_core).tolist():
+        if labels[start] != NOISE:
+            continue
+        labels[start] = cluster
+        frontier = [start]
+        while frontier:
+            point = frontier.pop()
+            if not is_core[point]:
+                continue
+            for other in neighbours[point].tolist():
+                if labels[other] == NOISE:
+                    labels[other] = cluster
+                    frontier.append(other)
+        cluster += 1
+    return labels[inverse.reshape(-1)]
+
+
+def detect_hotspots(db, days=HOTSPOT_WINDOW_DAYS, eps_km=HOTSPOT_EPS_KM, min_samples=HOTSPOT_MIN_SAMPLES,
+                    min_confidence=HOTSPOT_MIN_GEOCODE_CONFIDENCE):
+    """
+    Cluster recent grievances per category and replace the stored hotspots.
+
+    Args:
+        db: Database session
+        days: Only grievances from the last N days are considered
+        eps_km: Neighbourhood radius in kilometres
+        min_samples: Minimum grievances for a dense neighbourhood
+        min_confidence: Minimum geocode_confidence of clustered grievances
+            (1.0 keeps picked GPS coordinates only)
+
+    Returns:
+        List of the Hotspot rows that were stored
+    """
+    detected_at = datetime.utcnow()
+    rows = db.query(
+        models.Grievance.id,
+        models.Grievance.category,
+        models.Grievance.latitude,
+        models.Grievance.longitude,
+        models.Grievance.created_at
+    ).filter(
+        models.Grievance.latitude.isnot(None),
+        models.Grievance.longitude.isnot(None),
+        # No confidence means coordinates picked before it was recorded (see migrate_coordinates.py)
+        or_(models.Grievance.geocode_confidence >= min_confidence, models.Grievance.geocode_confidence.is_(None)),
+        # (0, 0) is a placeholder, not a location
+        or_(models.Grievance.latitude != 0, models.Grievance.longitude != 0),
+        models.Grievance.created_at >= detected_at - timedelta(days=days)
+    ).all()
+
+    by_category = defaultdict(list)
+    for row in rows:
+        by_category[row.category].append(row)
+
+    hotspots = []
+    for category, members in sorted(by_category.items(), key=lambda item: str(item[0])):
+        lat = np.array([m.latitude for m in members])
+        lon = np.array([m.longitude for m in members])
+        labels = dbscan(lat, lon, eps_km, min_samples)
+
+        for label in range(labels.max() + 1):
+            idx = np.flatnonzero(labels == label)
+            center_lat, center_lon = float(lat[idx].mean()), float(lon[idx].mean())
+            offsets = _project_km(lat[idx], lon[idx]) - _project_km([center_lat], [center_lon])
+            city, district, state = resolve_place(center_lat, center_lon)
+            created = [members[i].created_at for i in idx.tolist()]
+            hotspots.append(models.Hotspot(
+                category=category,
+                latitude=round(center_lat, 6),
+                longitude=round(center_lon, 6),
+                radius_km=round(float(np.sqrt((offsets ** 2).sum(axis=1)).max()), 3),
+                member_count=len(idx),
+                member_ids=sorted(members[i].id for i in idx.tolist()),
+                city=city,
+                district=district,
+                first_reported_at=min(created),
+                last_reported_at=max(created),
+                detected_at=detected_at
+            ))
+
+    # Each run replaces the previous snapshot
+    db.query(models.Hotspot).delete()
+    db.add_all(hotspots)
+    db.commit()
+    return hotspots
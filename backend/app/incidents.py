@@ -0,0 +1,297 @@
+"""
+Incident clustering of historical grievances.
+
+Many citizens report the same problem (one burst pipe, one broken
+streetlight) in their own words. Grievances whose text is nearly the same,
+that were filed close together and near each other, are grouped into one
+incident so a single work order can close all of them.
+
+Text similarity is the Jaccard similarity of character shingles, estimated
+with MinHash signatures computed in bulk with NumPy. Comparing every pair
+of signatures would be O(n^2), so locality-sensitive hashing (banding)
+proposes candidate pairs instead: signatures are cut into bands and only
+grievances sharing an identical band are compared. Inside a bucket,
+members are swept in date order and only compared while they are within
+the date window. Candidates are confirmed when
+- the estimated similarity reaches INCIDENT_SIMILARITY
+- they were filed within INCIDENT_WINDOW_DAYS of each other
+- their coordinates are within INCIDENT_RADIUS_KM (without coordinates,
+  the same city or district)
+Confirmed pairs are merged into incidents with union-find (single linkage).
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+import math
+import os
+
+import numpy as np
+
+from . import models
+from .ml_engine import normalize_text
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Defaults can be tuned per deployment through the environment
+INCIDENT_SHINGLE_SIZE = int(os.getenv("INCIDENT_SHINGLE_SIZE", "5"))
+INCIDENT_NUM_PERM = int(os.getenv("INCIDENT_NUM_PERM", "128"))
+INCIDENT_BANDS = int(os.getenv("INCIDENT_BANDS", "32"))
+INCIDENT_SIMILARITY = float(os.getenv("INCIDENT_SIMILARITY", "0.5"))
+INCIDENT_WINDOW_DAYS = float(os.getenv("INCIDENT_WINDOW_DAYS", "3"))
+INCIDENT_RADIUS_KM = float(os.getenv("INCIDENT_RADIUS_KM", "1.0"))
+INCIDENT_MIN_MEMBERS = int(os.getenv("INCIDENT_MIN_MEMBERS", "2"))
+
+# Polynomial base of the shingle hash (a large odd constant)
+SHINGLE_BASE = np.uint64(0x100000001B3)
+
+# Shingle hashes processed per block when computing signatures
+SIGNATURE_BLOCK = 1 << 15
+
+
+def shingles(text, size=INCIDENT_SHINGLE_SIZE):
+    """
+    64-bit hashes of the distinct character shingles of normalized text.
+
+    Each shingle is hashed as a polynomial over its code points, computed
+    for all positions at once with NumPy (uint64 arithmetic wraps).
+    """
+    codes = np.frombuffer(normalize_text(text).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < size:
+        codes = np.concatenate((codes, np.zeros(size - len(codes), dtype=np.uint64)))
+    count = len(codes) - size + 1
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        hashes *= SHINGLE_BASE
+        hashes += codes[offset:offset + count]
+    return np.unique(hashes)
+
+
+def minhash_signatures(shingle_sets, num_perm=INCIDENT_NUM_PERM, seed=1):
+    """
+    MinHash signatures for many shingle sets at once.
+
+    Every shingle hash x is permuted num_perm times with multiply-shift
+    hashing, (a * x + b) >> 32 with random odd 64-bit a, and each signature
+    entry is the minimum over the set. All sets are concatenated and
+    reduced per set with np.minimum.reduceat, a block of sets at a time.
+
+    Returns:
+        uint32 array of shape (len(shingle_sets), num_perm)
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 2 ** 64 - 1, size=num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+    b = rng.integers(0, 2 ** 64 - 1, size=num_perm, dtype=np.uint64, endpoint=True)
+    shift = np.uint64(32)
+
+    signatures = np.empty((len(shingle_sets), num_perm), dtype=np.uint32)
+    start = 0
+    while start < len(shingle_sets):
+        stop, total = start, 0
+        while stop < len(shingle_sets) and (stop == start or total + len(shingle_sets[stop]) <= SIGNATURE_BLOCK):
+            total += len(shingle_sets[stop])
+            stop += 1
+        block = shingle_sets[start:stop]
+        # In place, num_perm x total uint64 values (rows contiguous, so reduceat runs along memory)
+        hashed = np.multiply(a[:, None], np.concatenate(block)[None, :])
+        hashed += b[:, None]
+        hashed >>= shift
+        offsets = np.cumsum([0] + [len(s) for s in block[:-1]])
+        signatures[start:stop] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        start = stop
+    return signatures
+
+
+def _band_keys(signatures, bands):
+    """One 64-bit key per (grievance, band); equal bands give equal keys"""
+    rows = signatures.shape[1] // bands
+    banded = signatures[:, :bands * rows].reshape(len(signatures), bands, rows).astype(np.uint64)
+    multipliers = np.random.default_rng(7).integers(1, 2 ** 63, size=rows, dtype=np.uint64) | np.uint64(1)
+    # Wrapping uint64 arithmetic is intended here
+    return (banded * multipliers).sum(axis=2, dtype=np.uint64)
+
+
+def _haversine_km(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlmb = phi2 - phi1, math.radians(lon2 - lon1)
+    h = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster(texts, timestamps, lat, lon, places,
+            similarity=INCIDENT_SIMILARITY, window_days=INCIDENT_WINDOW_DAYS,
+            radius_km=INCIDENT_RADIUS_KM, num_perm=INCIDENT_NUM_PERM, bands=INCIDENT_BANDS):
+    """
+    Group near-duplicate nearby grievances.
+
+    Args:
+        texts: Grievance texts
+        timestamps: Filing times as POSIX seconds
+        lat, lon: Coordinates (None when unknown)
+        places: Place name per grievance (city or district, None when unknown),
+            compared when coordinates are missing
+        similarity: Minimum estimated Jaccard similarity of the shingle sets
+        window_days: Maximum time between two linked grievances
+        radius_km: Maximum distance between two linked grievances
+        num_perm: MinHash signature length
+        bands: LSH bands (num_perm / bands rows each); more bands find
+            less similar pairs at the cost of more candidates
+
+    Returns:
+        Tuple of (component label per grievance, number of candidate pairs checked)
+    """
+    n = len(texts)
+    parent = list(range(n))
+    if n < 2:
+        return np.arange(n), 0
+
+    signatures = minhash_signatures([shingles(text) for text in texts], num_perm)
+    keys = _band_keys(signatures, bands)
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    window = window_days * 86400
+
+    checked = set()
+    for band in range(keys.shape[1]):
+        order = np.lexsort((timestamps, keys[:, band]))
+        sorted_keys = keys[order, band]
+        boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+        for bucket in np.split(order, boundaries):
+            if len(bucket) < 2:
+                continue
+            bucket = bucket.tolist()
+            # Members are in date order: stop comparing once past the window
+            for x, i in enumerate(bucket):
+                for j in bucket[x + 1:]:
+                    if timestamps[j] - timestamps[i] > window:
+                        break
+                    pair = (i, j) if i < j else (j, i)
+                    if pair in checked:
+                        continue
+                    checked.add(pair)
+                    root_i, root_j = _find(parent, i), _find(parent, j)
+                    if root_i == root_j:
+                        continue
+                    if lat[i] is not None and lat[j] is not None:
+                        if _haversine_km(lat[i], lon[i], lat[j], lon[j]) > radius_km:
+                            continue
+                    elif not places[i] or places[i] != places[j]:
+                        continue
+                    if np.count_nonzero(signatures[i] == signatures[j]) < similarity * num_perm:
+                        continue
+                    parent[root_j] = root_i
+
+    return np.array([_find(parent, i) for i in range(n)]), len(checked)
+
+
+def _most_common(values):
+    values = [v for v in values if v]
+    return Counter(values).most_common(1)[0][0] if values else None
+
+
+def detect_incidents(db, days=None, min_members=INCIDENT_MIN_MEMBERS, **options):
+    """
+    Cluster grievances into incidents and store the incident ids.
+
+    An incident keeps its id (and the status set on it) from run to run:
+    a new cluster takes over the incident most of its members already
+    belonged to. Incidents left without members are deleted.
+
+    Args:
+        db: Database session
+        days: Only grievances from the last N days are clustered (None: all)
+        min_members: Smallest group stored as an incident
+        **options: Passed to cluster()
+
+    Returns:
+        Tuple of (incidents stored, grievances considered, candidate pairs checked)
+    """
+    detected_at = datetime.utcnow()
+    query = db.query(
+        models.Grievance.id,
+        models.Grievance.title,
+        models.Grievance.description,
+        models.Grievance.category,
+        models.Grievance.status,
+        models.Grievance.latitude,
+        models.Grievance.longitude,
+        models.Grievance.city,
+        models.Grievance.district,
+        models.Grievance.created_at,
+        models.Grievance.incident_id
+    )
+    if days:
+        query = query.filter(models.Grievance.created_at >= detected_at - timedelta(days=days))
+    rows = query.order_by(models.Grievance.id).all()
+
+    labels, checked = cluster(
+        [f"{row.title or ''} {row.description or ''}" for row in rows],
+        [row.created_at.timestamp() if row.created_at else 0.0 for row in rows],
+        [row.latitude if row.longitude is not None else None for row in rows],
+        [row.longitude if row.latitude is not None else None for row in rows],
+        [row.city or row.district for row in rows],
+        **options
+    )
+
+    groups = {}
+    for index, label in enumerate(labels.tolist()):
+        groups.setdefault(label, []).append(rows[index])
+    groups = sorted(
+        (members for members in groups.values() if len(members) >= min_members),
+        key=len, reverse=True
+    )
+
+    previous_ids = {row.incident_id for row in rows if row.incident_id}
+    existing = {
+        incident.id: incident
+        for incident in db.query(models.Incident).filter(models.Incident.id.in_(previous_ids))
+    } if previous_ids else {}
+
+    incidents = []
+    for members in groups:
+        incident = None
+        # Largest groups pick first; each previous incident is taken over once
+        for incident_id, _ in Counter(m.incident_id for m in members if m.incident_id).most_common():
+            if incident_id in existing:
+                incident = existing.pop(incident_id)
+                break
+        if incident is None:
+            statuses = {m.status for m in members}
+            incident = models.Incident(status=statuses.pop() if len(statuses) == 1 else "Pending")
+            db.add(incident)
+
+        earliest = min(members, key=lambda m: (m.created_at or detected_at, m.id))
+        located = [m for m in members if m.latitude is not None and m.longitude is not None]
+        incident.title = earliest.title
+        incident.category = _most_common(m.category for m in members)
+        incident.latitude = round(sum(m.latitude for m in located) / len(located), 6) if located else None
+        incident.longitude = round(sum(m.longitude for m in located) / len(located), 6) if located else None
+        incident.city = _most_common(m.city for m in members)
+        incident.district = _most_common(m.district for m in members)
+        incident.member_count = len(members)
+        created = [m.created_at for m in members if m.created_at]
+        incident.first_reported_at = min(created) if created else None
+        incident.last_reported_at = max(created) if created else None
+        incident.detected_at = detected_at
+        incidents.append((incident, members))
+    db.flush()
+
+    assignment = {}
+    for incident, members in incidents:
+        for m in members:
+            assignment[m.id] = incident.id
+    db.bulk_update_mappings(models.Grievance, [
+        {"id": row.id, "incident_id": assignment.get(row.id)}
+        for row in rows if row.incident_id != assignment.get(row.id)
+    ])
+
+    # Incidents no grievance points to any more
+    referenced = db.query(models.Grievance.incident_id).filter(models.Grievance.incident_id.isnot(None)).distinct()
+    db.query(models.Incident).filter(models.Incident.id.notin_(referenced)).delete(synchronize_session=False)
+    db.commit()
+    return [incident for incident, _ in incidents], len(rows), checked
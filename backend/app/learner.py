@@ -0,0 +1,375 @@
+"""
+Online category learner trained from admin corrections.
+
+A linear classifier (SGDClassifier, logistic loss) over hashed character
+n-grams learns from the categories admins correct. Feature hashing needs no
+vocabulary, so new words and scripts never force a refit, and
+partial_fit updates the weights from each new mini-batch of corrections
+only: training cost is proportional to the corrections since the last
+update, never to the whole history. A watermark (last learned correction
+id) is persisted with the model so restarts resume where they stopped.
+
+Before any correction exists the model is seeded from the keyword tables.
+Every update is published as a new immutable artifact version (see
+artifacts.py): the weight matrix is a read-only memory-mapped .npy file, so
+all uvicorn workers share one copy and pick up new versions by reading the
+CURRENT pointer. Only the process holding the training lock keeps the
+full trainer state in memory.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+try:
+    import fcntl
+except ImportError:  # Windows: training is only coordinated within one process
+    fcntl = None
+
+from . import artifacts, models
+from .database import SessionLocal
+from .ml_engine import analyzer as live_analyzer, normalize_text, format_confidence
+
+logger = logging.getLogger(__name__)
+
+LEARNER_MODEL_DIR = os.getenv(
+    "LEARNER_MODEL_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "category_learner")
+)
+
+# Corrections per partial_fit call
+LEARNER_BATCH_SIZE = int(os.getenv("LEARNER_BATCH_SIZE", "256"))
+
+# After a correction arrives, wait this long so several are learned in one mini-batch
+LEARNER_DEBOUNCE_SECONDS = float(os.getenv("LEARNER_DEBOUNCE_SECONDS", "5"))
+
+# Pending corrections are also picked up on this interval (e.g. ones written by another worker)
+LEARNER_INTERVAL_SECONDS = float(os.getenv("LEARNER_INTERVAL_SECONDS", "60"))
+
+# How often (seconds) a worker checks whether another process published a new version
+MODEL_CHECK_INTERVAL = 2.0
+
+TRAINER_FILE = "trainer.joblib"
+LOCK_FILE = ".train.lock"
+
+N_FEATURES = 2 ** 18
+
+# Passes over the keyword tables when seeding a new model
+SEED_EPOCHS = 5
+
+# Character n-grams inside word boundaries work for every script the analyzer supports
+_vectorizer = HashingVectorizer(
+    n_features=N_FEATURES,
+    analyzer="char_wb",
+    ngram_range=(2, 4),
+    alternate_sign=False,
+    norm="l2",
+    preprocessor=normalize_text,
+)
+
+
+class PublishedModel:
+    """
+    One published version, served from the memory-mapped artifact.
+
+    Weights are stored transposed (features x classes, float32) so the few
+    hashed features of a text read a few contiguous rows and only those
+    pages are faulted in.
+    """
+
+    __slots__ = ("version", "coef", "intercept", "classes", "last_correction_id", "corrections_learned", "published_at")
+
+    def __init__(self, artifact):
+        self.version = artifact.version
+        self.coef = artifact["coef"]
+        self.intercept = artifact["intercept"]
+        self.classes = [str(c) for c in artifact["classes"]]
+        self.last_correction_id = artifact.meta["last_correction_id"]
+        self.corrections_learned = artifact.meta["corrections_learned"]
+        self.published_at = datetime.fromisoformat(artifact.meta["published_at"])
+
+    def predict_proba(self, X):
+        """Same one-vs-rest probabilities as SGDClassifier.predict_proba"""
+        # Cast the sparse input, not the weights: upcasting coef would copy the whole matrix
+        scores = np.asarray(X.astype(np.float32) @ self.coef, dtype=np.float64) + self.intercept
+        probabilities = 1.0 / (1.0 + np.exp(-scores))
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+
+def seed_examples(config):
+    """(text, category) pairs from the keyword tables, all languages"""
+    examples = [(kw, category) for category, keywords in config.categories.items() for kw in keywords]
+    for catalog in config.language_keywords.values():
+        examples.extend(
+            (kw, category) for category, keywords in catalog["categories"].items() for kw in keywords
+        )
+    return examples
+
+
+class OnlineCategoryLearner:
+    """Incrementally trained category classifier with versioned publishing"""
+
+    def __init__(self, model_dir=LEARNER_MODEL_DIR, analyzer=live_analyzer):
+        self.model_dir = model_dir
+        self.analyzer = analyzer
+        self._published = None
+        self._next_check = 0.0
+        self._trainer = None
+        self._train_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._worker_lock = threading.Lock()
+        self._worker = None
+        self.last_batch = None
+
+    # ---------- published model ----------
+
+    @property
+    def model(self) -> PublishedModel:
+        """Currently published version, reopened when another process publishes a newer one"""
+        published = self._published
+        if published is not None and time.monotonic() < self._next_check:
+            return published
+        self._next_check = time.monotonic() + MODEL_CHECK_INTERVAL
+        version = artifacts.current_version(self.model_dir)
+        if version is None:
+            # Nothing published yet: seed version 1 from the keyword tables
+            with self._train_lock, self._process_lock(blocking=True):
+                if artifacts.current_version(self.model_dir) is None:
+                    self._publish(self._seed())
+            version = artifacts.current_version(self.model_dir)
+        if published is None or published.version != version:
+            self._published = published = PublishedModel(artifacts.load(self.model_dir, version))
+            logger.info(f"Opened category learner v{version} from {self.model_dir}")
+        return published
+
+    # ---------- training ----------
+
+    def _seed(self):
+        """Trainer state for version 1: a classifier fitted to the keyword tables only"""
+        config = self.analyzer.config
+        classes = np.array(sorted(set(config.categories) | {"General"}))
+        texts, labels = zip(*seed_examples(config))
+        X = _vectorizer.transform(texts)
+        classifier = SGDClassifier(loss="log_loss", alpha=1e-5, random_state=0)
+        for _ in range(SEED_EPOCHS):
+            classifier.partial_fit(X, labels, classes=classes)
+        return {"version": 1, "classifier": classifier, "last_correction_id": 0, "corrections_learned": 0}
+
+    def _load_trainer(self):
+        """Trainer state matching the published version (kept in memory between updates)"""
+        version = artifacts.current_version(self.model_dir)
+        if self._trainer is not None and self._trainer["version"] == version:
+            return self._trainer
+        path = os.path.join(self.model_dir, TRAINER_FILE)
+        if os.path.exists(path):
+            self._trainer = joblib.load(path)
+            if self._trainer["version"] != version:
+                # Interrupted between saving the trainer and publishing it
+                self._publish(self._trainer)
+        else:
+            self._publish(self._seed())
+        return self._trainer
+
+    def _publish(self, trainer):
+        """Persist trainer state, then publish its weights as a memory-mappable artifact"""
+        os.makedirs(self.model_dir, exist_ok=True)
+        path = os.path.join(self.model_dir, TRAINER_FILE)
+        # Write then rename, so a crash never leaves a half-written file
+        joblib.dump(trainer, f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+
+        classifier = trainer["classifier"]
+        artifacts.publish(self.model_dir, trainer["version"], {
+            "coef": classifier.coef_.T.astype(np.float32),
+            "intercept": classifier.intercept_.astype(np.float32),
+            "classes": np.asarray(classifier.classes_, dtype=str),
+        }, meta={
+            "last_correction_id": trainer["last_correction_id"],
+            "corrections_learned": trainer["corrections_learned"],
+            "published_at": datetime.utcnow().isoformat(),
+            "n_features": N_FEATURES,
+        })
+        self._trainer = trainer
+
+    @contextmanager
+    def _process_lock(self, blocking):
+        """Exclusive lock across processes, so one uvicorn worker trains at a time; yields whether it was acquired"""
+        os.makedirs(self.model_dir, exist_ok=True)
+        with open(os.path.join(self.model_dir, LOCK_FILE), "w") as lock_file:
+            acquired = True
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+                except BlockingIOError:
+                    acquired = False
+            # Closing the file releases the lock
+            yield acquired
+
+    def learn_pending(self, db, batch_size=LEARNER_BATCH_SIZE):
+        """
+        Learn every correction newer than the published watermark and publish a new version.
+
+        Args:
+            db: Database session
+            batch_size: Corrections per partial_fit call
+
+        Returns:
+            Number of corrections learned (0 leaves the published version unchanged,
+            also when another process is training right now)
+        """
+        with self._train_lock, self._process_lock(blocking=False) as acquired:
+            if not acquired:
+                return 0
+            trainer = self._load_trainer()
+            started = time.perf_counter()
+            known = set(str(c) for c in trainer["classifier"].classes_)
+            last_id = trainer["last_correction_id"]
+            learned = 0
+
+            try:
+                while True:
+                    rows = db.query(
+                        models.CategoryCorrection.id,
+                        models.CategoryCorrection.text,
+                        models.CategoryCorrection.corrected_category
+                    ).filter(
+                        models.CategoryCorrection.id > last_id
+                    ).order_by(models.CategoryCorrection.id).limit(batch_size).all()
+                    if not rows:
+                        break
+                    last_id = rows[-1].id
+                    batch = [(row.text, row.corrected_category) for row in rows if row.corrected_category in known]
+                    if len(batch) < len(rows):
+                        logger.warning(f"Skipped {len(rows) - len(batch)} corrections to categories the learner does not know")
+                    if batch:
+                        texts, labels = zip(*batch)
+                        trainer["classifier"].partial_fit(_vectorizer.transform(texts), labels)
+                        learned += len(batch)
+            except Exception:
+                # The in-memory weights may be half-updated; reload them from disk next time
+                self._trainer = None
+                raise
+
+            if last_id == trainer["last_correction_id"]:
+                return 0
+
+            version = trainer["version"] + 1
+            self._publish({
+                "version": version,
+                "classifier": trainer["classifier"],
+                "last_correction_id": last_id,
+                "corrections_learned": trainer["corrections_learned"] + learned,
+            })
+            self._next_check = 0.0
+            self.last_batch = {
+                "corrections": learned,
+                "seconds": round(time.perf_counter() - started, 4),
+                "finished_at": datetime.utcnow().isoformat(),
+            }
+            logger.info(f"Published category learner v{version} ({learned} new corrections)")
+            return learned
+
+    def start(self):
+        """Start the background training thread if it is not running"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="category-learner", daemon=True)
+                self._worker.start()
+
+    def notify(self):
+        """Tell the background thread new corrections are waiting"""
+        self.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            if self._wake.wait(LEARNER_INTERVAL_SECONDS):
+                time.sleep(LEARNER_DEBOUNCE_SECONDS)
+            self._wake.clear()
+            db = SessionLocal()
+            try:
+                self.learn_pending(db)
+            except Exception as e:
+                logger.error(f"Category learner update failed: {str(e)}")
+            finally:
+                db.close()
+
+    # ---------- prediction ----------
+
+    def predict(self, text: str):
+        """
+        Predict a category with the published model.
+
+        Returns:
+            Tuple of (category, probability, model version)
+        """
+        return self.predict_batch([text])[0]
+
+    def predict_batch(self, texts):
+        """predict() for many texts with one vectorized transform and matrix product"""
+        model = self.model
+        probabilities = model.predict_proba(_vectorizer.transform(texts))
+        best = probabilities.argmax(axis=1)
+        return [
+            (model.classes[b], float(probabilities[i, b]), model.version)
+            for i, b in enumerate(best.tolist())
+        ]
+
+    def _apply(self, result, category, probability, version):
+        result["category"] = category
+        result["confidence_score"] = round(probability, 2)
+        result["suggested_schemes"] = list(
+            self.analyzer.schemes_mapping.get(category, ["General Welfare Schemes"])
+        )
+        result["analysis_explanation"]["category_detection"] = f"Learned model v{version} predicted '{category}'"
+        result["analysis_explanation"]["confidence"] = format_confidence(result["confidence_score"])
+        result["analysis_explanation"]["learner_version"] = version
+        return result
+
+    def analyze(self, text: str):
+        """
+        Live analysis with the category replaced by the learner's prediction.
+
+        Same result shape as GrievanceAnalyzer.analyze, so the learner can run
+        as a shadow-mode candidate; priority still comes from the keyword rules.
+        """
+        return self._apply(self.analyzer.analyze(text), *self.predict(text))
+
+    def analyze_batch(self, texts):
+        """analyze() for many texts; the model runs once for the whole batch"""
+        results = self.analyzer.analyze_batch(texts)
+        return [
+            self._apply(result, *prediction)
+            for result, prediction in zip(results, self.predict_batch(texts))
+        ]
+
+    def stats(self, db=None):
+        model = self.model
+        stats = {
+            "version": model.version,
+            "published_at": model.published_at.isoformat(),
+            "classes": model.classes,
+            "last_correction_id": model.last_correction_id,
+            "corrections_learned": model.corrections_learned,
+            "last_batch": self.last_batch,
+            "model_dir": self.model_dir,
+            "training_thread_alive": self._worker is not None and self._worker.is_alive(),
+        }
+        if db is not None:
+            stats["pending_corrections"] = db.query(models.CategoryCorrection).filter(
+                models.CategoryCorrection.id > model.last_correction_id
+            ).count()
+        return stats
+
+
+category_learner = OnlineCategoryLearner()
@@ -0,0 +1,167 @@
+"""
+Optional spaCy lemmatization stage for the keyword analyzer.
+
+Exact keyword matching misses inflections the substring check cannot see
+("children", "books" vs "book"). When ANALYZER_LEMMATIZE is on, English text
+is also reduced to lemmas and keywords are matched against either form.
+
+The stage is off by default and costs nothing then: spaCy is imported and
+the pipeline (SPACY_MODEL, parser and NER excluded) loaded only on first
+use. Lemmas of tokens already seen are memoized, so a text whose tokens are
+all known skips the pipeline entirely; bulk callers go through
+lemmatize_many, which runs the remaining texts through nlp.pipe with
+LEMMA_N_PROCESS processes. If spaCy or the model is missing, a warning is
+logged once and analysis continues on the plain keyword path.
+"""
+
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+# Distinct tokens whose lemma is memoized; once full, only known tokens are served
+LEMMA_CACHE_SIZE = int(os.getenv("LEMMA_CACHE_SIZE", "100000"))
+
+# nlp.pipe settings for batches
+LEMMA_BATCH_SIZE = int(os.getenv("LEMMA_BATCH_SIZE", "256"))
+LEMMA_N_PROCESS = int(os.getenv("LEMMA_N_PROCESS", "1"))
+
+# Pipeline components the lemmatizer does not need
+EXCLUDED_COMPONENTS = ["parser", "ner", "senter"]
+
+_TOKEN = re.compile(r"\w+")
+
+
+class LemmaKeywordMatcher:
+    """A KeywordMatcher's tables with the lemma of every keyword alongside it"""
+
+    __slots__ = ("categories", "high", "low")
+
+    def __init__(self, matcher, lemmatize):
+        def forms(keywords):
+            return tuple((keyword, lemmatize(keyword)) for keyword in keywords)
+
+        self.categories = tuple((category, forms(keywords)) for category, keywords in matcher.categories)
+        self.high = forms(matcher.high)
+        self.low = forms(matcher.low)
+
+    def match(self, text_lower: str, lemmas: str):
+        """Same result as KeywordMatcher.match; a keyword counts if it or its lemma is found"""
+        counts = {
+            category: sum(1 for keyword, lemma in keywords if keyword in text_lower or lemma in lemmas)
+            for category, keywords in self.categories
+        }
+        high_found = [keyword for keyword, lemma in self.high if keyword in text_lower or lemma in lemmas]
+        low_found = any(keyword in text_lower or lemma in lemmas for keyword, lemma in self.low)
+        return counts, high_found, low_found
+
+
+class Lemmatizer:
+    """Lazily loaded spaCy lemmatizer with a token -> lemma memo"""
+
+    def __init__(self, model=SPACY_MODEL, cache_size=LEMMA_CACHE_SIZE):
+        self.model = model
+        self.cache_size = cache_size
+        self._nlp = None
+        self._unavailable = False
+        self._load_lock = threading.Lock()
+        self._memo = {}
+        self._matchers = {}
+        self.memo_hits = 0
+        self.pipeline_texts = 0
+
+    @property
+    def nlp(self):
+        """The spaCy pipeline, loaded on first use (None if spaCy or the model is unavailable)"""
+        if self._nlp is None and not self._unavailable:
+            with self._load_lock:
+                if self._nlp is None and not self._unavailable:
+                    try:
+                        import spacy
+                        self._nlp = spacy.load(self.model, exclude=EXCLUDED_COMPONENTS)
+                        logger.info(f"Loaded spaCy pipeline {self.model} for lemmatization")
+                    except (ImportError, OSError) as e:
+                        self._unavailable = True
+                        logger.warning(f"Lemmatization disabled, could not load spaCy model {self.model}: {str(e)}")
+        return self._nlp
+
+    @property
+    def available(self) -> bool:
+        return self.nlp is not None
+
+    def _from_memo(self, text_lower):
+        """Lemma text built from memoized tokens, or None if any token is new"""
+        lemmas = []
+        for token in _TOKEN.findall(text_lower):
+            lemma = self._memo.get(token)
+            if lemma is None:
+                return None
+            lemmas.append(lemma)
+        self.memo_hits += 1
+        return " ".join(lemmas)
+
+    def _from_doc(self, doc):
+        lemmas = []
+        for token in doc:
+            if token.is_punct or token.is_space:
+                continue
+            lemma = token.lemma_.lower()
+            lemmas.append(lemma)
+            if len(self._memo) < self.cache_size:
+                self._memo[token.lower_] = lemma
+        self.pipeline_texts += 1
+        return " ".join(lemmas)
+
+    def lemmatize(self, text: str, text_lower: str = None):
+        """
+        Lemma text of one grievance.
+
+        Args:
+            text: Original text (casing helps the tagger)
+            text_lower: Normalized text, used for the memo lookup
+
+        Returns:
+            Space-separated lower-case lemmas, or None if the stage is unavailable
+        """
+        nlp = self.nlp
+        if nlp is None:
+            return None
+        cached = self._from_memo(text_lower if text_lower is not None else text.lower())
+        return cached if cached is not None else self._from_doc(nlp(text))
+
+    def lemmatize_many(self, texts, texts_lower=None, n_process=LEMMA_N_PROCESS, batch_size=LEMMA_BATCH_SIZE):
+        """Lemma texts for a batch; only texts with unseen tokens go through nlp.pipe"""
+        nlp = self.nlp
+        if nlp is None:
+            return [None] * len(texts)
+        texts_lower = texts_lower or [text.lower() for text in texts]
+        results = [self._from_memo(text_lower) for text_lower in texts_lower]
+        missing = [i for i, lemmas in enumerate(results) if lemmas is None]
+        docs = nlp.pipe((texts[i] for i in missing), batch_size=batch_size, n_process=n_process)
+        for i, doc in zip(missing, docs):
+            results[i] = self._from_doc(doc)
+        return results
+
+    def matcher(self, config):
+        """English matcher of a config with lemmatized keywords (built once per config version)"""
+        matcher = self._matchers.get(config.version)
+        if matcher is None:
+            base = config.matchers["en"]
+            matcher = LemmaKeywordMatcher(base, lambda keyword: self.lemmatize(keyword) or keyword)
+            # Keep only the active version; old configs are not matched again
+            self._matchers = {config.version: matcher}
+        return matcher
+
+    def stats(self):
+        return {
+            "model": self.model,
+            "loaded": self._nlp is not None,
+            "available": not self._unavailable,
+            "memoized_tokens": len(self._memo),
+            "memo_hits": self.memo_hits,
+            "pipeline_texts": self.pipeline_texts,
+        }
@@ -1,12 +1,16 @@
 from fastapi import FastAPI, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import timedelta
-from . import models, schemas, database
+from . import models, schemas, database, codes
 from .database import engine
-from .ml_engine import analyzer
+from .analysis_cache import analysis_cache
+from .shadow import shadow_evaluator
+from .recommendations import scheme_recommendations
+from . import map_clusters, heatmap, gazetteer, reverse_geocoder, wards, grievance_schemes, explanations
 from .auth import AuthService, get_current_user
 
 models.Base.metadata.create_all(bind=engine)
+codes.load_codes()
 
 app = FastAPI(
     title="Citizen Grievance & Welfare Intelligence System",
@@ -128,7 +132,9 @@ def read_root():
         "endpoints": {
             "submit_grievance": "POST /grievances/",
             "view_grievances": "GET /grievances/",
-            "get_statistics": "GET /stats/"
+            "get_statistics": "GET /stats/",
+            "suggest_locations": "GET /locations/suggest?q=",
+            "geocode_location": "GET /locations/geocode?q="
         }
     }
 
@@ -161,22 +167,46 @@ def create_grievance(
             raise HTTPException(status_code=400, detail="Description must be at least 20 characters")
         
         # AI Analysis with explainability
-        analysis = analyzer.analyze(grievance.description + " " + grievance.title)
+        analysis_text = grievance.description + " " + grievance.title
+        analysis = analysis_cache.analyze(analysis_text)
+
+        # Resolve coordinates once at write time (GPS pick or gazetteer lookup)
+        latitude, longitude, geocode_confidence = gazetteer.resolve_coordinates(
+            grievance.location, grievance.latitude, grievance.longitude
+        )
+        city, district, state = reverse_geocoder.resolve_place(latitude, longitude)
+        ward_id, ward_name, ward_version = wards.assign_ward(latitude, longitude)
+
+        # State and district schemes are precomputed per location (one map lookup)
+        analysis["suggested_schemes"] = scheme_recommendations.lookup(analysis["category"], state, district)
 
         db_grievance = models.Grievance(
             user_id=user_id,  # Link to authenticated user
             title=grievance.title,
             description=grievance.description,
             location=grievance.location,
+            latitude=latitude,
+            longitude=longitude,
+            geocode_confidence=geocode_confidence,
+            city=city,
+            district=district,
+            state=state,
+            ward_id=ward_id,
+            ward_name=ward_name,
+            ward_version=ward_version,
             category=analysis["category"],
             priority=analysis["priority"],
-            suggested_schemes=analysis["suggested_schemes"],
             confidence_score=analysis.get("confidence_score", 0.0),
-            analysis_metadata=analysis.get("analysis_explanation", {})
+            analysis_metadata=explanations.compact(analysis)
         )
         db.add(db_grievance)
+        db.flush()
+        grievance_schemes.set_schemes(db, db_grievance.id, analysis["suggested_schemes"])
+        map_clusters.record_grievance(db, latitude, longitude, "Pending")
         db.commit()
+        heatmap.invalidate_cache()
         db.refresh(db_grievance)
+        shadow_evaluator.submit(analysis_text, analysis, db_grievance.id)
         
         return schemas.GrievanceResponse(
             grievance=db_grievance,
@@ -230,7 +260,10 @@ def read_grievances(
         total_count = query.count()
         
         # Get paginated results (latest first)
-        grievances = query.order_by(models.Grievance.created_at.desc()).offset(skip).limit(limit).all()
+        # Scheme names of the whole page come from one batched query
+        grievances = grievance_schemes.with_schemes(
+            query.order_by(models.Grievance.created_at.desc()).offset(skip).limit(limit)
+        ).all()
         
         return schemas.GrievanceListResponse(
             total=total_count,
@@ -290,6 +323,72 @@ def get_statistics(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error calculating statistics: {str(e)}")
 
+# ============ LOCATION ENDPOINTS ============
+
+@app.get("/locations/suggest", response_model=schemas.LocationSuggestResponse)
+def suggest_locations(q: str = "", limit: int = gazetteer.SUGGEST_LIMIT):
+    """
+    Autocomplete a place name as the citizen types.
+    
+    Parameters:
+    - q: Partially typed place name (English, Hindi, Telugu or Tamil spelling)
+    - limit: Maximum number of suggestions (default 10, max 20)
+    
+    Matches are ranked by population.
+    """
+    try:
+        return schemas.LocationSuggestResponse(
+            query=q,
+            suggestions=[
+                schemas.LocationSuggestion(
+                    name=place.name,
+                    matched=spelling,
+                    label=place.label,
+                    kind=place.kind,
+                    district=place.district or None,
+                    state=place.state or None,
+                    latitude=place.latitude,
+                    longitude=place.longitude
+                )
+                for spelling, place in gazetteer.suggest_locations(q, limit)
+            ]
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error suggesting locations: {str(e)}")
+
+@app.get("/locations/geocode", response_model=schemas.LocationGeocodeResponse)
+def geocode_location(q: str = ""):
+    """
+    Find the known place named in a free-text location.
+    
+    Parameters:
+    - q: Location as written, e.g. "Near bus stand, Koramangala, Bangalore"
+    
+    Returns the best matching place and how reliable the match is; match is
+    null when no known place is named.
+    """
+    try:
+        result = gazetteer.geocode(q)
+        if result is None:
+            return schemas.LocationGeocodeResponse(query=q)
+        place = result.place
+        return schemas.LocationGeocodeResponse(
+            query=q,
+            match=schemas.LocationSuggestion(
+                name=place.name,
+                matched=result.matched,
+                label=place.label,
+                kind=place.kind,
+                district=place.district or None,
+                state=place.state or None,
+                latitude=result.latitude,
+                longitude=result.longitude
+            ),
+            confidence=result.confidence
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error geocoding location: {str(e)}")
+
 # ============ ADMIN ENDPOINTS ============
 
 @app.patch("/grievances/{grievance_id}/status", response_model=schemas.Grievance)
@@ -332,6 +431,9 @@ def update_grievance_status(
             )
         
         # Update status
+        map_clusters.move_grievance(
+            db, grievance.latitude, grievance.longitude, grievance.status, status_update.status
+        )
         grievance.status = status_update.status
         db.commit()
         db.refresh(grievance)
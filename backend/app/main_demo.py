@@ -9,11 +9,18 @@ from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from datetime import datetime
-from . import models, schemas, database
+from . import models, schemas, database, codes
 from .database import engine
 from .ml_engine import analyzer
+from .analysis_cache import analysis_cache
+from .batching import analysis_batcher
+from .shadow import shadow_evaluator
+from .recommendations import scheme_recommendations
+from .learner import category_learner
+from . import map_clusters, heatmap, gazetteer, reverse_geocoder, wards, recommendations, grievance_schemes, explanations
 
 models.Base.metadata.create_all(bind=engine)
+codes.load_codes()
 
 app = FastAPI(
     title="Citizen Grievance & Welfare Intelligence System",
@@ -53,7 +60,25 @@ def read_root():
             "submit_grievance": "POST /grievances/",
             "view_grievances": "GET /grievances/",
             "get_statistics": "GET /stats/",
-            "update_status": "PATCH /grievances/{id}/status"
+            "update_status": "PATCH /grievances/{id}/status",
+            "correct_category": "PATCH /grievances/{id}/category",
+            "map_clusters": "GET /map/clusters?bbox=&zoom=",
+            "map_heatmap": "GET /map/heatmap",
+            "map_hotspots": "GET /map/hotspots",
+            "incidents": "GET /incidents",
+            "update_incident_status": "PATCH /incidents/{id}/status",
+            "stats_by_city": "GET /stats/by-city",
+            "stats_by_ward": "GET /stats/by-ward",
+            "suggest_locations": "GET /locations/suggest?q=",
+            "geocode_location": "GET /locations/geocode?q=",
+            "analyzer": "GET /admin/analyzer",
+            "analysis_cache": "GET /admin/analysis-cache",
+            "analysis_batching": "GET /admin/analysis-batching",
+            "schemes": "GET /admin/schemes",
+            "scheme_grievances": "GET /admin/schemes/{id}/grievances",
+            "scheme_recommendations": "GET /admin/scheme-recommendations",
+            "shadow_evaluation": "GET /admin/shadow",
+            "category_learner": "GET /admin/learner"
         }
     }
 
@@ -180,10 +205,21 @@ def create_grievance(
             raise HTTPException(status_code=400, detail="Description must be at least 20 characters")
         
         # AI Analysis with explainability
-        analysis = analyzer.analyze(grievance.description + " " + grievance.title)
+        analysis_text = grievance.description + " " + grievance.title
+        analysis = analysis_cache.analyze(analysis_text)
+
+        # Resolve coordinates once at write time (GPS pick or gazetteer lookup)
+        latitude, longitude, geocode_confidence = gazetteer.resolve_coordinates(
+            grievance.location, grievance.latitude, grievance.longitude
+        )
+        city, district, state = reverse_geocoder.resolve_place(latitude, longitude)
+        ward_id, ward_name, ward_version = wards.assign_ward(latitude, longitude)
+
+        # State and district schemes are precomputed per location (one map lookup)
+        analysis["suggested_schemes"] = scheme_recommendations.lookup(analysis["category"], state, district)
 
         # Use raw SQL to insert without user_id (demo mode workaround)
-        from sqlalchemy import text
+        from sqlalchemy import text, bindparam
         import json
         
         # Create initial timeline entry
@@ -196,32 +232,45 @@ def create_grievance(
         
         sql = text("""
             INSERT INTO grievances 
-            (title, description, location, latitude, longitude, category, priority, status, created_at, 
-             suggested_schemes, confidence_score, analysis_metadata, status_history)
+            (title, description, location, latitude, longitude, geocode_confidence, city, district, state, ward_id, ward_name, ward_version, category, priority, status, created_at, 
+             confidence_score, analysis_metadata, status_history)
             VALUES 
-            (:title, :description, :location, :latitude, :longitude, :category, :priority, :status, :created_at,
-             :suggested_schemes, :confidence_score, :analysis_metadata, :status_history)
-        """)
+            (:title, :description, :location, :latitude, :longitude, :geocode_confidence, :city, :district, :state, :ward_id, :ward_name, :ward_version, :category, :priority, :status, :created_at,
+             :confidence_score, :analysis_metadata, :status_history)
+        """).bindparams(
+            # Stored as small-integer codes; the column types convert the names
+            *(bindparam(name, type_=models.Grievance.__table__.c[name].type) for name in ("category", "priority", "status"))
+        )
         
         result = db.execute(sql, {
             "title": grievance.title,
             "description": grievance.description,
             "location": grievance.location,
-            "latitude": getattr(grievance, 'latitude', None),
-            "longitude": getattr(grievance, 'longitude', None),
+            "latitude": latitude,
+            "longitude": longitude,
+            "geocode_confidence": geocode_confidence,
+            "city": city,
+            "district": district,
+            "state": state,
+            "ward_id": ward_id,
+            "ward_name": ward_name,
+            "ward_version": ward_version,
             "category": analysis["category"],
             "priority": analysis["priority"],
             "status": "Pending",
             "created_at": datetime.utcnow(),
-            "suggested_schemes": json.dumps(analysis["suggested_schemes"]),
             "confidence_score": analysis.get("confidence_score", 0.0),
-            "analysis_metadata": json.dumps(analysis.get("analysis_explanation", {})),
+            "analysis_metadata": json.dumps(explanations.compact(analysis)),
             "status_history": json.dumps(initial_history)
         })
-        db.commit()
-        
         # Get the inserted ID
         grievance_id = result.lastrowid
+        grievance_schemes.set_schemes(db, grievance_id, analysis["suggested_schemes"])
+        map_clusters.record_grievance(db, latitude, longitude, "Pending")
+        db.commit()
+        heatmap.invalidate_cache()
+        
+        shadow_evaluator.submit(analysis_text, analysis, grievance_id)
         
         # Fetch the created grievance
         db_grievance = db.query(models.Grievance).filter(models.Grievance.id == grievance_id).first()
@@ -278,8 +327,10 @@ def read_grievances(
         # Get total count before pagination
         total_count = query.count()
         
-        # Get paginated results (latest first)
-        grievances = query.order_by(models.Grievance.created_at.desc()).offset(skip).limit(limit).all()
+        # Get paginated results (latest first); scheme names of the whole page come from one batched query
+        grievances = grievance_schemes.with_schemes(
+            query.order_by(models.Grievance.created_at.desc()).offset(skip).limit(limit)
+        ).all()
         
         # Convert to dict for Streamlit compatibility
         grievances_list = []
@@ -291,6 +342,11 @@ def read_grievances(
                 "location": g.location,
                 "latitude": g.latitude,
                 "longitude": g.longitude,
+                "geocode_confidence": g.geocode_confidence,
+                "city": g.city,
+                "district": g.district,
+                "ward_id": g.ward_id,
+                "ward_name": g.ward_name,
                 "category": g.category,
                 "priority": g.priority,
                 "status": g.status,
@@ -317,6 +373,9 @@ def get_grievance_by_id(
 ):
     """
     Get a specific grievance by ID (Demo version - no authentication).
+
+    The analysis explanation is rebuilt from the compact stored analysis;
+    list endpoints leave it out.
     """
     try:
         grievance = db.query(models.Grievance).filter(models.Grievance.id == grievance_id).first()
@@ -337,6 +396,8 @@ def get_grievance_by_id(
             "status": grievance.status,
             "suggested_schemes": grievance.suggested_schemes or [],
             "confidence_score": grievance.confidence_score,
+            "analysis_metadata": grievance.analysis_explanation,
+            "incident_id": grievance.incident_id,
             "created_at": grievance.created_at.isoformat() if grievance.created_at else None
         }
     except HTTPException:
@@ -371,8 +432,11 @@ def delete_grievance(grievance_id: int, db: Session = Depends(get_db)):
         }
         
         # Delete the grievance
+        map_clusters.remove_grievance(db, grievance.latitude, grievance.longitude, grievance.status)
+        grievance_schemes.set_schemes(db, grievance.id, [])
         db.delete(grievance)
         db.commit()
+        heatmap.invalidate_cache()
         
         return {
             "success": True,
@@ -436,6 +500,158 @@ def get_statistics(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error calculating statistics: {str(e)}")
 
+@app.get("/stats/by-city")
+def get_statistics_by_city(
+    status: str = None,
+    category: str = None,
+    priority: str = None,
+    limit: int = 20,
+    db: Session = Depends(get_db)
+):
+    """
+    Get grievance counts per city (reverse geocoded at submission).
+    
+    Parameters:
+    - status, category, priority: Optional filters
+    - limit: Maximum number of cities to return (default 20)
+    
+    Grievances without a resolved city are reported as "Unknown".
+    """
+    try:
+        from sqlalchemy import func
+        
+        count = func.count(models.Grievance.id)
+        query = db.query(models.Grievance.city, count)
+        if status:
+            query = query.filter(models.Grievance.status == status)
+        if category:
+            query = query.filter(models.Grievance.category == category)
+        if priority:
+            query = query.filter(models.Grievance.priority == priority)
+        
+        rows = query.group_by(models.Grievance.city).order_by(count.desc()).limit(min(limit, 100)).all()
+        
+        return {
+            "by_city": [{"city": city or "Unknown", "count": n} for city, n in rows],
+            "message": "City statistics calculated successfully"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error calculating city statistics: {str(e)}")
+
+@app.get("/stats/by-ward")
+def get_statistics_by_ward(
+    status: str = None,
+    category: str = None,
+    priority: str = None,
+    limit: int = 50,
+    db: Session = Depends(get_db)
+):
+    """
+    Get grievance counts per ward (point-in-polygon assignment at submission).
+    
+    Parameters:
+    - status, category, priority: Optional filters
+    - limit: Maximum number of wards to return (default 50)
+    
+    Grievances outside every ward boundary are reported as "Unassigned".
+    """
+    try:
+        from sqlalchemy import func
+        
+        count = func.count(models.Grievance.id)
+        query = db.query(models.Grievance.ward_id, models.Grievance.ward_name, count)
+        if status:
+            query = query.filter(models.Grievance.status == status)
+        if category:
+            query = query.filter(models.Grievance.category == category)
+        if priority:
+            query = query.filter(models.Grievance.priority == priority)
+        
+        rows = (
+            query.group_by(models.Grievance.ward_id, models.Grievance.ward_name)
+            .order_by(count.desc())
+            .limit(min(limit, 500))
+            .all()
+        )
+        index = wards.get_ward_index()
+        
+        return {
+            "by_ward": [
+                {"ward_id": ward_id, "ward_name": ward_name or "Unassigned", "count": n}
+                for ward_id, ward_name, n in rows
+            ],
+            "boundaries_version": index.version if index else None,
+            "message": "Ward statistics calculated successfully"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error calculating ward statistics: {str(e)}")
+
+# ============ LOCATION ENDPOINTS ============
+
+@app.get("/locations/suggest")
+def suggest_locations(q: str = "", limit: int = gazetteer.SUGGEST_LIMIT):
+    """
+    Autocomplete a place name as the citizen types.
+    
+    Parameters:
+    - q: Partially typed place name (English, Hindi, Telugu or Tamil spelling)
+    - limit: Maximum number of suggestions (default 10, max 20)
+    
+    Matches are ranked by population.
+    """
+    try:
+        return {
+            "query": q,
+            "suggestions": [
+                {
+                    "name": place.name,
+                    "matched": spelling,
+                    "label": place.label,
+                    "kind": place.kind,
+                    "district": place.district or None,
+                    "state": place.state or None,
+                    "latitude": place.latitude,
+                    "longitude": place.longitude
+                }
+                for spelling, place in gazetteer.suggest_locations(q, limit)
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error suggesting locations: {str(e)}")
+
+@app.get("/locations/geocode")
+def geocode_location(q: str = ""):
+    """
+    Find the known place named in a free-text location.
+    
+    Parameters:
+    - q: Location as written, e.g. "Near bus stand, Koramangala, Bangalore"
+    
+    Returns the best matching place and how reliable the match is; match is
+    null when no known place is named.
+    """
+    try:
+        result = gazetteer.geocode(q)
+        if result is None:
+            return {"query": q, "match": None, "confidence": None}
+        place = result.place
+        return {
+            "query": q,
+            "match": {
+                "name": place.name,
+                "matched": result.matched,
+                "label": place.label,
+                "kind": place.kind,
+                "district": place.district or None,
+                "state": place.state or None,
+                "latitude": result.latitude,
+                "longitude": result.longitude
+            },
+            "confidence": result.confidence
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error geocoding location: {str(e)}")
+
 # ============ ADMIN ENDPOINTS ============
 
 @app.patch("/grievances/{grievance_id}/status")
@@ -495,6 +711,9 @@ def update_grievance_status(
         current_history.append(new_entry)
         
         # Update grievance
+        map_clusters.move_grievance(
+            db, grievance.latitude, grievance.longitude, grievance.status, status_update.status
+        )
         grievance.status = status_update.status
         grievance.status_history = current_history
         db.commit()
@@ -519,3 +738,701 @@ def update_grievance_status(
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error updating grievance status: {str(e)}")
+
+@app.patch("/grievances/{grievance_id}/category")
+def correct_grievance_category(
+    grievance_id: int,
+    category_update: schemas.GrievanceCategoryUpdate,
+    db: Session = Depends(get_db)
+):
+    """
+    Correct a misclassified grievance category (Admin feature).
+    
+    The correction is stored as training data for the online category
+    learner, which picks it up in the background with the next mini-batch.
+    
+    Parameters:
+    - grievance_id: ID of the grievance to correct
+    - category: Correct category (one of the analyzer categories or General)
+    - corrected_by: Optional name of the admin making the correction
+    
+    Returns:
+    - Updated grievance object
+    """
+    try:
+        allowed_categories = [*analyzer.categories, "General"]
+        if category_update.category not in allowed_categories:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid category. Allowed values: {', '.join(allowed_categories)}"
+            )
+        
+        grievance = db.query(models.Grievance).filter(models.Grievance.id == grievance_id).first()
+        
+        if not grievance:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Grievance with ID {grievance_id} not found"
+            )
+        
+        previous_category = grievance.category
+        if previous_category == category_update.category:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Grievance is already in category {previous_category}"
+            )
+        
+        import json
+        
+        current_history = grievance.status_history or []
+        if isinstance(current_history, str):
+            current_history = json.loads(current_history)
+        current_history.append({
+            "status": grievance.status,
+            "timestamp": datetime.utcnow().isoformat(),
+            "changed_by": category_update.corrected_by or "admin",
+            "action": f"Category corrected from {previous_category} to {category_update.category}"
+        })
+        
+        db.add(models.CategoryCorrection(
+            grievance_id=grievance.id,
+            text=f"{grievance.description} {grievance.title}",
+            previous_category=previous_category,
+            corrected_category=category_update.category,
+            corrected_by=category_update.corrected_by or "admin"
+        ))
+        grievance.category = category_update.category
+        grievance_schemes.set_schemes(db, grievance.id, scheme_recommendations.lookup(
+            category_update.category, grievance.state, grievance.district
+        ))
+        grievance.status_history = current_history
+        db.commit()
+        # Category-filtered heatmaps include this grievance (the map cluster counts are per status only)
+        heatmap.invalidate_cache()
+        db.refresh(grievance)
+        category_learner.notify()
+        
+        return {
+            "id": grievance.id,
+            "title": grievance.title,
+            "description": grievance.description,
+            "location": grievance.location,
+            "category": grievance.category,
+            "priority": grievance.priority,
+            "status": grievance.status,
+            "suggested_schemes": grievance.suggested_schemes or [],
+            "confidence_score": grievance.confidence_score,
+            "created_at": grievance.created_at.isoformat() if grievance.created_at else None,
+            "message": f"Category corrected from {previous_category} to {grievance.category}"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error correcting grievance category: {str(e)}")
+
+@app.get("/admin/analyzer")
+def get_analyzer_info():
+    """
+    Get the active analyzer configuration version (Admin feature).
+    
+    Keyword and scheme tables are loaded from ANALYZER_CONFIG_PATH and
+    reloaded automatically when the file changes; every stored analysis
+    records the version it was produced with.
+    """
+    config = analyzer.config
+    return {
+        "analyzer_version": config.version,
+        "config_path": analyzer.config_path,
+        "loaded_at": datetime.utcfromtimestamp(analyzer.loaded_at).isoformat() if analyzer.loaded_at else None,
+        "categories": list(config.categories),
+        "languages": list(config.matchers),
+        "lemmatizer": analyzer.lemmatizer.stats() if analyzer.lemmatizer else None
+    }
+
+@app.get("/admin/analysis-cache")
+def get_analysis_cache_stats():
+    """
+    Get hit/miss metrics for the grievance analysis cache (Admin feature).
+    
+    Identical grievance texts (e.g. forwarded messages) are analyzed once and
+    served from the cache until the analyzer's keyword tables change.
+    """
+    return analysis_cache.stats()
+
+@app.get("/admin/analysis-batching")
+def get_analysis_batching_stats():
+    """
+    Get micro-batching metrics for grievance analysis (Admin feature).
+    
+    When ANALYSIS_BATCH_WINDOW_MS is set, concurrent submissions are analyzed
+    together; this reports the realized batch sizes and the queueing delay
+    batching added to each call.
+    """
+    if analysis_batcher is None:
+        return {"enabled": False}
+    return analysis_batcher.stats()
+
+def _scheme_dict(scheme):
+    return {
+        "id": scheme.id,
+        "name": scheme.name,
+        "description": scheme.description,
+        "domain": scheme.domain,
+        "state": scheme.state,
+        "district": scheme.district,
+        "eligibility": scheme.eligibility or {},
+        "rank": scheme.rank,
+        "is_active": scheme.is_active,
+        "updated_at": scheme.updated_at.isoformat() if scheme.updated_at else None
+    }
+
+def _rebuild_scheme_recommendations(db, extra_scopes=(), full=False):
+    """Rebuild the precomputed suggestions (incrementally unless full) and reload them in this process"""
+    version, written = recommendations.rebuild(
+        db, [*analyzer.categories, "General"], full=full, extra_scopes=extra_scopes
+    )
+    scheme_recommendations.invalidate()
+    return {"build_version": version, "rows_written": written}
+
+@app.get("/admin/schemes")
+def list_schemes(
+    domain: str = None,
+    state: str = None,
+    include_inactive: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    List welfare schemes (Admin feature).
+    
+    Parameters:
+    - domain: Filter by grievance category served (e.g., Healthcare)
+    - state: Filter by state (national schemes have none)
+    - include_inactive: Also list deactivated schemes
+    """
+    try:
+        query = db.query(models.Scheme)
+        if domain:
+            query = query.filter(models.Scheme.domain == domain)
+        if state:
+            query = query.filter(models.Scheme.state == state)
+        if not include_inactive:
+            query = query.filter(models.Scheme.is_active.isnot(False))
+        schemes = query.order_by(models.Scheme.domain, models.Scheme.state, models.Scheme.rank, models.Scheme.name).all()
+        return {"schemes": [_scheme_dict(s) for s in schemes], "total": len(schemes)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading schemes: {str(e)}")
+
+@app.post("/admin/schemes")
+def upsert_scheme(scheme_data: schemas.SchemeBase, db: Session = Depends(get_db)):
+    """
+    Add a welfare scheme, or update the scheme with the same name (Admin feature).
+    
+    Parameters:
+    - name, description: Scheme details
+    - domain: Grievance category the scheme serves
+    - state, district: Where it applies (empty for national / state-wide schemes)
+    - eligibility: Optional rules: categories (more categories served),
+      districts (subset of the state), exclude_districts
+    - rank: Lower ranks are suggested first
+    - is_active: False retires the scheme
+    
+    The precomputed suggestions for the affected categories and states are
+    rebuilt before returning.
+    """
+    try:
+        allowed_categories = [*analyzer.categories, "General"]
+        if scheme_data.domain not in allowed_categories:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid domain. Allowed values: {', '.join(allowed_categories)}"
+            )
+        
+        scheme = db.query(models.Scheme).filter(models.Scheme.name == scheme_data.name).first()
+        # A scheme moved to another state or category must also leave its old rows
+        previous_scopes = [
+            (category, scheme.state) for category in recommendations.scheme_categories(scheme)
+        ] if scheme else []
+        if scheme is None:
+            scheme = models.Scheme(name=scheme_data.name)
+            db.add(scheme)
+        scheme.description = scheme_data.description
+        scheme.domain = scheme_data.domain
+        scheme.state = scheme_data.state or None
+        scheme.district = scheme_data.district or None
+        scheme.eligibility = scheme_data.eligibility or {}
+        scheme.rank = scheme_data.rank or 0
+        scheme.is_active = scheme_data.is_active is not False
+        scheme.updated_at = datetime.utcnow()
+        db.commit()
+        db.refresh(scheme)
+        
+        return {"scheme": _scheme_dict(scheme), **_rebuild_scheme_recommendations(db, previous_scopes)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error saving scheme: {str(e)}")
+
+@app.delete("/admin/schemes/{scheme_id}")
+def deactivate_scheme(scheme_id: int, db: Session = Depends(get_db)):
+    """
+    Retire a welfare scheme (Admin feature).
+    
+    The scheme is deactivated rather than deleted, so the incremental
+    rebuild sees the change and stops suggesting it.
+    
+    Parameters:
+    - scheme_id: ID of the scheme to retire
+    """
+    try:
+        scheme = db.query(models.Scheme).filter(models.Scheme.id == scheme_id).first()
+        if not scheme:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Scheme with ID {scheme_id} not found"
+            )
+        scheme.is_active = False
+        scheme.updated_at = datetime.utcnow()
+        db.commit()
+        
+        return {"id": scheme_id, "is_active": False, **_rebuild_scheme_recommendations(db)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error retiring scheme: {str(e)}")
+
+@app.get("/admin/schemes/{scheme_id}/grievances")
+def list_scheme_grievances(
+    scheme_id: int,
+    skip: int = 0,
+    limit: int = 50,
+    status: str = None,
+    db: Session = Depends(get_db)
+):
+    """
+    List the grievances a welfare scheme was suggested for (Admin feature).
+
+    Parameters:
+    - scheme_id: ID of the scheme
+    - skip: Number of records to skip (pagination)
+    - limit: Maximum records to return (default 50, max 100)
+    - status: Filter by grievance status
+    """
+    try:
+        scheme = db.query(models.Scheme).filter(models.Scheme.id == scheme_id).first()
+        if not scheme:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Scheme with ID {scheme_id} not found"
+            )
+
+        query = db.query(models.Grievance).join(
+            models.GrievanceScheme, models.GrievanceScheme.grievance_id == models.Grievance.id
+        ).filter(models.GrievanceScheme.scheme_id == scheme_id)
+        if status:
+            query = query.filter(models.Grievance.status == status)
+        total_count = query.count()
+        grievances = query.order_by(models.Grievance.created_at.desc()).offset(skip).limit(min(limit, 100)).all()
+
+        return {
+            "scheme": _scheme_dict(scheme),
+            "total": total_count,
+            "count": len(grievances),
+            "skip": skip,
+            "grievances": [
+                {
+                    "id": g.id,
+                    "title": g.title,
+                    "category": g.category,
+                    "priority": g.priority,
+                    "status": g.status,
+                    "city": g.city,
+                    "district": g.district,
+                    "created_at": g.created_at.isoformat() if g.created_at else None
+                }
+                for g in grievances
+            ]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving scheme grievances: {str(e)}")
+
+@app.get("/admin/scheme-recommendations")
+def get_scheme_recommendations(category: str = None, state: str = None, district: str = None):
+    """
+    Get the precomputed scheme suggestion map's version and usage (Admin feature).
+    
+    Parameters:
+    - category, state, district: Optionally preview the suggestions for a location
+    """
+    preview = scheme_recommendations.lookup(category, state, district) if category else None
+    result = scheme_recommendations.stats()
+    if category:
+        result["preview"] = preview
+    return result
+
+@app.post("/admin/scheme-recommendations/rebuild")
+def rebuild_scheme_recommendations(full: bool = False, db: Session = Depends(get_db)):
+    """
+    Rebuild the precomputed scheme suggestions (Admin feature).
+    
+    Parameters:
+    - full: Recompute every row (default: only rows affected by scheme changes)
+    """
+    try:
+        return _rebuild_scheme_recommendations(db, full=full)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error rebuilding scheme recommendations: {str(e)}")
+
+@app.get("/admin/learner")
+def get_category_learner(db: Session = Depends(get_db)):
+    """
+    Get the online category learner's published version (Admin feature).
+    
+    The learner is updated in the background from admin category
+    corrections, one mini-batch of new corrections at a time, and each
+    update is published as a new model version.
+    """
+    try:
+        category_learner.start()
+        return category_learner.stats(db)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading category learner: {str(e)}")
+
+@app.post("/admin/learner/train")
+def train_category_learner(db: Session = Depends(get_db)):
+    """
+    Learn pending category corrections now instead of waiting for the background update (Admin feature).
+    """
+    try:
+        learned = category_learner.learn_pending(db)
+        return {
+            "learned": learned,
+            "version": category_learner.model.version,
+            "message": f"Learned {learned} new correction(s)" if learned else "No new corrections to learn"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error training category learner: {str(e)}")
+
+@app.get("/admin/shadow")
+def get_shadow_evaluation():
+    """
+    Get shadow-mode results for candidate analyzers (Admin feature).
+    
+    A sample of submissions (SHADOW_SAMPLE_RATE) is evaluated off the request
+    path by every candidate in SHADOW_CANDIDATES. Returns category and
+    priority agreement with the live analyzer, confusion matrices (live ->
+    candidate), recent disagreements and per-backend latency histograms.
+    """
+    return shadow_evaluator.stats()
+
+@app.post("/admin/shadow/reset")
+def reset_shadow_evaluation():
+    """
+    Clear shadow-mode metrics, e.g. after changing a candidate (Admin feature).
+    """
+    shadow_evaluator.reset()
+    return {"message": "Shadow evaluation metrics reset"}
+
+
+# ============ MAP ENDPOINTS ============
+
+@app.get("/map/clusters")
+def get_map_clusters(
+    bbox: str,
+    zoom: int,
+    status: str = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get precomputed grievance clusters for a map view.
+    
+    Parameters:
+    - bbox: Visible area as "min_lon,min_lat,max_lon,max_lat"
+    - zoom: Map zoom level
+    - status: Optional comma-separated list of statuses to include
+    
+    Returns cluster centroids with per-status counts for colouring.
+    Above the maximum cluster zoom, individual markers are returned instead.
+    """
+    try:
+        bounds = map_clusters.parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid bbox: {str(e)}")
+    
+    try:
+        statuses = [s.strip() for s in status.split(",") if s.strip()] if status else None
+        return map_clusters.query_clusters(db, bounds, zoom, statuses=statuses)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading map clusters: {str(e)}")
+
+
+@app.get("/map/heatmap")
+def get_map_heatmap(
+    category: str = None,
+    priority: str = None,
+    days: int = None,
+    resolution: float = heatmap.DEFAULT_RESOLUTION,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a grievance density grid for heatmap display.
+    
+    Parameters:
+    - category: Filter by category (e.g., Sanitation)
+    - priority: Filter by priority (High, Medium, Low)
+    - days: Only include grievances from the last N days
+    - resolution: Grid cell size in degrees (0.01 to 2.0, default 0.1)
+    
+    Returns non-empty cells as [latitude, longitude, count].
+    """
+    if days is not None and days <= 0:
+        raise HTTPException(status_code=400, detail="days must be a positive number")
+    
+    try:
+        return heatmap.compute_heatmap(
+            db, resolution=resolution, category=category, priority=priority, days=days
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error computing heatmap: {str(e)}")
+
+
+@app.get("/map/hotspots")
+def get_map_hotspots(
+    category: str = None,
+    min_count: int = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the geographic hotspots found by the latest hotspot detection run.
+    
+    Parameters:
+    - category: Filter by category (e.g., Sanitation)
+    - min_count: Only hotspots with at least this many grievances
+    
+    Hotspots are recomputed periodically by detect_hotspots.py.
+    """
+    try:
+        query = db.query(models.Hotspot)
+        if category:
+            query = query.filter(models.Hotspot.category == category)
+        if min_count:
+            query = query.filter(models.Hotspot.member_count >= min_count)
+        
+        hotspots = query.order_by(models.Hotspot.member_count.desc()).all()
+        
+        return {
+            "hotspots": [
+                {
+                    "id": h.id,
+                    "category": h.category,
+                    "latitude": h.latitude,
+                    "longitude": h.longitude,
+                    "radius_km": h.radius_km,
+                    "member_count": h.member_count,
+                    "member_ids": h.member_ids or [],
+                    "city": h.city,
+                    "district": h.district,
+                    "first_reported_at": h.first_reported_at.isoformat() if h.first_reported_at else None,
+                    "last_reported_at": h.last_reported_at.isoformat() if h.last_reported_at else None,
+                    "detected_at": h.detected_at.isoformat() if h.detected_at else None
+                }
+                for h in hotspots
+            ],
+            "total": len(hotspots)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading hotspots: {str(e)}")
+
+
+# ============ INCIDENT ENDPOINTS ============
+
+def _incident_member_counts(db, incident_ids):
+    """Current member and open (not resolved) counts per incident"""
+    from sqlalchemy import func, case
+    rows = db.query(
+        models.Grievance.incident_id,
+        func.count(models.Grievance.id),
+        func.sum(case((models.Grievance.status != "Resolved", 1), else_=0))
+    ).filter(
+        models.Grievance.incident_id.in_(incident_ids)
+    ).group_by(models.Grievance.incident_id).all()
+    return {incident_id: (members, int(open_count or 0)) for incident_id, members, open_count in rows}
+
+def _incident_dict(incident, members, open_count):
+    return {
+        "id": incident.id,
+        "title": incident.title,
+        "category": incident.category,
+        "status": incident.status,
+        "member_count": members,
+        "open_count": open_count,
+        "latitude": incident.latitude,
+        "longitude": incident.longitude,
+        "city": incident.city,
+        "district": incident.district,
+        "first_reported_at": incident.first_reported_at.isoformat() if incident.first_reported_at else None,
+        "last_reported_at": incident.last_reported_at.isoformat() if incident.last_reported_at else None,
+        "detected_at": incident.detected_at.isoformat() if incident.detected_at else None
+    }
+
+@app.get("/incidents")
+def get_incidents(
+    status: str = None,
+    category: str = None,
+    min_members: int = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the incidents (groups of near-duplicate grievances) with their member counts.
+    
+    Parameters:
+    - status: Filter by incident status (Pending, In Progress, Resolved)
+    - category: Filter by category (e.g., Water Supply)
+    - min_members: Only incidents with at least this many grievances
+    
+    Incidents are found periodically by cluster_incidents.py; member counts
+    are current.
+    """
+    try:
+        query = db.query(models.Incident)
+        if status:
+            query = query.filter(models.Incident.status == status)
+        if category:
+            query = query.filter(models.Incident.category == category)
+        incidents = query.all()
+        
+        counts = _incident_member_counts(db, [i.id for i in incidents])
+        results = [
+            _incident_dict(i, *counts.get(i.id, (0, 0)))
+            for i in incidents
+        ]
+        if min_members:
+            results = [r for r in results if r["member_count"] >= min_members]
+        results.sort(key=lambda r: (r["member_count"], r["id"]), reverse=True)
+        
+        return {
+            "incidents": results,
+            "total": len(results)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading incidents: {str(e)}")
+
+@app.get("/incidents/{incident_id}")
+def get_incident_by_id(incident_id: int, db: Session = Depends(get_db)):
+    """
+    Get one incident with its member grievances.
+    
+    Parameters:
+    - incident_id: ID of the incident
+    """
+    try:
+        incident = db.query(models.Incident).filter(models.Incident.id == incident_id).first()
+        if not incident:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Incident with ID {incident_id} not found"
+            )
+        
+        members = db.query(
+            models.Grievance.id,
+            models.Grievance.title,
+            models.Grievance.status,
+            models.Grievance.priority,
+            models.Grievance.location,
+            models.Grievance.created_at
+        ).filter(
+            models.Grievance.incident_id == incident_id
+        ).order_by(models.Grievance.created_at).all()
+        
+        result = _incident_dict(
+            incident, len(members), sum(1 for m in members if m.status != "Resolved")
+        )
+        result["members"] = [
+            {
+                "id": m.id,
+                "title": m.title,
+                "status": m.status,
+                "priority": m.priority,
+                "location": m.location,
+                "created_at": m.created_at.isoformat() if m.created_at else None
+            }
+            for m in members
+        ]
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving incident: {str(e)}")
+
+@app.patch("/incidents/{incident_id}/status")
+def update_incident_status(
+    incident_id: int,
+    status_update: schemas.GrievanceStatusUpdate,
+    db: Session = Depends(get_db)
+):
+    """
+    Update the status of an incident and all of its grievances (Admin feature).
+    
+    Each member grievance gets the new status and a timeline entry, in one
+    transaction. Members that already have the status are left unchanged.
+    
+    Parameters:
+    - incident_id: ID of the incident to update
+    - status: New status value (Pending, In Progress, or Resolved)
+    """
+    try:
+        allowed_statuses = ["Pending", "In Progress", "Resolved"]
+        if status_update.status not in allowed_statuses:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid status. Allowed values: {', '.join(allowed_statuses)}"
+            )
+        
+        incident = db.query(models.Incident).filter(models.Incident.id == incident_id).first()
+        if not incident:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Incident with ID {incident_id} not found"
+            )
+        
+        members = db.query(models.Grievance).filter(models.Grievance.incident_id == incident_id).all()
+        timestamp = datetime.utcnow().isoformat()
+        updated_ids = []
+        for grievance in members:
+            if grievance.status == status_update.status:
+                continue
+            map_clusters.move_grievance(
+                db, grievance.latitude, grievance.longitude, grievance.status, status_update.status
+            )
+            # Sessions do not autoflush: the next member's cell lookup must see this one's cells
+            db.flush()
+            grievance.status_history = list(grievance.status_history or []) + [{
+                "status": status_update.status,
+                "timestamp": timestamp,
+                "changed_by": "admin",
+                "action": f"Status changed to {status_update.status} (incident #{incident_id})"
+            }]
+            grievance.status = status_update.status
+            updated_ids.append(grievance.id)
+        incident.status = status_update.status
+        db.commit()
+        
+        return {
+            "id": incident.id,
+            "status": incident.status,
+            "member_count": len(members),
+            "updated_count": len(updated_ids),
+            "updated_ids": updated_ids,
+            "message": f"Status of {len(updated_ids)} grievance(s) updated to: {status_update.status}"
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error updating incident status: {str(e)}")
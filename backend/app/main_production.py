@@ -12,7 +12,7 @@ import time
 import os
 from datetime import datetime, timedelta
 from typing import Optional
-from . import models, schemas, database
+from . import models, schemas, database, codes
 from .database import engine
 from .ml_engine import analyzer
 from .security import (
@@ -26,6 +26,7 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 # Database setup
 models.Base.metadata.create_all(bind=engine)
+codes.load_codes()
 
 # Configure logging
 logging.basicConfig(
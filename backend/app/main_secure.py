@@ -15,7 +15,7 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
-from . import models, schemas, database
+from . import models, schemas, database, gazetteer, codes, grievance_schemes
 from .database import engine
 from .ml_engine import analyzer
 from .security import RateLimiter
@@ -36,6 +36,7 @@ logger = logging.getLogger(__name__)
 
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
+codes.load_codes()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -175,15 +176,22 @@ async def create_grievance(
         # Perform AI analysis
         analysis = analyzer.analyze(grievance.description, grievance.title)
         
+        # Resolve coordinates once at write time (GPS pick or gazetteer lookup)
+        latitude, longitude, geocode_confidence = gazetteer.resolve_coordinates(
+            grievance.location, grievance.latitude, grievance.longitude
+        )
+        
         # Create grievance record
         db_grievance = models.Grievance(
             title=grievance.title,
             description=grievance.description,
             location=grievance.location,
+            latitude=latitude,
+            longitude=longitude,
+            geocode_confidence=geocode_confidence,
             category=analysis["category"],
             priority=analysis["priority"],
             status="Pending",
-            suggested_schemes=analysis["suggested_schemes"],
             analysis_metadata={
                 "confidence": analysis["confidence"],
                 "explanation": analysis["explanation"]
@@ -191,6 +199,8 @@ async def create_grievance(
         )
         
         db.add(db_grievance)
+        db.flush()
+        grievance_schemes.set_schemes(db, db_grievance.id, analysis["suggested_schemes"])
         db.commit()
         db.refresh(db_grievance)
         
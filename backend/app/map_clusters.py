@@ -0,0 +1,239 @@
+"""
+Server-side map clustering for grievance locations.
+
+Grievance coordinates are aggregated into a Web Mercator grid pyramid
+(one grid per zoom level) stored in the map_cluster_cells table.
+The pyramid is updated incrementally whenever a grievance is inserted,
+changes status or is deleted, so serving a map view is a single indexed
+range query instead of shipping every point to the browser.
+"""
+
+import math
+from collections import defaultdict
+from sqlalchemy import and_, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from . import models
+
+# Highest zoom level served as cluster aggregates. Above this the API
+# returns individual grievance markers for the requested bounding box.
+MAX_CLUSTER_ZOOM = 14
+
+# Each map tile (256px) is split into 2**CELL_SHIFT cells per axis,
+# giving clusters roughly 64px wide on screen.
+CELL_SHIFT = 2
+
+# Web Mercator is undefined at the poles
+MAX_LATITUDE = 85.05112878
+
+# Safety cap on individual markers returned at high zoom
+MAX_MARKERS = 2000
+
+
+def _project(lat, lon):
+    """Project lat/lon to normalized Web Mercator coordinates in [0, 1)"""
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    x = (lon + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return min(max(x, 0.0), 0.999999999), min(max(y, 0.0), 0.999999999)
+
+
+def cell_for(lat, lon, zoom):
+    """Return the (cell_x, cell_y) grid cell containing a point at a zoom level"""
+    x, y = _project(lat, lon)
+    n = 1 << (zoom + CELL_SHIFT)
+    return int(x * n), int(y * n)
+
+
+def parse_bbox(bbox):
+    """
+    Parse a "min_lon,min_lat,max_lon,max_lat" string.
+
+    Raises ValueError if the string is malformed.
+    """
+    parts = [float(p) for p in bbox.split(",")]
+    if len(parts) != 4:
+        raise ValueError("bbox must have 4 comma-separated values")
+    min_lon, min_lat, max_lon, max_lat = parts
+    if min_lon > max_lon or min_lat > max_lat:
+        raise ValueError("bbox minimums must not exceed maximums")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def _apply_delta(db, lat, lon, status, delta):
+    """
+    Add delta to every pyramid cell covering a point (caller commits).
+
+    All zoom levels are written with one INSERT ... ON CONFLICT DO UPDATE,
+    so the addition happens inside the database and concurrent writers to
+    the same cell cannot race each other into the unique constraint.
+    """
+    table = models.MapClusterCell.__table__
+    keys = {zoom: cell_for(lat, lon, zoom) for zoom in range(MAX_CLUSTER_ZOOM + 1)}
+
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    stmt = insert(table).values([
+        {
+            "zoom": zoom, "cell_x": cx, "cell_y": cy, "status": status,
+            "count": delta, "lat_sum": delta * lat, "lon_sum": delta * lon
+        }
+        for zoom, (cx, cy) in keys.items()
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["zoom", "cell_x", "cell_y", "status"],
+        set_={
+            "count": table.c.count + stmt.excluded.count,
+            "lat_sum": table.c.lat_sum + stmt.excluded.lat_sum,
+            "lon_sum": table.c.lon_sum + stmt.excluded.lon_sum,
+        }
+    ))
+
+    if delta < 0:
+        # Drop the cells the removal emptied
+        db.execute(table.delete().where(
+            table.c.status == status,
+            table.c.count <= 0,
+            or_(*[
+                and_(table.c.zoom == zoom, table.c.cell_x == cx, table.c.cell_y == cy)
+                for zoom, (cx, cy) in keys.items()
+            ])
+        ))
+
+
+def record_grievance(db, lat, lon, status):
+    """Add a newly stored grievance to the cluster pyramid"""
+    if lat is None or lon is None:
+        return
+    _apply_delta(db, lat, lon, status or "Pending", 1)
+
+
+def remove_grievance(db, lat, lon, status):
+    """Remove a deleted grievance from the cluster pyramid"""
+    if lat is None or lon is None:
+        return
+    _apply_delta(db, lat, lon, status or "Pending", -1)
+
+
+def move_grievance(db, lat, lon, old_status, new_status):
+    """Move a grievance between status buckets after a status change"""
+    if lat is None or lon is None or old_status == new_status:
+        return
+    _apply_delta(db, lat, lon, old_status or "Pending", -1)
+    _apply_delta(db, lat, lon, new_status or "Pending", 1)
+
+
+def rebuild_pyramid(db):
+    """
+    Recompute the whole pyramid from the grievances table.
+
+    Used for the initial backfill and after bulk coordinate changes.
+    Returns the number of grievances aggregated.
+    """
+    totals = defaultdict(lambda: [0, 0.0, 0.0])
+    rows = db.query(
+        models.Grievance.latitude, models.Grievance.longitude, models.Grievance.status
+    ).filter(
+        models.Grievance.latitude.isnot(None),
+        models.Grievance.longitude.isnot(None)
+    ).yield_per(5000)
+
+    placed = 0
+    for lat, lon, status in rows:
+        placed += 1
+        for zoom in range(MAX_CLUSTER_ZOOM + 1):
+            cx, cy = cell_for(lat, lon, zoom)
+            bucket = totals[(zoom, cx, cy, status or "Pending")]
+            bucket[0] += 1
+            bucket[1] += lat
+            bucket[2] += lon
+
+    db.query(models.MapClusterCell).delete()
+    db.bulk_insert_mappings(models.MapClusterCell, [
+        {
+            "zoom": zoom, "cell_x": cx, "cell_y": cy, "status": status,
+            "count": count, "lat_sum": lat_sum, "lon_sum": lon_sum
+        }
+        for (zoom, cx, cy, status), (count, lat_sum, lon_sum) in totals.items()
+    ])
+    db.commit()
+    return placed
+
+
+def query_clusters(db, bbox, zoom, statuses=None):
+    """
+    Return cluster aggregates (or individual markers at high zoom) for a view.
+
+    Args:
+        db: Database session
+        bbox: Tuple of (min_lon, min_lat, max_lon, max_lat)
+        zoom: Map zoom level
+        statuses: Optional list of statuses to include
+
+    Returns:
+        Dict with "mode" set to "clusters" or "markers"
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    zoom = max(0, int(zoom))
+
+    if zoom > MAX_CLUSTER_ZOOM:
+        query = db.query(
+            models.Grievance.id, models.Grievance.title, models.Grievance.status,
+            models.Grievance.category, models.Grievance.priority,
+            models.Grievance.latitude, models.Grievance.longitude
+        ).filter(
+            models.Grievance.latitude.between(min_lat, max_lat),
+            models.Grievance.longitude.between(min_lon, max_lon)
+        )
+        if statuses:
+            query = query.filter(models.Grievance.status.in_(statuses))
+        rows = query.limit(MAX_MARKERS).all()
+        return {
+            "mode": "markers",
+            "zoom": zoom,
+            "markers": [
+                {
+                    "id": r.id,
+                    "title": r.title,
+                    "status": r.status,
+                    "category": r.category,
+                    "priority": r.priority,
+                    "latitude": r.latitude,
+                    "longitude": r.longitude
+                }
+                for r in rows
+            ],
+            "truncated": len(rows) >= MAX_MARKERS
+        }
+
+    # Mercator y grows southwards, so max_lat gives the smallest cell_y
+    x0, y0 = cell_for(max_lat, min_lon, zoom)
+    x1, y1 = cell_for(min_lat, max_lon, zoom)
+
+    query = db.query(models.MapClusterCell).filter(
+        models.MapClusterCell.zoom == zoom,
+        models.MapClusterCell.cell_x.between(x0, x1),
+        models.MapClusterCell.cell_y.between(y0, y1)
+    )
+    if statuses:
+        query = query.filter(models.MapClusterCell.status.in_(statuses))
+
+    merged = {}
+    for cell in query.all():
+        key = (cell.cell_x, cell.cell_y)
+        cluster = merged.setdefault(key, {"count": 0, "lat_sum": 0.0, "lon_sum": 0.0, "by_status": {}})
+        cluster["count"] += cell.count
+        cluster["lat_sum"] += cell.lat_sum
+        cluster["lon_sum"] += cell.lon_sum
+        cluster["by_status"][cell.status] = cluster["by_status"].get(cell.status, 0) + cell.count
+
+    clusters = [
+        {
+            "cell": f"{zoom}/{cx}/{cy}",
+            "latitude": c["lat_sum"] / c["count"],
+            "longitude": c["lon_sum"] / c["count"],
+            "count": c["count"],
+            "by_status": c["by_status"]
+        }
+        for (cx, cy), c in merged.items() if c["count"] > 0
+    ]
+    return {"mode": "clusters", "zoom": zoom, "clusters": clusters}
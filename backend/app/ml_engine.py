@@ -13,35 +13,294 @@ This ML engine is intentionally simple and explainable.
 It uses lightweight NLP techniques suitable for government systems.
 Logic clarity and fairness are prioritized over black-box complexity.
 """
+import hashlib
+import json
+import logging
+import os
 import re
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from types import MappingProxyType
 
-class GrievanceAnalyzer:
-    def __init__(self):
-        # Define keywords for categorization
-        self.categories = {
-            "Healthcare": ["hospital", "doctor", "nurse", "medicine", "health", "clinic", "treatment", "ambulance"],
-            "Education": ["school", "teacher", "class", "student", "books", "education", "college", "exam"],
-            "Water Supply": ["water", "leak", "pipe", "shortage", "dirty", "supply", "tank"],
-            "Roads & Transport": ["road", "pothole", "bus", "traffic", "transport", "street", "bridge"],
-            "Electricity": ["power", "electricity", "outage", "voltage", "wire", "pole", "light"],
-            "Sanitation": ["garbage", "trash", "waste", "clean", "drain", "sewage", "dustbin"]
-        }
+from .fuzzy import REAL_WORDS_PATH, FuzzyKeywordIndex, load_words
 
-        # Define keywords for priority
-        self.priority_keywords = {
-            "High": ["urgent", "immediate", "emergency", "severe", "critical", "danger", "hazard", "death", "accident"],
-            "Low": ["minor", "suggestion", "feedback", "delay", "slow"]
-        }
+logger = logging.getLogger(__name__)
+
+# Versioned keyword/scheme tables; edits are picked up without a restart
+ANALYZER_CONFIG_PATH = os.getenv(
+    "ANALYZER_CONFIG_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "analyzer_config.json")
+)
+
+# How often (seconds) the config file's modification time is checked
+ANALYZER_CONFIG_CHECK_INTERVAL = float(os.getenv("ANALYZER_CONFIG_CHECK_INTERVAL", "2"))
+
+# Optional spaCy lemmatization of English text (see lemmatizer.py); off by default
+ANALYZER_LEMMATIZE = os.getenv("ANALYZER_LEMMATIZE", "false").lower() in ("1", "true", "yes")
+
+# Largest edit distance at which misspelled English keywords are corrected (see fuzzy.py); off by default
+ANALYZER_FUZZY_MAX_DISTANCE = int(os.getenv("ANALYZER_FUZZY_MAX_DISTANCE", "0"))
+
+# Optional full word list (e.g. /usr/share/dict/words); its words are never corrected
+ANALYZER_FUZZY_DICTIONARY = os.getenv("ANALYZER_FUZZY_DICTIONARY")
+
+# Shortest text (after stripping) the analyzer accepts
+MIN_TEXT_LENGTH = 5
+
+@lru_cache(maxsize=1)
+def _real_words():
+    """Words fuzzy correction must leave alone (bundled near misses plus the optional dictionary)"""
+    words = load_words(REAL_WORDS_PATH)
+    if ANALYZER_FUZZY_DICTIONARY:
+        try:
+            words |= load_words(ANALYZER_FUZZY_DICTIONARY)
+        except OSError as e:
+            logger.warning(f"Could not read fuzzy dictionary {ANALYZER_FUZZY_DICTIONARY}: {str(e)}")
+    return words
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for matching: NFC, lower case, single spaces"""
+    return " ".join(unicodedata.normalize("NFC", text).lower().split())
+
+# Unicode blocks of the Indic scripts a keyword catalog can be written in
+SCRIPT_RANGES = {
+    "Devanagari": ("\u0900", "\u097f"),
+    "Bengali": ("\u0980", "\u09ff"),
+    "Gurmukhi": ("\u0a00", "\u0a7f"),
+    "Gujarati": ("\u0a80", "\u0aff"),
+    "Oriya": ("\u0b00", "\u0b7f"),
+    "Tamil": ("\u0b80", "\u0bff"),
+    "Telugu": ("\u0c00", "\u0c7f"),
+    "Kannada": ("\u0c80", "\u0cff"),
+    "Malayalam": ("\u0d00", "\u0d7f"),
+}
+
+_LATIN_LETTER = re.compile(r"[a-z]")
+
+def format_confidence(score):
+    """Confidence score (0.0 to 1.0) as shown in explanations"""
+    return f"{round(score * 100)}%"
+
+def explain(category, category_matches, high_keywords, low_found, languages, version,
+            lemmatized=False, fuzzy_matches=None, confidence=None):
+    """
+    Human-readable explanation of a keyword analysis.
+
+    Built from the raw matches only, so a stored analysis can be explained
+    again later (see explanations.py). confidence is the stored
+    confidence_score; without it, it is worked out from the matches.
+    """
+    max_matches = max(category_matches.values(), default=0)
+    if confidence is None:
+        confidence = round(min(1.0, (max_matches / 3.0)) if max_matches > 0 else 0.0, 2)
 
-        # Define schemes mapping
-        self.schemes_mapping = {
-            "Healthcare": ["Ayushman Bharat", "Pradhan Mantri Jan Arogya Yojana (PMJAY)", "National Health Mission"],
-            "Education": ["Sarva Shiksha Abhiyan", "Mid-Day Meal Scheme", "National Scholarship Portal"],
-            "Water Supply": ["Jal Jeevan Mission", "Atal Bhujal Yojana"],
-            "Roads & Transport": ["Pradhan Mantri Gram Sadak Yojana"],
-            "Electricity": ["Saubhagya Scheme", "Deen Dayal Upadhyaya Gram Jyoti Yojana"],
-            "Sanitation": ["Swachh Bharat Mission"]
+    if high_keywords:
+        priority_reason = f"High urgency keywords detected: {', '.join(high_keywords)}"
+    elif low_found:
+        priority_reason = "Low urgency - marked as feedback or minor issue"
+    else:
+        priority_reason = "No urgent keywords detected"
+
+    explanation = {
+        "category_detection": f"Matched {max_matches} keyword(s) in '{category}' category",
+        "confidence": format_confidence(confidence),
+        "priority_reason": priority_reason,
+        "relevant_keywords": category_matches,
+        "languages": languages,
+        "analyzer_version": version
+    }
+    if high_keywords:
+        explanation["high_keywords"] = list(high_keywords)
+    if lemmatized:
+        explanation["lemmatized"] = True
+    if fuzzy_matches:
+        explanation["fuzzy_matches"] = fuzzy_matches
+    return explanation
+
+class KeywordMatcher:
+    """Keyword tables for one language, normalized once and frozen"""
+
+    __slots__ = ("categories", "high", "low")
+
+    def __init__(self, categories, priority_keywords):
+        self.categories = tuple(
+            (category, tuple(normalize_text(kw) for kw in keywords))
+            for category, keywords in categories.items()
+        )
+        self.high = tuple(normalize_text(kw) for kw in priority_keywords.get("High", []))
+        self.low = tuple(normalize_text(kw) for kw in priority_keywords.get("Low", []))
+
+    def match(self, text_lower: str):
+        """
+        Scan normalized text for this language's keywords.
+
+        Returns:
+            Tuple of (matches per category, high-priority keywords found, any low-priority keyword found)
+        """
+        counts = {
+            category: sum(1 for keyword in keywords if keyword in text_lower)
+            for category, keywords in self.categories
         }
+        high_found = [keyword for keyword in self.high if keyword in text_lower]
+        low_found = any(keyword in text_lower for keyword in self.low)
+        return counts, high_found, low_found
+
+def _freeze(value):
+    """Recursively turn dicts and lists into read-only mappings and tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+class AnalyzerConfig:
+    """
+    Immutable, compiled analyzer tables.
+
+    A config is built once from the versioned tables and never modified;
+    reloading builds a new one and swaps the reference, so a request always
+    sees one consistent set of tables.
+    """
+
+    __slots__ = (
+        "version", "categories", "priority_keywords", "language_keywords",
+        "schemes_mapping", "matchers", "script_patterns", "fuzzy"
+    )
+
+    def __init__(self, tables):
+        content = json.dumps(tables, sort_keys=True, ensure_ascii=False)
+        self.version = f"v{tables.get('version', 0)}-{hashlib.sha1(content.encode('utf-8')).hexdigest()[:8]}"
+        self.categories = _freeze(tables["categories"])
+        self.priority_keywords = _freeze(tables["priority_keywords"])
+        self.language_keywords = _freeze(tables.get("language_keywords", {}))
+        self.schemes_mapping = _freeze(tables["schemes_mapping"])
+
+        matchers = {"en": KeywordMatcher(self.categories, self.priority_keywords)}
+        script_patterns = []
+        for language, catalog in self.language_keywords.items():
+            matchers[language] = KeywordMatcher(catalog["categories"], catalog.get("priority", {}))
+            start, end = SCRIPT_RANGES[catalog["script"]]
+            script_patterns.append((language, re.compile(f"[{start}-{end}]")))
+        self.matchers = MappingProxyType(matchers)
+        self.script_patterns = tuple(script_patterns)
+
+        # Misspelling index over the English category keywords: keyword -> categories.
+        # Priority terms are never fuzzed ("dancer" must not read as "danger"),
+        # and no keyword or known real word is ever corrected into another.
+        self.fuzzy = None
+        if ANALYZER_FUZZY_MAX_DISTANCE > 0:
+            roles = {}
+            for category, keywords in matchers["en"].categories:
+                for keyword in keywords:
+                    roles.setdefault(keyword, []).append(category)
+            known_words = _real_words().union(roles, matchers["en"].high, matchers["en"].low)
+            self.fuzzy = FuzzyKeywordIndex(roles, ANALYZER_FUZZY_MAX_DISTANCE, known_words=known_words)
+
+    @classmethod
+    def from_file(cls, path=ANALYZER_CONFIG_PATH):
+        """Load and compile tables from a JSON config file"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def detect_languages(self, text_lower: str):
+        """
+        Find which keyword languages a normalized text needs.
+
+        English runs when Latin letters are present; an Indic language runs
+        only when its script appears. Pure ASCII text skips the script scan.
+        """
+        languages = ["en"] if text_lower.isascii() or _LATIN_LETTER.search(text_lower) else []
+        if not text_lower.isascii():
+            languages.extend(
+                language for language, pattern in self.script_patterns
+                if pattern.search(text_lower)
+            )
+        return languages or ["en"]
+
+class GrievanceAnalyzer:
+    def __init__(self, config_path=ANALYZER_CONFIG_PATH, config=None, lemmatizer=None):
+        """
+        Args:
+            config_path: JSON file with the keyword and scheme tables; it is
+                watched and hot-reloaded when its modification time changes
+            config: Fixed AnalyzerConfig to use instead of a file (no reloading)
+            lemmatizer: Optional Lemmatizer for English text; defaults to one
+                (loaded lazily) when ANALYZER_LEMMATIZE is set
+        """
+        if lemmatizer is None and ANALYZER_LEMMATIZE:
+            from .lemmatizer import Lemmatizer
+            lemmatizer = Lemmatizer()
+        self.lemmatizer = lemmatizer
+        self.config_path = None if config is not None else config_path
+        self._reload_lock = threading.Lock()
+        self._mtime = None
+        self._next_check = 0.0
+        self.loaded_at = None
+        self._config = config if config is not None else self._load()
+
+    def _load(self):
+        self._mtime = os.stat(self.config_path).st_mtime_ns
+        config = AnalyzerConfig.from_file(self.config_path)
+        self.loaded_at = time.time()
+        logger.info(f"Loaded analyzer config {config.version} from {self.config_path}")
+        return config
+
+    def refresh(self):
+        """
+        Return the current config, reloading it first if the file changed.
+
+        The file is stat'ed at most every ANALYZER_CONFIG_CHECK_INTERVAL
+        seconds. One thread rebuilds the config while others keep using the
+        old one (non-blocking lock), then the reference is swapped in a single
+        assignment. A broken file is logged once and the old config kept
+        until the file changes again.
+        """
+        config = self._config
+        if self.config_path is None or time.monotonic() < self._next_check:
+            return config
+        if not self._reload_lock.acquire(blocking=False):
+            return config
+        try:
+            self._next_check = time.monotonic() + ANALYZER_CONFIG_CHECK_INTERVAL
+            if os.stat(self.config_path).st_mtime_ns != self._mtime:
+                self._config = config = self._load()
+        except Exception as e:
+            logger.error(f"Keeping analyzer config {config.version}, reload failed: {str(e)}")
+        finally:
+            self._reload_lock.release()
+        return config
+
+    @property
+    def config(self) -> AnalyzerConfig:
+        return self.refresh()
+
+    @property
+    def version(self) -> str:
+        """Version of the active tables (file version plus content hash)"""
+        return self.refresh().version
+
+    @property
+    def categories(self):
+        return self.config.categories
+
+    @property
+    def priority_keywords(self):
+        return self.config.priority_keywords
+
+    @property
+    def language_keywords(self):
+        return self.config.language_keywords
+
+    @property
+    def schemes_mapping(self):
+        return self.config.schemes_mapping
+
+    @staticmethod
+    def _validate(text):
+        if not text or len(text.strip()) < MIN_TEXT_LENGTH:
+            raise ValueError(f"Grievance text must be at least {MIN_TEXT_LENGTH} characters")
 
     def analyze(self, text: str):
         """
@@ -49,19 +308,73 @@ class GrievanceAnalyzer:
         Returns: category, priority, schemes, confidence, and reasoning.
         Government-grade transparency and fairness.
         """
-        if not text or len(text.strip()) < 5:
-            raise ValueError("Grievance text must be at least 5 characters")
-            
-        text_lower = text.lower()
+        self._validate(text)
+        text_lower = normalize_text(text)
+        
+        # One config reference for the whole call, even if a reload swaps it meanwhile
+        config = self.refresh()
+        
+        # Only the matchers for the scripts present in the text are run
+        languages = config.detect_languages(text_lower)
+        lemmas = None
+        if self.lemmatizer is not None and "en" in languages:
+            lemmas = self.lemmatizer.lemmatize(text, text_lower)
+        return self._score(config, text_lower, languages, lemmas)
+
+    def analyze_batch(self, texts):
+        """
+        Analyze many grievances at once (bulk re-analysis).
+
+        Results equal analyze() per text; with lemmatization on, the English
+        texts go through the spaCy pipeline in batches.
+        """
+        for text in texts:
+            self._validate(text)
+        config = self.refresh()
+        texts_lower = [normalize_text(text) for text in texts]
+        languages = [config.detect_languages(text_lower) for text_lower in texts_lower]
+        lemmas = [None] * len(texts)
+        if self.lemmatizer is not None:
+            english = [i for i, langs in enumerate(languages) if "en" in langs]
+            for i, lemma_text in zip(english, self.lemmatizer.lemmatize_many(
+                [texts[i] for i in english], [texts_lower[i] for i in english]
+            )):
+                lemmas[i] = lemma_text
+        return [
+            self._score(config, text_lower, langs, lemma_text)
+            for text_lower, langs, lemma_text in zip(texts_lower, languages, lemmas)
+        ]
+
+    def _score(self, config, text_lower, languages, lemmas=None):
+        """Keyword scoring of normalized text (lemmas: optional English lemma text)"""
+        category_matches = dict.fromkeys(config.categories, 0)
+        high_keywords_found = []
+        low_found = False
+        for language in languages:
+            if language == "en" and lemmas is not None:
+                counts, high, low = self.lemmatizer.matcher(config).match(text_lower, lemmas)
+            else:
+                counts, high, low = config.matchers[language].match(text_lower)
+            for category, matches in counts.items():
+                category_matches[category] = category_matches.get(category, 0) + matches
+            high_keywords_found.extend(high)
+            low_found = low_found or low
+
+        # Misspelled English category keywords count like exact ones
+        fuzzy_matches = []
+        if "en" in languages and config.fuzzy is not None:
+            for token, keyword, distance in config.fuzzy.find(text_lower):
+                if lemmas is not None and keyword in lemmas:
+                    continue
+                for category in config.fuzzy.roles[keyword]:
+                    category_matches[category] += 1
+                fuzzy_matches.append({"token": token, "corrected": keyword, "distance": distance})
         
         # 1. Detect Category with confidence
         detected_category = "General"
         max_matches = 0
-        category_matches = {}
         
-        for category, keywords in self.categories.items():
-            matches = sum(1 for keyword in keywords if keyword in text_lower)
-            category_matches[category] = matches
+        for category, matches in category_matches.items():
             if matches > max_matches:
                 max_matches = matches
                 detected_category = category
@@ -69,30 +382,25 @@ class GrievanceAnalyzer:
         # Calculate confidence: more keyword matches = higher confidence
         confidence = min(1.0, (max_matches / 3.0)) if max_matches > 0 else 0.0
         
-        # 2. Detect Priority with explanation
+        # 2. Detect Priority
         priority = "Medium"
-        priority_reason = "No urgent keywords detected"
         
         # Check High priority
-        high_keywords_found = [kw for kw in self.priority_keywords["High"] if kw in text_lower]
         if high_keywords_found:
             priority = "High"
-            priority_reason = f"High urgency keywords detected: {', '.join(high_keywords_found)}"
         # Check Low priority (only if not High)
-        elif any(keyword in text_lower for keyword in self.priority_keywords["Low"]):
+        elif low_found:
             priority = "Low"
-            priority_reason = "Low urgency - marked as feedback or minor issue"
         
         # 3. Recommend Schemes
-        suggested_schemes = self.schemes_mapping.get(detected_category, ["General Welfare Schemes"])
+        suggested_schemes = list(config.schemes_mapping.get(detected_category, ["General Welfare Schemes"]))
         
         # 4. Generate explanation for transparency
-        explanation = {
-            "category_detection": f"Matched {max_matches} keyword(s) in '{detected_category}' category",
-            "confidence": f"{int(confidence * 100)}%",
-            "priority_reason": priority_reason,
-            "relevant_keywords": category_matches
-        }
+        explanation = explain(
+            detected_category, category_matches, high_keywords_found, low_found, languages,
+            config.version, lemmatized=lemmas is not None, fuzzy_matches=fuzzy_matches,
+            confidence=round(confidence, 2)
+        )
         
         return {
             "category": detected_category,
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, JSON, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, SmallInteger, String, Text, DateTime, ForeignKey, Float, JSON, Boolean, UniqueConstraint
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from .database import Base
+from .codes import CodedString, category_codes, priority_codes, status_codes
+from . import explanations
 
 class User(Base):
     __tablename__ = "users"
@@ -27,16 +29,58 @@ class Grievance(Base):
     location = Column(String, nullable=True)  # Citizen's location/address
     latitude = Column(Float, nullable=True)  # GPS latitude
     longitude = Column(Float, nullable=True)  # GPS longitude
-    category = Column(String, index=True)  # Health, Education, etc.
-    priority = Column(String)  # High, Medium, Low
-    status = Column(String, default="Pending") # Pending, In Progress, Resolved
+    geocode_confidence = Column(Float, nullable=True)  # 1.0 for picked GPS, lower when geocoded from text
+    city = Column(String, index=True, nullable=True)  # Nearest gazetteer city (reverse geocoded)
+    district = Column(String, index=True, nullable=True)
+    state = Column(String, nullable=True)
+    ward_id = Column(String, index=True, nullable=True)  # Ward polygon containing the point
+    ward_name = Column(String, nullable=True)
+    ward_version = Column(String, nullable=True)  # Boundary file version used for ward_id
+    category = Column(CodedString(category_codes), ForeignKey("grievance_categories.id"), index=True)  # Health, Education, etc.
+    priority = Column(CodedString(priority_codes), ForeignKey("grievance_priorities.id"))  # High, Medium, Low
+    status = Column(CodedString(status_codes), ForeignKey("grievance_statuses.id"), default="Pending") # Pending, In Progress, Resolved
     created_at = Column(DateTime, default=datetime.utcnow)
     embedding = Column(Text) # JSON string or specific type for vector if PG
-    suggested_schemes = Column(JSON, default=[])
     confidence_score = Column(Float, default=0.0)  # Analysis confidence (0.0 to 1.0)
-    analysis_metadata = Column(JSON, default={})  # Stores reasoning and explanation
+    analysis_metadata = deferred(Column(JSON, default={}))  # Compact analysis facts (explanations.py), loaded on access
     status_history = Column(JSON, default=[])  # Timeline of status changes
+    incident_id = Column(Integer, ForeignKey("incidents.id"), index=True, nullable=True)  # Set by the incident clustering job
     citizen = relationship("User", back_populates="grievances")
+    # Written through grievance_schemes.set_schemes(), which keeps the order
+    schemes = relationship(
+        "Scheme", secondary="grievance_schemes", order_by="GrievanceScheme.position", viewonly=True
+    )
+
+    @property
+    def suggested_schemes(self):
+        """Names of the suggested schemes, most relevant first"""
+        return [scheme.name for scheme in self.schemes]
+
+    @property
+    def analysis_explanation(self):
+        """Readable analysis explanation, rebuilt from analysis_metadata (for detail views)"""
+        return explanations.expand(self.analysis_metadata)
+
+class GrievanceCategory(Base):
+    """Lookup table of the grievance category codes (see codes.py)"""
+    __tablename__ = "grievance_categories"
+
+    id = Column(SmallInteger, primary_key=True, autoincrement=False)
+    name = Column(String, unique=True, nullable=False)
+
+class GrievancePriority(Base):
+    """Lookup table of the grievance priority codes"""
+    __tablename__ = "grievance_priorities"
+
+    id = Column(SmallInteger, primary_key=True, autoincrement=False)
+    name = Column(String, unique=True, nullable=False)
+
+class GrievanceStatus(Base):
+    """Lookup table of the grievance status codes"""
+    __tablename__ = "grievance_statuses"
+
+    id = Column(SmallInteger, primary_key=True, autoincrement=False)
+    name = Column(String, unique=True, nullable=False)
 
 class Scheme(Base):
     __tablename__ = "schemes"
@@ -44,4 +88,95 @@ class Scheme(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True)
     description = Column(Text)
-    domain = Column(String)
+    domain = Column(String)  # Grievance category the scheme serves (e.g. Healthcare)
+    state = Column(String, nullable=True)  # None for national schemes
+    district = Column(String, nullable=True)  # None for the whole state
+    eligibility = Column(JSON, default={})  # Extra rules: categories, districts, exclude_districts
+    rank = Column(Integer, default=0)  # Lower ranks are recommended first within a scope
+    is_active = Column(Boolean, default=True)  # Retired schemes are deactivated, not deleted
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+class GrievanceScheme(Base):
+    """Scheme suggested for a grievance (see grievance_schemes.py)"""
+    __tablename__ = "grievance_schemes"
+
+    grievance_id = Column(Integer, ForeignKey("grievances.id"), primary_key=True)
+    scheme_id = Column(Integer, ForeignKey("schemes.id"), primary_key=True, index=True)
+    position = Column(SmallInteger, nullable=False, default=0)  # Order of the suggestion
+
+class SchemeRecommendation(Base):
+    """Precomputed scheme suggestions for one category and location (see recommendations.py)"""
+    __tablename__ = "scheme_recommendations"
+    __table_args__ = (
+        UniqueConstraint("category", "state", "district", name="uq_scheme_recommendation"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    category = Column(String, nullable=False)
+    state = Column(String, nullable=False, default="")  # "" for grievances without a known state
+    district = Column(String, nullable=False, default="")  # "" for the state as a whole
+    scheme_names = Column(JSON, default=[])  # Eligible table schemes, most specific first
+    build_version = Column(Integer, nullable=False, index=True)  # Rebuild that last wrote the row
+    built_at = Column(DateTime, default=datetime.utcnow)
+
+class MapClusterCell(Base):
+    """Per-zoom grid cell aggregate used for server-side map clustering"""
+    __tablename__ = "map_cluster_cells"
+    __table_args__ = (
+        UniqueConstraint("zoom", "cell_x", "cell_y", "status", name="uq_map_cluster_cell"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    zoom = Column(Integer, nullable=False)
+    cell_x = Column(Integer, nullable=False)
+    cell_y = Column(Integer, nullable=False)
+    status = Column(String, nullable=False)
+    count = Column(Integer, default=0)
+    lat_sum = Column(Float, default=0.0)  # Sum of member latitudes (centroid = lat_sum / count)
+    lon_sum = Column(Float, default=0.0)
+
+class Hotspot(Base):
+    """Dense cluster of recent same-category grievances found by the hotspot job"""
+    __tablename__ = "hotspots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    category = Column(String, index=True)
+    latitude = Column(Float, nullable=False)  # Centroid of the members
+    longitude = Column(Float, nullable=False)
+    radius_km = Column(Float, default=0.0)  # Furthest member from the centroid
+    member_count = Column(Integer, default=0)
+    member_ids = Column(JSON, default=[])  # Grievance ids in the cluster
+    city = Column(String, nullable=True)
+    district = Column(String, nullable=True)
+    first_reported_at = Column(DateTime)
+    last_reported_at = Column(DateTime)
+    detected_at = Column(DateTime, default=datetime.utcnow)
+
+class CategoryCorrection(Base):
+    """Admin correction of an analyzer category; training data for the online learner"""
+    __tablename__ = "category_corrections"
+
+    id = Column(Integer, primary_key=True, index=True)
+    grievance_id = Column(Integer, ForeignKey("grievances.id"), index=True, nullable=True)
+    text = Column(Text, nullable=False)  # Analyzed text (description + title) at correction time
+    previous_category = Column(String)
+    corrected_category = Column(String, nullable=False)
+    corrected_by = Column(String, default="admin")
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class Incident(Base):
+    """Group of near-duplicate grievances about one problem, found by the incident clustering job"""
+    __tablename__ = "incidents"
+
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String)  # Title of the earliest member
+    category = Column(String, index=True)  # Most common member category
+    status = Column(String, default="Pending")  # Last status propagated to the members
+    latitude = Column(Float, nullable=True)  # Centroid of the members with coordinates
+    longitude = Column(Float, nullable=True)
+    city = Column(String, nullable=True)
+    district = Column(String, nullable=True)
+    member_count = Column(Integer, default=0)  # Members at the last clustering run
+    first_reported_at = Column(DateTime)
+    last_reported_at = Column(DateTime)
+    detected_at = Column(DateTime, default=datetime.utcnow)
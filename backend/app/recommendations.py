@@ -0,0 +1,256 @@
+"""
+Precomputed scheme recommendations per category and location.
+
+Scheme suggestions depend on the grievance's category and where it was
+filed: a state runs its own health insurance scheme, a district has a
+local sanitation drive. Evaluating the eligibility rules of thousands of
+schemes on every submission would be wasteful, since the answer only
+changes when schemes change. So the eligible schemes are precomputed into
+the scheme_recommendations table for every (category, state, district) of
+the gazetteer, plus state-wide and location-less rows.
+
+Rebuilds are incremental: only schemes changed since the last build are
+looked at, and only the rows of the categories and states they touch are
+recomputed. A rebuild that changes any row bumps build_version.
+
+Every process keeps the table in memory as a read-only map, merged with
+the national schemes of the analyzer config (schemes_mapping), and
+reloads it when a newer build_version appears or the analyzer config
+changes. A submission pays one dict lookup.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from types import MappingProxyType
+
+from sqlalchemy import func
+
+from . import models
+from .database import SessionLocal
+from .gazetteer import get_gazetteer
+from .ml_engine import analyzer as default_analyzer
+
+logger = logging.getLogger(__name__)
+
+# Most schemes suggested for one grievance
+SCHEME_RECOMMENDATION_LIMIT = int(os.getenv("SCHEME_RECOMMENDATION_LIMIT", "5"))
+
+# How often (seconds) a process checks for a newer rebuild
+RECOMMENDATION_CHECK_INTERVAL = float(os.getenv("RECOMMENDATION_CHECK_INTERVAL", "2"))
+
+DEFAULT_SCHEMES = ["General Welfare Schemes"]
+
+# Scope order: district schemes before state schemes before national ones
+DISTRICT, STATE, NATIONAL = 0, 1, 2
+
+
+def scheme_categories(scheme):
+    """Categories a scheme is suggested for: its domain plus eligibility["categories"]"""
+    rules = scheme.eligibility or {}
+    return {c for c in [scheme.domain, *rules.get("categories", [])] if c}
+
+
+def scheme_scope(scheme, state, district):
+    """
+    Whether a scheme applies to a location, and how specifically.
+
+    Returns:
+        DISTRICT, STATE or NATIONAL, or None if the scheme does not apply
+    """
+    rules = scheme.eligibility or {}
+    if district and district in rules.get("exclude_districts", []):
+        return None
+    if not scheme.state:
+        return NATIONAL
+    if scheme.state != state:
+        return None
+    districts = [scheme.district] if scheme.district else rules.get("districts", [])
+    if not districts:
+        return STATE
+    return DISTRICT if district in districts else None
+
+
+def eligible_schemes(schemes, category, state, district):
+    """Names of the active schemes for a category and location, most specific first"""
+    ranked = []
+    for scheme in schemes:
+        if not scheme.is_active or category not in scheme_categories(scheme):
+            continue
+        scope = scheme_scope(scheme, state, district)
+        if scope is not None:
+            ranked.append((scope, scheme.rank or 0, scheme.name))
+    return [name for _, _, name in sorted(ranked)]
+
+
+def location_keys():
+    """Every (state, district) a grievance can be filed in, plus state-wide and unknown locations"""
+    keys = {("", "")}
+    for place in get_gazetteer().places:
+        if place.state:
+            keys.add((place.state, ""))
+            if place.district:
+                keys.add((place.state, place.district))
+    return sorted(keys)
+
+
+def rebuild(db, categories, full=False, extra_scopes=()):
+    """
+    Recompute the precomputed rows affected by scheme changes.
+
+    Args:
+        db: Database session
+        categories: Every grievance category (rows are built for each)
+        full: Recompute every row instead of only those touched by changed schemes
+        extra_scopes: (category, state) pairs to recompute as well, e.g. the
+            scope a scheme had before it was moved to another state
+
+    Returns:
+        Tuple of (new build_version or None if nothing changed, rows written)
+    """
+    last_version, last_built_at = db.query(
+        func.max(models.SchemeRecommendation.build_version),
+        func.max(models.SchemeRecommendation.built_at)
+    ).one()
+    full = full or last_version is None
+
+    schemes = db.query(models.Scheme).all()
+    if full:
+        scopes = None
+    else:
+        changed = [s for s in schemes if s.updated_at and s.updated_at > last_built_at]
+        # (category, state) pairs whose rows can differ; state None covers every state
+        scopes = {(category, s.state or None) for s in changed for category in scheme_categories(s)}
+        scopes.update((category, state or None) for category, state in extra_scopes)
+        if not scopes:
+            return None, 0
+
+    # Only national schemes and those of the row's own state can apply to a row
+    candidates = {}
+    for scheme in schemes:
+        for category in scheme_categories(scheme):
+            candidates.setdefault((category, scheme.state or None), []).append(scheme)
+
+    built_at = datetime.utcnow()
+    version = (last_version or 0) + 1
+    existing = {
+        (row.category, row.state, row.district): row
+        for row in db.query(models.SchemeRecommendation)
+    }
+    written = 0
+    for category in categories:
+        for state, district in location_keys():
+            if scopes is not None and (category, None) not in scopes and (category, state) not in scopes:
+                continue
+            names = eligible_schemes(
+                candidates.get((category, None), []) + (candidates.get((category, state), []) if state else []),
+                category, state, district
+            )
+            row = existing.get((category, state, district))
+            if row is None:
+                row = models.SchemeRecommendation(category=category, state=state, district=district)
+                db.add(row)
+            # built_at is the change watermark, so every examined row advances it
+            row.built_at = built_at
+            if row.build_version is None or row.scheme_names != names:
+                row.scheme_names = names
+                row.build_version = version
+                written += 1
+    db.commit()
+    return (version if written else None), written
+
+
+class RecommendationMap:
+    """Read-only (category, state, district) -> scheme names map, reloaded when a rebuild lands"""
+
+    def __init__(self, analyzer=default_analyzer, session_factory=SessionLocal, limit=SCHEME_RECOMMENDATION_LIMIT):
+        self.analyzer = analyzer
+        self.session_factory = session_factory
+        self.limit = limit
+        self._map = MappingProxyType({})
+        self._build_version = None
+        self._config_version = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.loaded_at = None
+        self.lookups = 0
+        self.fallbacks = 0
+
+    def _defaults(self, category):
+        return list(self.analyzer.schemes_mapping.get(category, DEFAULT_SCHEMES))
+
+    def refresh(self):
+        """Reload the map if the table has a newer build or the analyzer config changed (rate-limited)"""
+        if time.monotonic() < self._next_check:
+            return
+        with self._lock:
+            if time.monotonic() < self._next_check:
+                return
+            self._next_check = time.monotonic() + RECOMMENDATION_CHECK_INTERVAL
+            config_version = self.analyzer.version
+            db = self.session_factory()
+            try:
+                build_version = db.query(func.max(models.SchemeRecommendation.build_version)).scalar()
+                if build_version == self._build_version and config_version == self._config_version:
+                    return
+                rows = db.query(
+                    models.SchemeRecommendation.category,
+                    models.SchemeRecommendation.state,
+                    models.SchemeRecommendation.district,
+                    models.SchemeRecommendation.scheme_names
+                ).all()
+            except Exception as e:
+                logger.error(f"Could not load scheme recommendations: {str(e)}")
+                return
+            finally:
+                db.close()
+
+            merged = {}
+            for category, state, district, names in rows:
+                combined = list(dict.fromkeys([*(names or []), *self._defaults(category)]))
+                merged[(category, state, district)] = tuple(combined[:self.limit])
+            self._map = MappingProxyType(merged)
+            self._build_version = build_version
+            self._config_version = config_version
+            self.loaded_at = datetime.utcnow()
+
+    def invalidate(self):
+        """Check for a newer build on the next lookup (after a rebuild in this process)"""
+        self._next_check = 0.0
+
+    def lookup(self, category, state=None, district=None):
+        """
+        Scheme suggestions for a grievance.
+
+        One dict lookup for any gazetteer location; unknown districts fall
+        back to the state-wide row, unknown states to the national row, and
+        an unbuilt table to the analyzer config's schemes.
+        """
+        self.refresh()
+        self.lookups += 1
+        mapping = self._map
+        names = mapping.get((category, state or "", district or ""))
+        if names is None:
+            self.fallbacks += 1
+            names = (
+                mapping.get((category, state or "", ""))
+                or mapping.get((category, "", ""))
+                or tuple(self._defaults(category))
+            )
+        return list(names)
+
+    def stats(self):
+        return {
+            "build_version": self._build_version,
+            "analyzer_version": self._config_version,
+            "entries": len(self._map),
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+            "lookups": self.lookups,
+            "fallbacks": self.fallbacks,
+            "limit": self.limit
+        }
+
+
+scheme_recommendations = RecommendationMap()
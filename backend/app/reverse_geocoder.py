@@ -0,0 +1,101 @@
+"""
+Nearest-place reverse geocoding over the offline gazetteer.
+
+City entries from the gazetteer are indexed in a KD-tree on 3D unit-sphere
+coordinates, so nearest-neighbour queries follow great-circle distance and
+take O(log n) per point. Used to fill the city, district and state columns
+when a grievance is submitted and during batch backfills.
+"""
+
+import threading
+from typing import List, Optional, Tuple
+import numpy as np
+from scipy.spatial import cKDTree
+from .gazetteer import Place, get_gazetteer
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Points further than this from every known city are left unassigned
+MAX_DISTANCE_KM = 50.0
+
+# Gazetteer kinds that name a city for reporting purposes
+CITY_KINDS = ("city",)
+
+
+def _to_unit_vectors(lat, lon):
+    """Convert degrees to unit vectors on the sphere (vectorized)"""
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def _chord_to_km(chord):
+    """Convert straight-line distance between unit vectors to great-circle km"""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0.0, 1.0))
+
+
+class ReverseGeocoder:
+    """KD-tree over gazetteer cities"""
+
+    def __init__(self, places: List[Place], max_distance_km: float = MAX_DISTANCE_KM):
+        self.places = [p for p in places if p.kind in CITY_KINDS]
+        self.max_distance_km = max_distance_km
+        self.tree = cKDTree(_to_unit_vectors(
+            [p.latitude for p in self.places],
+            [p.longitude for p in self.places]
+        ))
+
+    def nearest_many(self, coords) -> List[Optional[Tuple[Place, float]]]:
+        """
+        Find the nearest city for many points in one vectorized query.
+
+        Args:
+            coords: Sequence of (lat, lon) pairs
+
+        Returns:
+            List of (place, distance_km) or None where no city is close enough
+        """
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        if not len(coords):
+            return []
+        chords, indices = self.tree.query(_to_unit_vectors(coords[:, 0], coords[:, 1]))
+        distances = _chord_to_km(chords)
+        return [
+            (self.places[i], round(float(d), 2)) if d <= self.max_distance_km else None
+            for i, d in zip(indices, distances)
+        ]
+
+    def nearest(self, lat: float, lon: float) -> Optional[Tuple[Place, float]]:
+        """Find the nearest city to a point, or None if none is within range"""
+        return self.nearest_many([(lat, lon)])[0]
+
+
+_reverse_geocoder: Optional[ReverseGeocoder] = None
+_reverse_geocoder_lock = threading.Lock()
+
+
+def get_reverse_geocoder() -> ReverseGeocoder:
+    """Return the process-wide reverse geocoder, building it on first use"""
+    global _reverse_geocoder
+    if _reverse_geocoder is None:
+        with _reverse_geocoder_lock:
+            if _reverse_geocoder is None:
+                _reverse_geocoder = ReverseGeocoder(get_gazetteer().places)
+    return _reverse_geocoder
+
+
+def resolve_place(latitude: Optional[float], longitude: Optional[float]):
+    """
+    Look up the administrative place for stored coordinates.
+
+    Returns:
+        Tuple of (city, district, state); all None if unresolved
+    """
+    if latitude is None or longitude is None:
+        return None, None, None
+    match = get_reverse_geocoder().nearest(latitude, longitude)
+    if match is None:
+        return None, None, None
+    place, _ = match
+    return place.name, place.district, place.state
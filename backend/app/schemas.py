@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, AliasChoices
 from datetime import datetime
 from typing import Optional, Dict, List
 
@@ -51,7 +51,8 @@ class GrievanceBase(BaseModel):
 class GrievanceCreate(GrievanceBase):
     pass
 
-class Grievance(GrievanceBase):
+class GrievanceSummary(GrievanceBase):
+    """Grievance as listed (without the analysis explanation)"""
     id: int
     category: str
     priority: str
@@ -60,11 +61,16 @@ class Grievance(GrievanceBase):
     created_at: datetime
     location: Optional[str] = None
     confidence_score: Optional[float] = None
-    analysis_metadata: Optional[Dict] = None
 
     class Config:
         from_attributes = True
 
+class Grievance(GrievanceSummary):
+    """Grievance detail, with the explanation rebuilt from the stored analysis"""
+    analysis_metadata: Optional[Dict] = Field(
+        default=None, validation_alias=AliasChoices("analysis_explanation", "analysis_metadata")
+    )
+
 class AnalysisResult(BaseModel):
     """Analysis result with explainability"""
     category: str
@@ -84,7 +90,7 @@ class GrievanceListResponse(BaseModel):
     count: int
     skip: int
     limit: int
-    grievances: List[Grievance]
+    grievances: List[GrievanceSummary]
     message: str
 
 class StatisticsResponse(BaseModel):
@@ -106,13 +112,65 @@ class GrievanceStatusUpdate(BaseModel):
             }
         }
 
+class GrievanceCategoryUpdate(BaseModel):
+    """Schema for correcting a grievance's category (admin feature)"""
+    category: str
+    corrected_by: Optional[str] = "admin"
+    
+    class Config:
+        schema_extra = {
+            "example": {
+                "category": "Sanitation"
+            }
+        }
+
 class SchemeBase(BaseModel):
     name: str
     description: str
     domain: str
+    state: Optional[str] = None
+    district: Optional[str] = None
+    eligibility: Optional[dict] = None
+    rank: Optional[int] = 0
+    is_active: Optional[bool] = True
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "name": "Chief Minister's Comprehensive Health Insurance Scheme",
+                "description": "Cashless hospital treatment for low-income families",
+                "domain": "Healthcare",
+                "state": "Tamil Nadu",
+                "eligibility": {"exclude_districts": []}
+            }
+        }
 
 class Scheme(SchemeBase):
     id: int
 
     class Config:
         from_attributes = True
+
+# ============ LOCATION SCHEMAS ============
+
+class LocationSuggestion(BaseModel):
+    """Autocomplete match from the gazetteer"""
+    name: str
+    matched: str  # Spelling that matched the query (may be an alias or native script)
+    label: str
+    kind: str
+    district: Optional[str] = None
+    state: Optional[str] = None
+    latitude: float
+    longitude: float
+
+class LocationSuggestResponse(BaseModel):
+    """Location autocomplete response"""
+    query: str
+    suggestions: List[LocationSuggestion]
+
+class LocationGeocodeResponse(BaseModel):
+    """Place found in a free-text location, if any"""
+    query: str
+    match: Optional[LocationSuggestion] = None
+    confidence: Optional[float] = None
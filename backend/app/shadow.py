@@ -0,0 +1,265 @@
+"""
+Shadow-mode evaluation of candidate analyzers.
+
+Before replacing the live analyzer, a candidate (a new keyword set, a
+trained classifier) can be run in shadow on real submissions. The request
+path only samples a submission and drops it on a bounded queue; a
+background thread runs the live analyzer and every candidate on it and
+records category/priority agreement, confusion matrices and per-backend
+latency histograms. Nothing a candidate returns is ever stored or shown to
+citizens, and a full queue drops samples instead of slowing requests.
+
+Candidates come from SHADOW_CANDIDATES, a comma-separated list of
+"kind:argument" entries (e.g. "keywords:app/data/candidate_config.json",
+or "learner" for the model trained from admin category corrections),
+or are registered in code with shadow_evaluator.register().
+"""
+
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from .ml_engine import analyzer as live_analyzer, GrievanceAnalyzer
+from .learner import category_learner
+
+logger = logging.getLogger(__name__)
+
+SHADOW_CANDIDATES = os.getenv("SHADOW_CANDIDATES", "")
+SHADOW_SAMPLE_RATE = float(os.getenv("SHADOW_SAMPLE_RATE", "0.1"))
+SHADOW_QUEUE_SIZE = int(os.getenv("SHADOW_QUEUE_SIZE", "1000"))
+
+# Upper bounds (milliseconds) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250)
+
+# Disagreements kept for inspection on the admin dashboard
+RECENT_DISAGREEMENTS = 20
+
+# How a SHADOW_CANDIDATES entry is turned into an analyzer, by kind
+CANDIDATE_FACTORIES = {
+    "keywords": lambda path: GrievanceAnalyzer(config_path=path),
+    "learner": lambda _: category_learner,
+}
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram"""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (None if open-ended)"""
+        target = q * sum(self.counts)
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else None
+        return None
+
+    def to_dict(self):
+        count = sum(self.counts)
+        return {
+            "count": count,
+            "mean_ms": round(self.total_ms / count, 4) if count else None,
+            "max_ms": round(self.max_ms, 4),
+            "p50_ms_le": self.quantile(0.5),
+            "p99_ms_le": self.quantile(0.99),
+            "buckets": [
+                {"le_ms": LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else None, "count": c}
+                for i, c in enumerate(self.counts)
+            ]
+        }
+
+
+class CandidateStats:
+    """Agreement of one candidate with the live analyzer"""
+
+    def __init__(self):
+        self.samples = 0
+        self.errors = 0
+        self.category_agree = 0
+        self.priority_agree = 0
+        self.category_confusion = {}
+        self.priority_confusion = {}
+        self.disagreements = deque(maxlen=RECENT_DISAGREEMENTS)
+
+    def record(self, grievance_id, text, live, candidate):
+        self.samples += 1
+        for key, confusion in (("category", self.category_confusion), ("priority", self.priority_confusion)):
+            row = confusion.setdefault(live[key], {})
+            row[candidate[key]] = row.get(candidate[key], 0) + 1
+        self.category_agree += live["category"] == candidate["category"]
+        self.priority_agree += live["priority"] == candidate["priority"]
+        if live["category"] != candidate["category"] or live["priority"] != candidate["priority"]:
+            self.disagreements.append({
+                "grievance_id": grievance_id,
+                "text": text[:200],
+                "live": {"category": live["category"], "priority": live["priority"]},
+                "candidate": {"category": candidate["category"], "priority": candidate["priority"]}
+            })
+
+    def to_dict(self):
+        return {
+            "samples": self.samples,
+            "errors": self.errors,
+            "category_agreement": round(self.category_agree / self.samples, 4) if self.samples else None,
+            "priority_agreement": round(self.priority_agree / self.samples, 4) if self.samples else None,
+            "category_confusion": {k: dict(v) for k, v in self.category_confusion.items()},
+            "priority_confusion": {k: dict(v) for k, v in self.priority_confusion.items()},
+            "recent_disagreements": list(self.disagreements)
+        }
+
+
+class ShadowEvaluator:
+    """Samples submissions onto a queue and evaluates candidates in a background thread"""
+
+    def __init__(self, live=live_analyzer, sample_rate=SHADOW_SAMPLE_RATE, queue_size=SHADOW_QUEUE_SIZE):
+        self.live = live
+        self.sample_rate = sample_rate
+        self.candidates = {}
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._worker = None
+        self.enqueued = 0
+        self.dropped = 0
+        self._reset_metrics()
+
+    def _reset_metrics(self):
+        self.stats_by_candidate = {name: CandidateStats() for name in self.candidates}
+        self.latency = {name: LatencyHistogram() for name in ["live", *self.candidates]}
+        self.started_at = datetime.utcnow()
+
+    def register(self, name, candidate):
+        """Add (or replace) a candidate; it needs an analyze(text) method returning category and priority"""
+        with self._lock:
+            self.candidates[name] = candidate
+            self.stats_by_candidate[name] = CandidateStats()
+            self.latency[name] = LatencyHistogram()
+
+    def unregister(self, name):
+        with self._lock:
+            self.candidates.pop(name, None)
+            self.stats_by_candidate.pop(name, None)
+            self.latency.pop(name, None)
+
+    @property
+    def enabled(self):
+        return bool(self.candidates) and self.sample_rate > 0
+
+    def submit(self, text, live_result, grievance_id=None):
+        """
+        Offer a submission for shadow evaluation (called on the request path).
+
+        Cost is a random draw and, for sampled submissions, a non-blocking
+        queue put. The stored live result is what candidates are compared to.
+        """
+        if not self.enabled or random.random() >= self.sample_rate:
+            return False
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((grievance_id, text, live_result))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="shadow-evaluator", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                self.evaluate(*item)
+            except Exception as e:
+                logger.error(f"Shadow evaluation failed: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def evaluate(self, grievance_id, text, live_result):
+        """Run the live analyzer and every candidate on one sampled submission"""
+        # The live analyzer is re-run uncached so latencies are comparable
+        start = time.perf_counter()
+        self.live.analyze(text)
+        live_ms = (time.perf_counter() - start) * 1000
+
+        outcomes = []
+        for name, candidate in list(self.candidates.items()):
+            start = time.perf_counter()
+            try:
+                result = candidate.analyze(text)
+            except Exception as e:
+                logger.warning(f"Shadow candidate {name} failed: {str(e)}")
+                result = None
+            outcomes.append((name, result, (time.perf_counter() - start) * 1000))
+
+        with self._lock:
+            self.latency["live"].record(live_ms)
+            for name, result, ms in outcomes:
+                stats = self.stats_by_candidate.get(name)
+                if stats is None:
+                    continue  # unregistered meanwhile
+                if result is None:
+                    stats.errors += 1
+                    continue
+                self.latency[name].record(ms)
+                stats.record(grievance_id, text, live_result, result)
+
+    def wait(self):
+        """Block until every queued sample has been evaluated"""
+        self._queue.join()
+
+    def reset(self):
+        with self._lock:
+            self._reset_metrics()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "sample_rate": self.sample_rate,
+                "candidates": list(self.candidates),
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "queue_depth": self._queue.qsize(),
+                "since": self.started_at.isoformat(),
+                "agreement": {name: stats.to_dict() for name, stats in self.stats_by_candidate.items()},
+                "latency": {name: hist.to_dict() for name, hist in self.latency.items()}
+            }
+
+
+def load_candidates(evaluator, spec=SHADOW_CANDIDATES):
+    """Register the candidates listed in a SHADOW_CANDIDATES spec"""
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        kind, _, argument = entry.partition(":")
+        factory = CANDIDATE_FACTORIES.get(kind)
+        if factory is None:
+            logger.error(f"Unknown shadow candidate kind '{kind}' in SHADOW_CANDIDATES")
+            continue
+        try:
+            evaluator.register(entry, factory(argument))
+        except Exception as e:
+            logger.error(f"Could not load shadow candidate {entry}: {str(e)}")
+
+
+shadow_evaluator = ShadowEvaluator()
+load_candidates(shadow_evaluator)
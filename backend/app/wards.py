@@ -0,0 +1,180 @@
+"""
+Point-in-polygon ward assignment backed by an STRtree spatial index.
+
+Ward/district boundary polygons are loaded from a GeoJSON FeatureCollection
+on disk (WARD_BOUNDARIES_PATH). Each feature should carry a "ward_id" and
+"ward_name" property ("id"/"name" are accepted as fallbacks). Polygons are
+bulk-loaded into a shapely STRtree, so locating a point only tests the few
+polygons whose bounding boxes contain it.
+
+Every assignment is stamped with the boundary file's content hash, which
+lets the batch job (reassign_wards.py) find rows assigned against older
+boundaries. The file is watched, so a running server picks up new
+boundaries by itself. If no boundary file is present, ward assignment is a
+no-op.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+import numpy as np
+import shapely
+from shapely.geometry import shape
+from shapely.strtree import STRtree
+
+logger = logging.getLogger(__name__)
+
+WARD_BOUNDARIES_PATH = os.getenv(
+    "WARD_BOUNDARIES_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "wards.geojson")
+)
+
+Assignment = Tuple[Optional[str], Optional[str]]
+
+
+class WardIndex:
+    """STRtree over ward boundary polygons"""
+
+    def __init__(self, geometries, ward_ids: List[str], ward_names: List[str], version: str):
+        self.geometries = np.asarray(geometries, dtype=object)
+        self.ward_ids = ward_ids
+        self.ward_names = ward_names
+        self.version = version
+        self.areas = shapely.area(self.geometries)
+        self.tree = STRtree(self.geometries)
+
+    @classmethod
+    def from_geojson(cls, path: str = WARD_BOUNDARIES_PATH) -> "WardIndex":
+        """Load a GeoJSON FeatureCollection of ward polygons"""
+        with open(path, "rb") as f:
+            raw = f.read()
+        collection = json.loads(raw)
+
+        geometries, ward_ids, ward_names = [], [], []
+        for i, feature in enumerate(collection.get("features", [])):
+            geometry = feature.get("geometry")
+            if not geometry or geometry.get("type") not in ("Polygon", "MultiPolygon"):
+                continue
+            props = feature.get("properties") or {}
+            name = props.get("ward_name") or props.get("name") or f"Ward {i + 1}"
+            geometries.append(shape(geometry))
+            ward_ids.append(str(props.get("ward_id") or props.get("id") or name))
+            ward_names.append(str(name))
+
+        version = hashlib.sha1(raw).hexdigest()[:12]
+        return cls(geometries, ward_ids, ward_names, version)
+
+    def assign_many(self, coords) -> List[Assignment]:
+        """
+        Assign many points to wards in one vectorized tree query.
+
+        Points on a boundary count as inside. Points in several polygons
+        (overlaps, or an edge shared by two wards) go to the smallest one,
+        ties to the one listed first in the boundary file.
+
+        Args:
+            coords: Sequence of (lat, lon) pairs
+
+        Returns:
+            List of (ward_id, ward_name), (None, None) where no ward contains the point
+        """
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        results: List[Assignment] = [(None, None)] * len(coords)
+        if not len(coords) or not len(self.geometries):
+            return results
+
+        points = shapely.points(coords[:, 1], coords[:, 0])
+        point_idx, ward_idx = self.tree.query(points, predicate="covered_by")
+
+        best_area = {}
+        for p, w in zip(point_idx.tolist(), ward_idx.tolist()):
+            if p not in best_area or (self.areas[w], w) < best_area[p]:
+                best_area[p] = (self.areas[w], w)
+        for p, (_, w) in best_area.items():
+            results[p] = (self.ward_ids[w], self.ward_names[w])
+        return results
+
+    def assign(self, lat: float, lon: float) -> Assignment:
+        """Assign a single point to a ward"""
+        return self.assign_many([(lat, lon)])[0]
+
+
+# How often (seconds) the boundary file's modification time is checked
+WARD_BOUNDARIES_CHECK_INTERVAL = float(os.getenv("WARD_BOUNDARIES_CHECK_INTERVAL", "2"))
+
+_NOT_LOADED = object()
+
+_ward_index: Optional[WardIndex] = None
+_ward_index_mtime = _NOT_LOADED  # st_mtime_ns of the loaded file, None when there is no file
+_next_check = 0.0
+_ward_index_lock = threading.Lock()
+
+
+def _boundaries_mtime():
+    try:
+        return os.stat(WARD_BOUNDARIES_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def get_ward_index() -> Optional[WardIndex]:
+    """
+    Return the process-wide ward index, or None if no boundary file is configured.
+
+    The boundary file is stat'ed at most every WARD_BOUNDARIES_CHECK_INTERVAL
+    seconds and reloaded when it changed (or appeared or disappeared), so
+    new grievances are stamped with the current boundaries without a
+    restart. Other threads keep using the old index while one rebuilds it.
+    A broken file is logged once and the old index kept until the file
+    changes again.
+    """
+    global _ward_index, _ward_index_mtime, _next_check
+    index = _ward_index
+    if _ward_index_mtime is not _NOT_LOADED:
+        if time.monotonic() < _next_check or not _ward_index_lock.acquire(blocking=False):
+            return index
+    else:
+        # First use: wait for the initial load
+        _ward_index_lock.acquire()
+    try:
+        _next_check = time.monotonic() + WARD_BOUNDARIES_CHECK_INTERVAL
+        mtime = _boundaries_mtime()
+        if mtime != _ward_index_mtime:
+            try:
+                index = WardIndex.from_geojson(WARD_BOUNDARIES_PATH) if mtime is not None else None
+            except Exception as e:
+                logger.error(f"Keeping the previous ward boundaries, reload failed: {str(e)}")
+            else:
+                _ward_index = index
+                if index is not None:
+                    logger.info(f"Loaded {len(index.ward_ids)} ward boundaries (version {index.version})")
+            _ward_index_mtime = mtime
+    finally:
+        _ward_index_lock.release()
+    return _ward_index
+
+
+def reload_ward_index() -> Optional[WardIndex]:
+    """Force the boundary file to be read again (after boundaries change)"""
+    global _ward_index_mtime
+    with _ward_index_lock:
+        _ward_index_mtime = _NOT_LOADED
+    return get_ward_index()
+
+
+def assign_ward(latitude: Optional[float], longitude: Optional[float]):
+    """
+    Look up the ward for stored coordinates.
+
+    Returns:
+        Tuple of (ward_id, ward_name, boundaries_version); all None if unresolved
+    """
+    index = get_ward_index()
+    if index is None or latitude is None or longitude is None:
+        return None, None, None
+    ward_id, ward_name = index.assign(latitude, longitude)
+    return ward_id, ward_name, index.version
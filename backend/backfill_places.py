@@ -0,0 +1,78 @@
+"""
+Database Migration: Add city/district/state columns and backfill them
+Reverse geocodes stored coordinates to the nearest gazetteer city in
+batches, so per-city reporting becomes a single GROUP BY.
+
+    cd backend && python backfill_places.py
+"""
+
+import sqlite3
+import os
+import sys
+import time
+
+from app.reverse_geocoder import get_reverse_geocoder
+
+# Database path
+DB_PATH = os.path.join(os.path.dirname(__file__), "grievance.db")
+
+BATCH_SIZE = 5000
+
+def add_place_columns(cursor):
+    """Add city, district and state columns (and indexes) if missing"""
+    cursor.execute("PRAGMA table_info(grievances)")
+    columns = [col[1] for col in cursor.fetchall()]
+    for column in ("city", "district", "state"):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE grievances ADD COLUMN {column} VARCHAR")
+            print(f"  ✓ Added {column} column")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_grievances_city ON grievances (city)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_grievances_district ON grievances (district)")
+
+def backfill_places(batch_size=BATCH_SIZE):
+    """Fill city/district/state for grievances with coordinates but no city"""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cursor = conn.cursor()
+        add_place_columns(cursor)
+        conn.commit()
+        
+        geocoder = get_reverse_geocoder()
+        started = time.perf_counter()
+        last_id = 0
+        updated = 0
+        
+        while True:
+            # Keyset pagination keeps each batch an indexed range scan
+            cursor.execute(
+                """SELECT id, latitude, longitude FROM grievances
+                   WHERE id > ? AND city IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL
+                   ORDER BY id LIMIT ?""",
+                (last_id, batch_size)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            
+            matches = geocoder.nearest_many([(lat, lon) for _, lat, lon in rows])
+            cursor.executemany(
+                "UPDATE grievances SET city = ?, district = ?, state = ? WHERE id = ?",
+                [
+                    (match[0].name, match[0].district, match[0].state, gid)
+                    for (gid, _, _), match in zip(rows, matches) if match is not None
+                ]
+            )
+            conn.commit()
+            
+            last_id = rows[-1][0]
+            updated += sum(1 for match in matches if match is not None)
+            print(f"  ✓ Processed up to grievance #{last_id} ({updated} assigned)")
+        
+        elapsed = time.perf_counter() - started
+        print(f"\n✅ Backfill complete! Assigned {updated} grievances in {elapsed:.1f}s")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    print("🏙️ Backfilling city/district from coordinates...\n")
+    backfill_places(int(sys.argv[1]) if len(sys.argv) > 1 else BATCH_SIZE)
@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for the backend.
+Run from the backend directory, e.g.:
+
+    cd backend && python -m benchmarks.bench_multilingual
+"""
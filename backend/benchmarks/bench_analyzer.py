@@ -0,0 +1,284 @@
+"""
+Analyzer Throughput Benchmark
+Runs every analyzer backend over a seeded synthetic corpus (see corpus.py)
+at batch sizes from 1 to 10k and reports throughput (ops/sec), per-call and
+per-batch p50/p99 latency, per-language latency, and memory allocated per
+call. Results are written to JSON so runs can be compared over time.
+
+Backends with analyze_batch() (keyword, learner, lemmatized) get each batch
+in one call, as bulk re-analysis does; their per-call figures are a call's
+share of its batch. The cached backend is timed per analyze() call. The
+"lemmatized" backend needs spaCy and its model and is skipped without them.
+The MicroBatcher only pays off with concurrent callers, so it is measured
+in bench_batching.py instead.
+
+Allocation figures come from a separate tracemalloc pass (tracing slows
+every call, so it never overlaps the timing pass): the peak bytes allocated
+while one call runs, and the bytes still held after it returns.
+
+    cd backend && python -m benchmarks.bench_analyzer
+    cd backend && python -m benchmarks.bench_analyzer --backends keyword --batch-sizes 1 100
+    cd backend && python -m benchmarks.bench_analyzer --compare benchmarks/results/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from app.analysis_cache import AnalysisCache
+from app.learner import OnlineCategoryLearner
+from app.lemmatizer import Lemmatizer
+from app.ml_engine import GrievanceAnalyzer
+from benchmarks.corpus import generate_corpus
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+BATCH_SIZES = [1, 10, 100, 1000, 10000]
+
+_model_dirs = []
+
+
+def seeded_learner():
+    """Learner with a freshly seeded model in its own temporary directory"""
+    model_dir = tempfile.TemporaryDirectory(prefix="bench-learner-")
+    _model_dirs.append(model_dir)
+    return OnlineCategoryLearner(model_dir=model_dir.name)
+
+
+# Analyzer backends under test; each factory returns a fresh object with .analyze(text)
+BACKENDS = {
+    "keyword": lambda: GrievanceAnalyzer(),
+    "keyword-cached": lambda: AnalysisCache(GrievanceAnalyzer()),
+    "lemmatized": lambda: GrievanceAnalyzer(lemmatizer=Lemmatizer()),
+    "learner": seeded_learner,
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def summarize_us(seconds):
+    """p50/p99/mean of a list of durations, in microseconds"""
+    return {
+        "p50_us": round(percentile(seconds, 50) * 1e6, 2),
+        "p99_us": round(percentile(seconds, 99) * 1e6, 2),
+        "mean_us": round(statistics.fmean(seconds) * 1e6, 2),
+    }
+
+
+def run_batches(backend, corpus, batch_size, total_calls):
+    """
+    Analyze consecutive batches of the corpus, timing every call and batch.
+
+    Backends with analyze_batch() analyze each batch in one timed call;
+    each text is then charged an equal share of the batch time.
+
+    Returns:
+        Tuple of (per-call seconds, per-call languages, per-batch seconds,
+        per-call cache hit flags; empty for uncached backends)
+    """
+    batches = max(5, total_calls // batch_size)
+    call_times, languages, batch_times, hits = [], [], [], []
+    cached = isinstance(backend, AnalysisCache)
+    batched = hasattr(backend, "analyze_batch")
+    position = 0
+    clock = time.perf_counter
+    for _ in range(batches):
+        batch = [corpus[(position + i) % len(corpus)] for i in range(batch_size)]
+        position += batch_size
+        languages.extend(sample.language for sample in batch)
+        if batched:
+            texts = [sample.text for sample in batch]
+            batch_start = clock()
+            backend.analyze_batch(texts)
+            elapsed = clock() - batch_start
+            batch_times.append(elapsed)
+            call_times.extend([elapsed / batch_size] * batch_size)
+            continue
+        batch_start = clock()
+        for sample in batch:
+            hits_before = backend.hits if cached else 0
+            start = clock()
+            backend.analyze(sample.text)
+            call_times.append(clock() - start)
+            if cached:
+                hits.append(backend.hits > hits_before)
+        batch_times.append(clock() - batch_start)
+    return call_times, languages, batch_times, hits
+
+
+def measure_allocations(backend, corpus, calls):
+    """Mean/p99 peak and retained bytes per call, traced with tracemalloc"""
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for i in range(calls):
+            text = corpus[i % len(corpus)].text
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            backend.analyze(text)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        "calls": calls,
+        "peak_bytes_mean": round(statistics.fmean(peaks), 1),
+        "peak_bytes_p99": percentile(peaks, 99),
+        "retained_bytes_mean": round(statistics.fmean(retained), 1),
+    }
+
+
+def bench_backend(name, corpus, batch_sizes, total_calls, alloc_calls, warmup):
+    """All measurements for one backend; every batch size starts from a fresh instance"""
+    result = {"batches": {}}
+    by_language = defaultdict(list)
+    for batch_size in batch_sizes:
+        backend = BACKENDS[name]()
+        # Warm code paths on texts outside the measured corpus (keeps caches cold)
+        for sample in warmup:
+            backend.analyze(sample.text)
+
+        call_times, languages, batch_times, hits = run_batches(backend, corpus, batch_size, total_calls)
+        for language, seconds in zip(languages, call_times):
+            by_language[language].append(seconds)
+
+        entry = {
+            "mode": "analyze_batch" if hasattr(backend, "analyze_batch") else "analyze",
+            "calls": len(call_times),
+            "ops_per_sec": round(len(call_times) / sum(batch_times), 1),
+            "call": summarize_us(call_times),
+            "batch_p50_ms": round(percentile(batch_times, 50) * 1e3, 3),
+            "batch_p99_ms": round(percentile(batch_times, 99) * 1e3, 3),
+        }
+        if isinstance(backend, AnalysisCache):
+            entry["cache_hit_rate"] = backend.stats()["hit_rate"]
+            # Hits and misses separately: the overall figures depend on the corpus hit rate
+            for label, hit in (("cache_hit", True), ("cache_miss", False)):
+                times = [seconds for seconds, was_hit in zip(call_times, hits) if was_hit == hit]
+                if times:
+                    entry[label] = summarize_us(times)
+        result["batches"][str(batch_size)] = entry
+        print(
+            f"  {name:>16} | batch {batch_size:>6} | {entry['ops_per_sec']:>10.0f} ops/s"
+            f" | p50 {entry['call']['p50_us']:>8.1f} µs | p99 {entry['call']['p99_us']:>8.1f} µs"
+        )
+        for label in ("cache_hit", "cache_miss"):
+            if label in entry:
+                print(
+                    f"  {'':>16} | {label.replace('cache_', ''):>12} | p50 {entry[label]['p50_us']:>8.1f} µs"
+                    f" | p99 {entry[label]['p99_us']:>8.1f} µs"
+                )
+
+    result["by_language"] = {language: summarize_us(times) for language, times in sorted(by_language.items())}
+
+    backend = BACKENDS[name]()
+    for sample in warmup:
+        backend.analyze(sample.text)
+    result["allocations"] = measure_allocations(backend, corpus, alloc_calls)
+    print(
+        f"  {name:>16} | allocations | peak {result['allocations']['peak_bytes_mean'] / 1024:.1f} KiB/call"
+        f" | retained {result['allocations']['retained_bytes_mean']:.0f} B/call"
+    )
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(previous_path, current):
+    """Print ops/sec and p99 changes against an earlier results file"""
+    with open(previous_path, encoding="utf-8") as f:
+        previous = json.load(f)
+    print(f"\nCompared with {previous_path} ({previous['meta'].get('git_commit')}, {previous['meta']['timestamp']}):")
+    for name, result in current["backends"].items():
+        old_backend = previous["backends"].get(name)
+        if not old_backend:
+            continue
+        for batch_size, entry in result["batches"].items():
+            old = old_backend["batches"].get(batch_size)
+            if not old:
+                continue
+            ops = entry["ops_per_sec"] / old["ops_per_sec"] - 1
+            p99 = entry["call"]["p99_us"] / old["call"]["p99_us"] - 1
+            print(f"  {name:>16} | batch {batch_size:>6} | ops/s {ops:+7.1%} | p99 {p99:+7.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark grievance analyzer backends")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS))
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=BATCH_SIZES)
+    parser.add_argument("--corpus-size", type=int, default=20000, help="Synthetic texts in the corpus")
+    parser.add_argument("--calls", type=int, default=20000, help="Approximate calls per batch size")
+    parser.add_argument("--alloc-calls", type=int, default=2000, help="Calls traced for allocations")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/analyzer-<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    if "lemmatized" in args.backends and not Lemmatizer().available:
+        print("Skipping lemmatized: spaCy or its model is not installed\n")
+        args.backends = [name for name in args.backends if name != "lemmatized"]
+
+    corpus = generate_corpus(args.corpus_size, seed=args.seed)
+    warmup = generate_corpus(200, seed=args.seed + 1)
+    print(f"Corpus: {len(corpus)} texts, {len({s.text for s in corpus})} distinct, "
+          f"languages {dict(Counter(s.language for s in corpus))}\n")
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "analyzer_version": GrievanceAnalyzer().version,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "corpus": {
+                "size": len(corpus),
+                "distinct": len({s.text for s in corpus}),
+                "mean_chars": round(statistics.fmean(len(s.text) for s in corpus), 1),
+                "languages": dict(Counter(s.language for s in corpus)),
+                "lengths": dict(Counter(s.length for s in corpus)),
+            },
+            "calls_per_batch_size": args.calls,
+        },
+        "backends": {
+            name: bench_backend(name, corpus, args.batch_sizes, args.calls, args.alloc_calls, warmup)
+            for name in args.backends
+        },
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"analyzer-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
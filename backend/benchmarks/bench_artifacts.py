@@ -0,0 +1,132 @@
+"""
+Model Artifact Memory Benchmark
+Starts several worker processes at once (like uvicorn --workers N), each
+opening the same learner weight matrix either as a private in-memory copy
+(np.load without mmap, what unpickling a model does) or as a read-only
+memory map (app/artifacts.py), then classifies synthetic grievances.
+Reports per-worker cold-start time (open + first prediction), prediction
+latency, RSS and PSS. PSS divides shared pages between the processes
+mapping them, so it shows what each worker really adds; RSS counts shared
+file pages in full for every process.
+
+Linux only (reads /proc/self/smaps_rollup). Timings assume a warm page cache.
+
+    cd backend && python -m benchmarks.bench_artifacts
+    cd backend && python -m benchmarks.bench_artifacts --workers 8 --features 1048576 --classes 16
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from app import artifacts
+from benchmarks.corpus import generate_corpus
+
+
+def memory_kib():
+    """RSS, anonymous and file-backed RSS from /proc/self/status, and PSS from smaps_rollup"""
+    stats = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                stats[key] = int(value.split()[0])
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                stats["Pss"] = int(line.split()[1])
+    return stats
+
+
+def worker(mode, directory, texts, n_features, barrier, results):
+    # Imported here so the baseline measured below includes the vectorizer but not the weights
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from app.ml_engine import normalize_text
+
+    vectorizer = HashingVectorizer(
+        n_features=n_features, analyzer="char_wb", ngram_range=(2, 4),
+        alternate_sign=False, norm="l2", preprocessor=normalize_text, dtype=np.float32
+    )
+    X = vectorizer.transform(texts)
+    before = memory_kib()
+
+    start = time.perf_counter()
+    artifact = artifacts.load(directory, mmap=(mode == "mmap"))
+    coef, intercept = artifact["coef"], artifact["intercept"]
+    np.asarray(X[0] @ coef) + intercept
+    cold_start_ms = (time.perf_counter() - start) * 1000
+
+    latencies = []
+    for i in range(X.shape[0]):
+        start = time.perf_counter()
+        int(np.argmax(np.asarray(X[i] @ coef) + intercept))
+        latencies.append(time.perf_counter() - start)
+
+    # Measure while every worker still has the weights open
+    barrier.wait()
+    after = memory_kib()
+    barrier.wait()
+    results.put({
+        "cold_start_ms": cold_start_ms,
+        "predict_p50_us": statistics.median(latencies) * 1e6,
+        "rss_mib": after["VmRSS"] / 1024,
+        "pss_mib": after["Pss"] / 1024,
+        "added_rss_mib": (after["VmRSS"] - before["VmRSS"]) / 1024,
+        "added_pss_mib": (after["Pss"] - before["Pss"]) / 1024,
+    })
+
+
+def run(mode, directory, texts, n_features, workers):
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=worker, args=(mode, directory, texts, n_features, barrier, results))
+        for _ in range(workers)
+    ]
+    for p in processes:
+        p.start()
+    rows = [results.get() for _ in processes]
+    for p in processes:
+        p.join()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker memory and cold start of copied vs memory-mapped weights")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--features", type=int, default=2 ** 18, help="Weight matrix rows (hashed features)")
+    parser.add_argument("--classes", type=int, default=7, help="Weight matrix columns")
+    parser.add_argument("--texts", type=int, default=1000, help="Grievances classified per worker")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    coef = rng.standard_normal((args.features, args.classes), dtype=np.float32)
+    texts = [sample.text for sample in generate_corpus(args.texts, seed=42)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        artifacts.publish(directory, 1, {
+            "coef": coef,
+            "intercept": np.zeros(args.classes, dtype=np.float32),
+            "classes": np.array([f"class-{i}" for i in range(args.classes)]),
+        })
+        print(f"Weights: {args.features} x {args.classes} float32 = {coef.nbytes / 2 ** 20:.1f} MiB, "
+              f"{args.workers} workers, {args.texts} texts each\n")
+        print(f"{'mode':>6} | {'cold start':>10} | {'predict p50':>11} | {'RSS':>8} | {'PSS':>8} | {'+RSS':>8} | {'+PSS':>8}   (per worker, MiB)")
+        print("-" * 86)
+        for mode in ("copy", "mmap"):
+            rows = run(mode, directory, texts, args.features, args.workers)
+            mean = {key: statistics.fmean(row[key] for row in rows) for key in rows[0]}
+            print(
+                f"{mode:>6} | {mean['cold_start_ms']:>7.1f} ms | {mean['predict_p50_us']:>8.1f} µs"
+                f" | {mean['rss_mib']:>8.1f} | {mean['pss_mib']:>8.1f}"
+                f" | {mean['added_rss_mib']:>8.1f} | {mean['added_pss_mib']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Micro-Batching Benchmark
+Simulates concurrent request threads (like the FastAPI thread pool), each
+analyzing synthetic grievances one at a time, with every analyzer backend
+called directly and through a MicroBatcher (app/batching.py) at several
+batch windows. Reports throughput, per-call p50/p99 latency and the
+realized batch sizes and queueing delay recorded by the batcher.
+
+The "learner" backend is the model-based analyzer (app/learner.py) with a
+freshly seeded model in a temporary directory; it is the one that gains
+from batching, since the keyword analyzer does no vectorized work.
+
+    cd backend && python -m benchmarks.bench_batching
+    cd backend && python -m benchmarks.bench_batching --threads 32 --windows 1 5 --max-batch-size 32
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+
+from app.batching import MicroBatcher
+from app.learner import OnlineCategoryLearner
+from app.ml_engine import GrievanceAnalyzer
+from benchmarks.bench_analyzer import percentile
+from benchmarks.corpus import generate_corpus
+
+
+def run_clients(analyze, texts, threads):
+    """Split texts over client threads that call analyze() one text at a time"""
+    latencies = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def client(index):
+        barrier.wait()
+        for text in texts[index::threads]:
+            start = time.perf_counter()
+            analyze(text)
+            latencies[index].append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=client, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    calls = [latency for per_thread in latencies for latency in per_thread]
+    return {
+        "ops_per_sec": len(calls) / elapsed,
+        "p50_ms": percentile(calls, 50) * 1000,
+        "p99_ms": percentile(calls, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of direct vs micro-batched analysis under concurrency")
+    parser.add_argument("--threads", type=int, default=16, help="Concurrent client threads")
+    parser.add_argument("--texts", type=int, default=5000, help="Grievances analyzed per run")
+    parser.add_argument("--windows", type=float, nargs="+", default=[1, 2, 5], help="Batch windows (ms) to test")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    texts = [sample.text for sample in generate_corpus(args.texts, seed=42)]
+    with tempfile.TemporaryDirectory() as model_dir:
+        backends = {
+            "keyword": GrievanceAnalyzer(),
+            "learner": OnlineCategoryLearner(model_dir=model_dir),
+        }
+        print(f"{args.texts} texts, {args.threads} client threads, max batch {args.max_batch_size}\n")
+        print(f"{'backend':>8} | {'mode':>12} | {'ops/sec':>9} | {'p50 ms':>7} | {'p99 ms':>7} | {'mean batch':>10} | {'queue delay mean':>16}")
+        print("-" * 90)
+        for name, backend in backends.items():
+            backend.analyze(texts[0])  # load / seed outside the timed runs
+            row = run_clients(backend.analyze, texts, args.threads)
+            print(f"{name:>8} | {'direct':>12} | {row['ops_per_sec']:>9.0f} | {row['p50_ms']:>7.3f} | {row['p99_ms']:>7.3f} | {'-':>10} | {'-':>16}")
+            for window in args.windows:
+                batcher = MicroBatcher(backend, window_ms=window, max_batch_size=args.max_batch_size)
+                row = run_clients(batcher.analyze, texts, args.threads)
+                stats = batcher.stats()
+                delay = stats["queue_delay"]["mean_ms"]
+                print(
+                    f"{name:>8} | {f'batch {window:g} ms':>12} | {row['ops_per_sec']:>9.0f} | {row['p50_ms']:>7.3f}"
+                    f" | {row['p99_ms']:>7.3f} | {stats['mean_batch_size']:>10} | {delay:>13.3f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
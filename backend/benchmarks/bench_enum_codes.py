@@ -0,0 +1,186 @@
+"""
+Coded Enum Column Benchmark
+Builds the same synthetic grievance table twice in SQLite, once with
+category, priority and status as strings (the old schema) and once as
+SMALLINT codes (app/codes.py), and compares file, table and index sizes,
+bulk insert time and the latency of typical dashboard queries. Queries go
+through SQLAlchemy with the real column types, so the coded timings
+include converting codes back to names.
+
+Sizes come from SQLite's dbstat table. The default 5M rows need about
+1.5 GB of free space in the temporary directory and a few minutes.
+
+    cd backend && python -m benchmarks.bench_enum_codes
+    cd backend && python -m benchmarks.bench_enum_codes --rows 1000000 --repeat 3
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, create_engine, func, select
+)
+
+from app.codes import (
+    CATEGORIES, PRIORITIES, STATUSES, CodedString, category_codes, priority_codes, status_codes
+)
+
+INSERT_BATCH = 50000
+
+CITIES = ["Mumbai", "Pune", "Delhi", "Chennai", "Kolkata", "Bengaluru", "Hyderabad", "Jaipur", "Lucknow", "Patna"]
+
+
+def grievance_table(coded):
+    """The columns a listing needs, with category/priority/status as strings or codes"""
+    return Table(
+        "grievances", MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("title", String),
+        Column("city", String),
+        Column("category", CodedString(category_codes) if coded else String, index=True),
+        Column("priority", CodedString(priority_codes) if coded else String),
+        Column("status", CodedString(status_codes) if coded else String, index=True),
+        Column("created_at", DateTime),
+    )
+
+
+def generate_rows(count, coded, seed=42):
+    """Rows of (id, title, city, category, priority, status, created_at) in insert batches"""
+    rng = random.Random(seed)
+    categories = CATEGORIES[:-1]
+    start = datetime(2025, 1, 1)
+    convert = (
+        (category_codes.code, priority_codes.code, status_codes.code) if coded else (str, str, str)
+    )
+    for offset in range(0, count, INSERT_BATCH):
+        n = min(INSERT_BATCH, count - offset)
+        category = rng.choices(categories, k=n)
+        priority = rng.choices(PRIORITIES, weights=[2, 5, 3], k=n)
+        status = rng.choices(STATUSES, weights=[5, 2, 3], k=n)
+        yield [
+            (
+                offset + i + 1,
+                f"{category[i]} problem near ward {rng.randrange(1, 200)}",
+                rng.choice(CITIES),
+                convert[0](category[i]), convert[1](priority[i]), convert[2](status[i]),
+                (start + timedelta(minutes=offset + i)).isoformat(" "),
+            )
+            for i in range(n)
+        ]
+
+
+def build(path, rows, coded):
+    """Create and fill one database; returns (seconds to insert and index, engine, table)"""
+    engine = create_engine(f"sqlite:///{path}")
+    table = grievance_table(coded)
+    table.metadata.create_all(engine)
+    started = time.perf_counter()
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for batch in generate_rows(rows, coded):
+            cursor.executemany("INSERT INTO grievances VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+        raw.commit()
+        cursor.execute("ANALYZE")
+        raw.commit()
+    finally:
+        raw.close()
+    return time.perf_counter() - started, engine, table
+
+
+def sizes(engine):
+    """Bytes per table and index from dbstat"""
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("SELECT name, SUM(pgsize) FROM dbstat WHERE name NOT LIKE 'sqlite_%' GROUP BY name")
+        return dict(cursor.fetchall())
+    finally:
+        raw.close()
+
+
+def queries(table):
+    """Dashboard-style queries, written against names as the app writes them"""
+    return {
+        "count by status": select(table.c.status, func.count()).group_by(table.c.status),
+        "count by category, status": (
+            select(table.c.category, table.c.status, func.count()).group_by(table.c.category, table.c.status)
+        ),
+        "count one category": select(func.count()).where(table.c.category == "Water Supply"),
+        "open high priority": (
+            select(func.count()).where(table.c.status != "Resolved", table.c.priority == "High")
+        ),
+        "list 1000 in one category": (
+            select(table.c.id, table.c.title, table.c.category, table.c.priority, table.c.status)
+            .where(table.c.category == "Healthcare", table.c.status == "Pending")
+            .order_by(table.c.id.desc()).limit(1000)
+        ),
+    }
+
+
+def time_queries(engine, table, repeat):
+    """Median milliseconds per query, and the results (to check both layouts agree)"""
+    timings, results = {}, {}
+    with engine.connect() as conn:
+        for name, query in queries(table).items():
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result = conn.execute(query).all()
+                samples.append(time.perf_counter() - start)
+            timings[name] = statistics.median(samples) * 1000
+            results[name] = sorted(tuple(row) for row in result)
+    return timings, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage and query latency of string vs coded enum columns")
+    parser.add_argument("--rows", type=int, default=5_000_000, help="Synthetic grievances per table")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query (median reported)")
+    parser.add_argument("--dir", default=None, help="Directory for the database files (default: a temp dir)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as workdir:
+        report = {}
+        for layout, coded in (("string", False), ("coded", True)):
+            path = os.path.join(workdir, f"{layout}.db")
+            print(f"Building {layout} table ({args.rows:,} rows)...")
+            build_seconds, engine, table = build(path, args.rows, coded)
+            timings, results = time_queries(engine, table, args.repeat)
+            report[layout] = {
+                "build": build_seconds,
+                "file": os.path.getsize(path),
+                "sizes": sizes(engine),
+                "timings": timings,
+                "results": results,
+            }
+            engine.dispose()
+
+        string, coded = report["string"], report["coded"]
+        mismatched = [name for name in string["results"] if string["results"][name] != coded["results"][name]]
+        if mismatched:
+            print(f"⚠️ Results differ between layouts: {', '.join(mismatched)}")
+
+        mb = 1024 * 1024
+        print(f"\n{'storage':<28} | {'string MB':>10} | {'coded MB':>10} | {'saved':>6}")
+        print("-" * 64)
+        rows = [("database file", string["file"], coded["file"])]
+        rows += [(name, size, coded["sizes"].get(name, 0)) for name, size in sorted(string["sizes"].items())]
+        for name, before, after in rows:
+            print(f"{name:<28} | {before / mb:>10.1f} | {after / mb:>10.1f} | {1 - after / before:>6.0%}")
+
+        print(f"\n{'latency (median)':<28} | {'string ms':>10} | {'coded ms':>10} | {'speedup':>7}")
+        print("-" * 64)
+        print(f"{'bulk insert + ANALYZE':<28} | {string['build'] * 1000:>10.0f} | {coded['build'] * 1000:>10.0f} | {string['build'] / coded['build']:>6.2f}x")
+        for name, before in string["timings"].items():
+            after = coded["timings"][name]
+            print(f"{name:<28} | {before:>10.2f} | {after:>10.2f} | {before / after:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Multilingual Keyword Engine Benchmark
+Shows that the cost of one analysis stays flat as keyword languages are
+added, because text is routed only to the matchers for the scripts it
+contains. The "all matchers" column runs every language's matcher on every
+text for comparison.
+
+    cd backend && python -m benchmarks.bench_multilingual
+"""
+
+import argparse
+import copy
+import json
+import random
+import timeit
+
+from app.ml_engine import GrievanceAnalyzer, AnalyzerConfig, ANALYZER_CONFIG_PATH, SCRIPT_RANGES
+
+TEXTS = {
+    "English": (
+        "There is no water supply in our street for the past three days and the drain near "
+        "the school is overflowing with sewage. Children cannot go to class and the road has "
+        "potholes everywhere. This is urgent, please send someone to fix the pipe."
+    ),
+    "Hindi": (
+        "हमारे इलाके में पिछले तीन दिनों से पानी नहीं आ रहा है और स्कूल के पास की नाली से "
+        "गंदगी सड़क पर बह रही है। बच्चे स्कूल नहीं जा पा रहे हैं और सड़क पर गड्ढे हैं। "
+        "कृपया तुरंत पाइप ठीक करवाएं।"
+    ),
+}
+
+# Scripts without a shipped catalog, used to add synthetic languages
+SYNTHETIC_SCRIPTS = ["Bengali", "Gurmukhi", "Gujarati", "Oriya", "Kannada", "Malayalam"]
+
+
+class AllLanguagesConfig(AnalyzerConfig):
+    """Baseline that runs every language's matcher on every text"""
+
+    def detect_languages(self, text_lower):
+        return list(self.matchers)
+
+
+def synthetic_catalog(script, template, rng):
+    """A catalog with the same shape as a real one, with words drawn from the script's block"""
+    start, end = (ord(c) for c in SCRIPT_RANGES[script])
+    letters = [chr(c) for c in range(start + 0x15, start + 0x39)]
+
+    def word():
+        return "".join(rng.choice(letters) for _ in range(rng.randint(3, 7)))
+
+    return {
+        "script": script,
+        "categories": {cat: [word() for _ in kws] for cat, kws in template["categories"].items()},
+        "priority": {level: [word() for _ in kws] for level, kws in template["priority"].items()},
+    }
+
+
+def build(config_cls, tables, native, synthetic):
+    """Analyzer with English plus the given native and synthetic languages"""
+    tables = copy.deepcopy(tables)
+    languages = {lang: tables["language_keywords"][lang] for lang in native}
+    languages.update(synthetic)
+    tables["language_keywords"] = languages
+    return GrievanceAnalyzer(config=config_cls(tables))
+
+
+def per_call_us(analyzer, text, number):
+    return min(timeit.repeat(lambda: analyzer.analyze(text), number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analysis cost as languages are added")
+    parser.add_argument("--number", type=int, default=2000, help="Calls per timing repeat")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with open(ANALYZER_CONFIG_PATH, encoding="utf-8") as f:
+        tables = json.load(f)
+    template = tables["language_keywords"]["hi"]
+    synthetic = {
+        f"x-{script.lower()}": synthetic_catalog(script, template, rng)
+        for script in SYNTHETIC_SCRIPTS
+    }
+
+    steps = [([], {}), (["hi"], {}), (["hi", "te"], {}), (["hi", "te", "ta"], {})]
+    for i in range(1, len(synthetic) + 1):
+        steps.append((["hi", "te", "ta"], dict(list(synthetic.items())[:i])))
+
+    header = f"{'languages':>9}"
+    for name in TEXTS:
+        header += f" | {name + ' routed':>15} | {name + ' all':>12}"
+    print(header + "   (microseconds per analysis)")
+    print("-" * len(header))
+
+    for native, extra in steps:
+        routed = build(AnalyzerConfig, tables, native, extra)
+        baseline = build(AllLanguagesConfig, tables, native, extra)
+        row = f"{len(routed.config.matchers):>9}"
+        for text in TEXTS.values():
+            row += f" | {per_call_us(routed, text, args.number):>15.1f} | {per_call_us(baseline, text, args.number):>12.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Seeded generator for synthetic grievance texts.
+
+Texts are assembled from complaint templates in English, Hindi, Telugu and
+Tamil with place names, durations, impact and urgency phrases, so they look
+like real submissions (description plus title) of varying length. Some
+English/Hindi texts are code-mixed, and a share of the corpus repeats
+earlier texts the way forwarded messages do. The same seed always yields
+the same corpus.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import List
+
+LANGUAGE_WEIGHTS = {"en": 0.55, "hi": 0.25, "te": 0.1, "ta": 0.1}
+
+# Sentences per text for each length class, and how often each class occurs
+LENGTHS = {"short": (1, 1), "medium": (2, 4), "long": (6, 12)}
+LENGTH_WEIGHTS = {"short": 0.3, "medium": 0.5, "long": 0.2}
+
+# Share of texts that copy an earlier text (forwarded messages)
+DUPLICATE_RATE = 0.15
+
+# Share of English texts with a Hindi sentence mixed in
+CODE_MIX_RATE = 0.1
+
+TEMPLATES = {
+    "en": {
+        "problems": [
+            "There is no water supply in {place} for the past {n} days",
+            "The water pipe near {place} is leaking and the road is flooded",
+            "Garbage has not been collected from {place} for {n} days",
+            "The street light on {place} has not been working for {n} weeks",
+            "There are huge potholes on the main road near {place}",
+            "The doctor is absent at the primary health clinic in {place}",
+            "The teacher does not come to the government school in {place}",
+            "Frequent power outage and low voltage in {place} every evening",
+            "Sewage is overflowing from the drain in {place}",
+            "The bus to {place} has stopped running without notice",
+            "I want to know the status of my pension application from {place}",
+        ],
+        "impact": [
+            "Residents are facing a lot of trouble.",
+            "Children and elderly people are suffering.",
+            "We have complained many times but nothing has happened.",
+            "Shops in the area have been affected.",
+        ],
+        "urgent": [
+            "This is urgent, please act immediately.",
+            "It is an emergency and someone may get hurt.",
+            "The situation is dangerous for pedestrians.",
+        ],
+        "low": [
+            "This is only a suggestion for improvement.",
+            "It is a minor issue but please look into it.",
+        ],
+        "places": ["Gandhi Nagar", "MG Road", "Ward 12", "Koramangala", "Ameerpet", "T. Nagar", "Salt Lake"],
+    },
+    "hi": {
+        "problems": [
+            "{place} में पिछले {n} दिनों से पानी नहीं आ रहा है",
+            "{place} में पाइप लीक हो रहा है और सड़क पर पानी भर गया है",
+            "{place} में {n} दिनों से कचरा नहीं उठाया गया है",
+            "{place} में सड़क पर बड़े गड्ढे हैं",
+            "{place} के सरकारी अस्पताल में डॉक्टर नहीं हैं",
+            "{place} के स्कूल में शिक्षक नहीं आते",
+            "{place} में रोज़ शाम को बिजली कटौती होती है",
+            "{place} में नाली का गंदा पानी सड़क पर बह रहा है",
+        ],
+        "impact": [
+            "लोगों को बहुत परेशानी हो रही है।",
+            "बच्चों और बुजुर्गों को दिक्कत हो रही है।",
+            "कई बार शिकायत की लेकिन कुछ नहीं हुआ।",
+        ],
+        "urgent": ["यह बहुत जरूरी है, तुरंत कार्रवाई करें।", "यहाँ दुर्घटना का खतरा है।"],
+        "low": ["यह सिर्फ एक सुझाव है।"],
+        "places": ["गांधी नगर", "लाजपत नगर", "वार्ड 12", "शिवाजी नगर"],
+    },
+    "te": {
+        "problems": [
+            "{place} లో గత {n} రోజులుగా నీటి సరఫరా లేదు",
+            "{place} లో రోడ్డు మీద పెద్ద గుంతలు ఉన్నాయి",
+            "{place} లో చెత్త తొలగించడం లేదు",
+            "{place} లో కరెంట్ కోతలు ఎక్కువగా ఉన్నాయి",
+            "{place} ప్రభుత్వ ఆసుపత్రిలో డాక్టర్ లేరు",
+            "{place} పాఠశాలకు టీచర్ రావడం లేదు",
+        ],
+        "impact": ["ప్రజలు చాలా ఇబ్బంది పడుతున్నారు.", "ఎన్నిసార్లు ఫిర్యాదు చేసినా పట్టించుకోలేదు."],
+        "urgent": ["ఇది అత్యవసరం, వెంటనే చర్య తీసుకోండి."],
+        "low": ["ఇది ఒక సూచన మాత్రమే."],
+        "places": ["అమీర్పేట", "కూకట్పల్లి", "వార్డు 12"],
+    },
+    "ta": {
+        "problems": [
+            "{place} பகுதியில் கடந்த {n} நாட்களாக தண்ணீர் வரவில்லை",
+            "{place} சாலையில் பெரிய குழிகள் உள்ளன",
+            "{place} பகுதியில் குப்பை அகற்றப்படவில்லை",
+            "{place} பகுதியில் அடிக்கடி மின்வெட்டு ஏற்படுகிறது",
+            "{place} அரசு மருத்துவமனையில் மருத்துவர் இல்லை",
+            "{place} பள்ளிக்கு ஆசிரியர் வருவதில்லை",
+        ],
+        "impact": ["மக்கள் மிகவும் சிரமப்படுகிறார்கள்.", "பலமுறை புகார் அளித்தும் நடவடிக்கை இல்லை."],
+        "urgent": ["இது அவசரம், உடனடியாக நடவடிக்கை எடுக்கவும்."],
+        "low": ["இது ஒரு பரிந்துரை மட்டுமே."],
+        "places": ["தி. நகர்", "அண்ணா நகர்", "வார்டு 12"],
+    },
+}
+
+
+@dataclass(frozen=True)
+class Sample:
+    """One synthetic grievance text"""
+    text: str
+    language: str
+    length: str
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _sentence(rng, language):
+    templates = TEMPLATES[language]
+    problem = rng.choice(templates["problems"]).format(
+        place=rng.choice(templates["places"]), n=rng.randint(2, 30)
+    )
+    return problem + ("। " if language == "hi" else ". ")
+
+
+def _text(rng, language, length):
+    templates = TEMPLATES[language]
+    low, high = LENGTHS[length]
+    parts = []
+    for _ in range(rng.randint(low, high)):
+        parts.append(_sentence(rng, language))
+        if rng.random() < 0.5:
+            parts.append(rng.choice(templates["impact"]) + " ")
+    if language == "en" and rng.random() < CODE_MIX_RATE:
+        parts.append(_sentence(rng, "hi"))
+    roll = rng.random()
+    if roll < 0.25:
+        parts.append(rng.choice(templates["urgent"]))
+    elif roll < 0.35:
+        parts.append(rng.choice(templates["low"]))
+    # Analysis runs on description + " " + title; the title is a short problem line
+    title = _sentence(rng, language).strip().rstrip(".।")
+    return "".join(parts).strip() + " " + title
+
+
+def generate_corpus(size, seed=42, languages=None) -> List[Sample]:
+    """
+    Generate a reproducible corpus of synthetic grievance texts.
+
+    Args:
+        size: Number of texts
+        seed: Random seed
+        languages: Optional subset of LANGUAGE_WEIGHTS to draw from
+
+    Returns:
+        List of Sample(text, language, length)
+    """
+    rng = random.Random(seed)
+    weights = {lang: w for lang, w in LANGUAGE_WEIGHTS.items() if not languages or lang in languages}
+    corpus: List[Sample] = []
+    for _ in range(size):
+        if corpus and rng.random() < DUPLICATE_RATE:
+            corpus.append(rng.choice(corpus))
+            continue
+        language = _weighted(rng, weights)
+        length = _weighted(rng, LENGTH_WEIGHTS)
+        corpus.append(Sample(_text(rng, language, length), language, length))
+    return corpus
@@ -0,0 +1,46 @@
+"""
+Group near-duplicate grievances filed close together into incidents.
+Run once, or periodically with --interval (minutes):
+
+    cd backend && python cluster_incidents.py
+    cd backend && python cluster_incidents.py --days 90 --interval 60
+"""
+
+import argparse
+import time
+
+from app import models, database, incidents
+
+def run_once(days, min_members, options):
+    db = database.SessionLocal()
+    try:
+        started = time.perf_counter()
+        found, scanned, checked = incidents.detect_incidents(db, days=days, min_members=min_members, **options)
+        elapsed = time.perf_counter() - started
+        grouped = sum(i.member_count for i in found)
+        print(f"✅ {len(found)} incidents covering {grouped} of {scanned} grievances "
+              f"({checked} candidate pairs checked) in {elapsed:.2f}s")
+        for i in sorted(found, key=lambda i: i.member_count, reverse=True)[:10]:
+            place = i.city or i.district or "unknown location"
+            print(f"  🧩 #{i.id} {i.category}: {i.member_count} grievances near {place} - {i.title}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cluster grievances into incidents with MinHash LSH")
+    parser.add_argument("--days", type=int, default=0, help="Only cluster the last N days (0 clusters all grievances)")
+    parser.add_argument("--similarity", type=float, default=incidents.INCIDENT_SIMILARITY, help="Minimum text similarity (Jaccard)")
+    parser.add_argument("--window-days", type=float, default=incidents.INCIDENT_WINDOW_DAYS, help="Maximum days between linked grievances")
+    parser.add_argument("--radius-km", type=float, default=incidents.INCIDENT_RADIUS_KM, help="Maximum distance between linked grievances")
+    parser.add_argument("--min-members", type=int, default=incidents.INCIDENT_MIN_MEMBERS, help="Grievances needed for an incident")
+    parser.add_argument("--interval", type=float, default=0, help="Repeat every N minutes (0 runs once)")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=database.engine)
+    options = {"similarity": args.similarity, "window_days": args.window_days, "radius_km": args.radius_km}
+    print("🔍 Clustering grievances into incidents...")
+    while True:
+        run_once(args.days or None, args.min_members, options)
+        if not args.interval:
+            break
+        time.sleep(args.interval * 60)
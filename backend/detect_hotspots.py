@@ -0,0 +1,45 @@
+"""
+Detect geographic hotspots of recent same-category grievances.
+Run once, or periodically with --interval (minutes):
+
+    cd backend && python detect_hotspots.py
+    cd backend && python detect_hotspots.py --interval 15
+"""
+
+import argparse
+import time
+
+from app import models, database, hotspots
+
+def run_once(days, eps_km, min_samples, min_confidence):
+    db = database.SessionLocal()
+    try:
+        started = time.perf_counter()
+        found = hotspots.detect_hotspots(
+            db, days=days, eps_km=eps_km, min_samples=min_samples, min_confidence=min_confidence
+        )
+        elapsed = time.perf_counter() - started
+        print(f"✅ Found {len(found)} hotspots in {elapsed:.2f}s")
+        for h in found:
+            place = h.city or f"{h.latitude:.4f}, {h.longitude:.4f}"
+            print(f"  🚨 {h.category}: {h.member_count} grievances within {h.radius_km:.2f} km near {place}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Detect grievance hotspots with DBSCAN")
+    parser.add_argument("--days", type=int, default=hotspots.HOTSPOT_WINDOW_DAYS, help="Look-back window in days")
+    parser.add_argument("--eps-km", type=float, default=hotspots.HOTSPOT_EPS_KM, help="Neighbourhood radius in km")
+    parser.add_argument("--min-samples", type=int, default=hotspots.HOTSPOT_MIN_SAMPLES, help="Grievances needed for a hotspot")
+    parser.add_argument("--min-confidence", type=float, default=hotspots.HOTSPOT_MIN_GEOCODE_CONFIDENCE,
+                        help="Minimum geocode confidence (1.0 keeps picked GPS coordinates only)")
+    parser.add_argument("--interval", type=float, default=0, help="Repeat every N minutes (0 runs once)")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=database.engine)
+    print("🔍 Detecting grievance hotspots...")
+    while True:
+        run_once(args.days, args.eps_km, args.min_samples, args.min_confidence)
+        if not args.interval:
+            break
+        time.sleep(args.interval * 60)
@@ -0,0 +1,107 @@
+"""
+Database Migration: Compact stored analysis_metadata
+Rewrites the verbose analysis explanation stored on older grievances in the
+compact form of app/explanations.py (analyzer version, per-category hit
+vector, matched priority terms) without re-analyzing them, then VACUUMs.
+Detail views rebuild the same explanation from it.
+
+Compact values written before the confidence and source were part of the
+form get them from the confidence_score column. Values in other shapes
+(empty, or from another API variant) are left as they are.
+
+    cd backend && python migrate_compact_metadata.py
+"""
+
+import json
+import os
+import re
+import sqlite3
+
+from app.codes import category_codes
+from app.explanations import compact, is_compact
+
+# Database path
+DB_PATH = os.path.join(os.path.dirname(__file__), "grievance.db")
+
+CHUNK_SIZE = 5000
+
+HIGH_PREFIX = "High urgency keywords detected: "
+DETECTED_CATEGORY = re.compile(r"(?:in '(.+)' category|predicted '(.+)')$")
+
+def compact_verbose(metadata, category_code, confidence_score):
+    """Compact form of a verbose explanation, or None if it is not one"""
+    if not isinstance(metadata, dict) or "relevant_keywords" not in metadata:
+        return None
+    reason = metadata.get("priority_reason", "")
+    high = reason[len(HIGH_PREFIX):].split(", ") if reason.startswith(HIGH_PREFIX) else []
+    detected = DETECTED_CATEGORY.search(metadata.get("category_detection", ""))
+    category = (detected.group(1) or detected.group(2)) if detected else category_codes.lookup(category_code)
+    return compact({
+        "category": category or "General",
+        "priority": "High" if high else "Low" if reason.startswith("Low urgency") else "Medium",
+        "confidence_score": confidence_score or 0.0,
+        "analysis_explanation": {**metadata, "high_keywords": high}
+    })
+
+def add_confidence(metadata, confidence_score):
+    """Compact facts written before the confidence and source were kept, completed; None if up to date"""
+    if "confidence" in metadata:
+        return None
+    metadata = {**metadata, "confidence": confidence_score or 0.0}
+    if metadata.get("learner_version") is not None:
+        metadata["source"] = "learner"
+    return metadata
+
+def migrate_compact_metadata():
+    """Rewrite verbose analysis_metadata values in the compact form"""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cursor = conn.cursor()
+        size_before = os.path.getsize(DB_PATH)
+
+        print("🗜️ Compacting analysis_metadata...")
+        last_id = compacted = kept = 0
+        while True:
+            cursor.execute(
+                "SELECT id, category, confidence_score, analysis_metadata FROM grievances WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, CHUNK_SIZE)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            updates = []
+            for gid, category_code, confidence_score, value in rows:
+                try:
+                    metadata = json.loads(value) if value else None
+                except ValueError:
+                    metadata = None
+                if is_compact(metadata):
+                    stored = add_confidence(metadata, confidence_score)
+                else:
+                    stored = compact_verbose(metadata, category_code, confidence_score)
+                if stored is None:
+                    kept += 1
+                else:
+                    updates.append((json.dumps(stored), gid))
+            cursor.executemany("UPDATE grievances SET analysis_metadata = ? WHERE id = ?", updates)
+            conn.commit()
+            compacted += len(updates)
+            print(f"  ✓ Compacted {compacted} grievances up to #{last_id}")
+
+        if not compacted:
+            print("✅ Nothing to compact. Skipping migration.")
+            return
+        if kept:
+            print(f"  ℹ️ {kept} grievances were already up to date or had no verbose explanation")
+
+        print("🧹 Reclaiming space...")
+        cursor.execute("VACUUM")
+        size_after = os.path.getsize(DB_PATH)
+        print(f"✅ Migration complete! {size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate_compact_metadata()
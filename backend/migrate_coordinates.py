@@ -1,78 +1,134 @@
 """
-Database Migration: Add Latitude and Longitude columns
-Safely adds GPS coordinates to existing grievances table
+Database Migration: Add Latitude and Longitude columns and backfill them
+Adds GPS coordinate columns if missing, then geocodes the location text of
+existing grievances with the offline gazetteer in keyset batches, writing
+each batch with one executemany. Safe to interrupt and re-run: resolved rows
+are skipped, and progress is checkpointed so a run resumes where it stopped.
+
+Coordinates stored before geocode_confidence existed were GPS picks and get
+confidence 1.0. Placeholder (0, 0) coordinates whose location text matches
+no known place are cleared rather than left plotting off the coast of Africa.
+
+    cd backend && python migrate_coordinates.py [batch_size]
 """
 
 import sqlite3
-import json
-import sys
 import os
+import sys
+import time
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from location_utils import parse_location_to_coordinates
+from app.gazetteer import geocode
 
 # Database path
 DB_PATH = os.path.join(os.path.dirname(__file__), "grievance.db")
 
-def migrate_add_coordinates():
-    """Add latitude and longitude columns to grievances table"""
+# Last processed grievance id of an unfinished run
+CHECKPOINT_PATH = os.path.join(os.path.dirname(__file__), ".migrate_coordinates.checkpoint")
+
+BATCH_SIZE = 5000
+
+def add_coordinate_columns(cursor):
+    """Add latitude, longitude and geocode_confidence columns if missing"""
+    cursor.execute("PRAGMA table_info(grievances)")
+    columns = [col[1] for col in cursor.fetchall()]
+    for column in ("latitude", "longitude", "geocode_confidence"):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE grievances ADD COLUMN {column} REAL")
+            print(f"  ✓ Added {column} column")
+
+def mark_picked_coordinates(cursor):
+    """Give coordinates stored before geocode_confidence existed (GPS picks) confidence 1.0"""
+    cursor.execute(
+        """UPDATE grievances SET geocode_confidence = 1.0
+           WHERE geocode_confidence IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL
+                 AND NOT (latitude = 0 AND longitude = 0)"""
+    )
+    return cursor.rowcount
+
+def read_checkpoint():
+    try:
+        with open(CHECKPOINT_PATH) as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+def write_checkpoint(last_id):
+    with open(CHECKPOINT_PATH, "w") as f:
+        f.write(str(last_id))
+
+def migrate_add_coordinates(batch_size=BATCH_SIZE):
+    """Add coordinate columns and geocode grievances that have none"""
+    conn = sqlite3.connect(DB_PATH)
     try:
-        conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
-        
-        # Check if columns already exist
-        cursor.execute("PRAGMA table_info(grievances)")
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        if 'latitude' in columns and 'longitude' in columns:
-            print("✅ Columns already exist. Skipping migration.")
-            conn.close()
-            return
-        
-        print("📍 Adding latitude and longitude columns...")
-        
-        # Add latitude column
-        if 'latitude' not in columns:
-            cursor.execute("ALTER TABLE grievances ADD COLUMN latitude REAL")
-            print("  ✓ Added latitude column")
-        
-        # Add longitude column
-        if 'longitude' not in columns:
-            cursor.execute("ALTER TABLE grievances ADD COLUMN longitude REAL")
-            print("  ✓ Added longitude column")
-        
+        add_coordinate_columns(cursor)
+        picked = mark_picked_coordinates(cursor)
         conn.commit()
-        
-        # Update existing grievances with coordinates
-        print("\n📌 Generating coordinates for existing grievances...")
-        cursor.execute("SELECT id, location FROM grievances WHERE latitude IS NULL OR longitude IS NULL")
-        grievances = cursor.fetchall()
-        
-        updated_count = 0
-        for gid, location in grievances:
-            lat, lon, city = parse_location_to_coordinates(location)
+        if picked:
+            print(f"  ✓ Marked {picked} picked GPS coordinates as precise")
+
+        last_id = read_checkpoint()
+        if last_id:
+            print(f"  ↻ Resuming after grievance #{last_id}")
+
+        started = time.perf_counter()
+        scanned = 0
+        updated = 0
+        cleared = 0
+
+        while True:
+            # Keyset pagination keeps each batch an indexed range scan
             cursor.execute(
-                "UPDATE grievances SET latitude = ?, longitude = ? WHERE id = ?",
-                (lat, lon, gid)
+                """SELECT id, location, latitude, longitude FROM grievances
+                   WHERE id > ? AND (latitude IS NULL OR longitude IS NULL
+                                     OR (latitude = 0 AND longitude = 0))
+                   ORDER BY id LIMIT ?""",
+                (last_id, batch_size)
             )
-            updated_count += 1
-            print(f"  ✓ Updated grievance #{gid} with coordinates ({lat:.4f}, {lon:.4f}) - {city}")
-        
-        conn.commit()
+            rows = cursor.fetchall()
+            if not rows:
+                break
+
+            params = []
+            placeholders = 0
+            for gid, location, latitude, longitude in rows:
+                result = geocode(location)
+                if result is not None:
+                    params.append((result.latitude, result.longitude, result.confidence, gid))
+                elif latitude == 0 and longitude == 0:
+                    # Placeholder coordinates: better none than a point in the ocean
+                    params.append((None, None, None, gid))
+                    placeholders += 1
+
+            cursor.executemany(
+                "UPDATE grievances SET latitude = ?, longitude = ?, geocode_confidence = ? WHERE id = ?",
+                params
+            )
+            conn.commit()
+
+            last_id = rows[-1][0]
+            write_checkpoint(last_id)
+            scanned += len(rows)
+            updated += len(params) - placeholders
+            cleared += placeholders
+            print(f"  ✓ Processed up to grievance #{last_id} ({updated}/{scanned} geocoded)")
+
+        # Finished: the next run starts from the beginning again
+        if os.path.exists(CHECKPOINT_PATH):
+            os.remove(CHECKPOINT_PATH)
+
+        elapsed = time.perf_counter() - started
+        print(f"\n✅ Migration complete! Geocoded {updated} of {scanned} grievances in {elapsed:.1f}s.")
+        if scanned > updated:
+            print(f"  ℹ️ {scanned - updated} locations matched no known place and were left without coordinates")
+        if cleared:
+            print(f"  ℹ️ {cleared} of them had placeholder (0, 0) coordinates, which were cleared")
+        if updated or cleared:
+            print("  → Run backfill_places.py, reassign_wards.py and rebuild_map_clusters.py to refresh derived data")
+    finally:
         conn.close()
-        
-        print(f"\n✅ Migration complete! Updated {updated_count} grievances with coordinates.")
-        
-    except Exception as e:
-        print(f"❌ Migration failed: {str(e)}")
-        if conn:
-            conn.rollback()
-            conn.close()
-        raise
 
 if __name__ == "__main__":
     print("🗺️ Starting database migration for GPS coordinates...\n")
-    migrate_add_coordinates()
+    migrate_add_coordinates(int(sys.argv[1]) if len(sys.argv) > 1 else BATCH_SIZE)
     print("\n🎉 Migration successful!")
@@ -0,0 +1,143 @@
+"""
+Database Migration: Store category, priority and status as integer codes
+Rebuilds the grievances table with SMALLINT category, priority and status
+columns referencing the grievance_categories, grievance_priorities and
+grievance_statuses lookup tables (see app/codes.py), then VACUUMs the file.
+
+Spelling variants of one name ("In progress", "in_progress") are merged
+into its canonical name. Other unknown values are kept as new codes in the
+lookup tables and listed, so they can be fixed by hand.
+
+Stop the app while this runs; it rewrites the whole table.
+
+    cd backend && python migrate_enum_codes.py
+"""
+
+import os
+import re
+import sqlite3
+
+from app.codes import CATEGORIES, PRIORITIES, STATUSES, normalize_name
+
+# Database path
+DB_PATH = os.path.join(os.path.dirname(__file__), "grievance.db")
+
+# Coded column -> (lookup table, fixed names)
+CODED_COLUMNS = {
+    "category": ("grievance_categories", CATEGORIES),
+    "priority": ("grievance_priorities", PRIORITIES),
+    "status": ("grievance_statuses", STATUSES),
+}
+
+def build_codes(cursor, column, lookup_table, fixed):
+    """
+    Seed a lookup table and map every distinct stored value to a code.
+
+    Returns:
+        Tuple of ({stored value: code}, [values added as new codes])
+    """
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {lookup_table} (id SMALLINT NOT NULL PRIMARY KEY, name VARCHAR NOT NULL UNIQUE)"
+    )
+    cursor.executemany(
+        f"INSERT OR IGNORE INTO {lookup_table} (id, name) VALUES (?, ?)",
+        list(enumerate(fixed, start=1))
+    )
+    cursor.execute(f"SELECT id, name FROM {lookup_table}")
+    codes = {normalize_name(name): code for code, name in cursor.fetchall()}
+
+    mapping, added = {}, []
+    cursor.execute(f"SELECT DISTINCT {column} FROM grievances WHERE {column} IS NOT NULL")
+    for (value,) in cursor.fetchall():
+        key = normalize_name(str(value))
+        if not key:
+            continue
+        if key not in codes:
+            code = max(codes.values(), default=0) + 1
+            cursor.execute(f"INSERT INTO {lookup_table} (id, name) VALUES (?, ?)", (code, " ".join(str(value).split())))
+            codes[key] = code
+            added.append(value)
+        mapping[value] = codes[key]
+    return mapping, added
+
+def migrate_enum_codes():
+    """Rewrite grievances.category, priority and status as lookup table codes"""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(grievances)")
+        types = {col[1]: col[2].upper() for col in cursor.fetchall()}
+        if not types:
+            print("ℹ️ No grievances table yet; it is created with coded columns on startup.")
+            return
+        if types.get("category") == "SMALLINT":
+            print("✅ Grievance columns are already coded. Skipping migration.")
+            return
+
+        size_before = os.path.getsize(DB_PATH)
+        cursor.execute("PRAGMA foreign_keys = OFF")
+        cursor.execute("BEGIN")
+
+        mappings = {}
+        for column, (lookup_table, fixed) in CODED_COLUMNS.items():
+            mappings[column], added = build_codes(cursor, column, lookup_table, fixed)
+            merged = len(mappings[column]) - len(set(mappings[column].values()))
+            print(f"🔢 {column}: {len(mappings[column])} distinct values -> {len(set(mappings[column].values()))} codes")
+            if merged:
+                print(f"  ✓ Merged {merged} spelling variant(s)")
+            if added:
+                print(f"  ⚠️ Kept unknown values as new codes: {', '.join(map(repr, added))}")
+
+        # Same table definition with the three columns retyped
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'grievances'")
+        table_sql = cursor.fetchone()[0]
+        for column, (lookup_table, _) in CODED_COLUMNS.items():
+            table_sql = re.sub(
+                rf"\b{column}\s+(VARCHAR|TEXT)(\(\d+\))?",
+                f"{column} SMALLINT REFERENCES {lookup_table} (id)",
+                table_sql, count=1
+            )
+        table_sql = re.sub(r"^CREATE TABLE \"?grievances\"?", "CREATE TABLE grievances_coded", table_sql)
+        cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'grievances' AND sql IS NOT NULL"
+        )
+        index_sql = [row[0] for row in cursor.fetchall()]
+
+        print("📦 Rewriting grievances...")
+        cursor.execute(table_sql)
+        columns = list(types)
+        select_list, params = [], []
+        for column in columns:
+            if column in mappings and mappings[column]:
+                cases = " ".join("WHEN ? THEN ?" for _ in mappings[column])
+                select_list.append(f"CASE {column} {cases} END")
+                for value, code in mappings[column].items():
+                    params.extend((value, code))
+            elif column in mappings:
+                select_list.append("NULL")
+            else:
+                select_list.append(column)
+        cursor.execute(
+            f"INSERT INTO grievances_coded ({', '.join(columns)}) SELECT {', '.join(select_list)} FROM grievances",
+            params
+        )
+        cursor.execute("DROP TABLE grievances")
+        cursor.execute("ALTER TABLE grievances_coded RENAME TO grievances")
+        for sql in index_sql:
+            cursor.execute(sql)
+        conn.commit()
+        cursor.execute("PRAGMA foreign_keys = ON")
+
+        print("🧹 Reclaiming space...")
+        cursor.execute("VACUUM")
+        size_after = os.path.getsize(DB_PATH)
+        print(f"✅ Migration complete! {size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate_enum_codes()
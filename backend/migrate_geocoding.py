@@ -0,0 +1,35 @@
+"""
+Database Migration: Add geocode_confidence column
+Records how reliable each grievance's stored coordinates are
+(1.0 for GPS picks, lower for gazetteer matches on location text)
+"""
+
+import sqlite3
+import os
+
+# Database path
+DB_PATH = os.path.join(os.path.dirname(__file__), "grievance.db")
+
+def migrate_add_geocode_confidence():
+    """Add geocode_confidence column to grievances table"""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cursor = conn.cursor()
+        
+        # Check if column already exists
+        cursor.execute("PRAGMA table_info(grievances)")
+        columns = [col[1] for col in cursor.fetchall()]
+        
+        if 'geocode_confidence' in columns:
+            print("✅ geocode_confidence column already exists. Skipping migration.")
+            return
+        
+        print("📍 Adding geocode_confidence column...")
+        cursor.execute("ALTER TABLE grievances ADD COLUMN geocode_confidence REAL")
+        conn.commit()
+        print("✅ Migration complete!")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate_add_geocode_confidence()
@@ -0,0 +1,120 @@
+"""
+Database Migration: Move suggested_schemes into the grievance_schemes table
+Every grievance kept a JSON copy of its suggested scheme names. They become
+(grievance_id, scheme_id, position) rows referencing the schemes table;
+names missing from it get reference rows (see app/grievance_schemes.py).
+The JSON column is dropped afterwards and the file VACUUMed.
+
+Stop the app while this runs.
+
+    cd backend && python migrate_grievance_schemes.py
+"""
+
+import json
+import os
+import sqlite3
+
+from app.grievance_schemes import REFERENCE_DESCRIPTION
+
+# Database path
+DB_PATH = os.path.join(os.path.dirname(__file__), "grievance.db")
+
+CHUNK_SIZE = 10000
+
+def parse_names(value):
+    """Scheme names of a stored suggested_schemes value (JSON list, or None)"""
+    try:
+        names = json.loads(value) if isinstance(value, str) else value
+    except ValueError:
+        return []
+    if not isinstance(names, list):
+        return []
+    return list(dict.fromkeys(name.strip() for name in names if isinstance(name, str) and name.strip()))
+
+def migrate_grievance_schemes():
+    """Backfill grievance_schemes from grievances.suggested_schemes and drop the JSON column"""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(grievances)")
+        if "suggested_schemes" not in [col[1] for col in cursor.fetchall()]:
+            print("✅ suggested_schemes already moved to grievance_schemes. Skipping migration.")
+            return
+
+        size_before = os.path.getsize(DB_PATH)
+        print("🔗 Creating grievance_schemes table...")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS grievance_schemes (
+                grievance_id INTEGER NOT NULL REFERENCES grievances (id),
+                scheme_id INTEGER NOT NULL REFERENCES schemes (id),
+                position SMALLINT NOT NULL,
+                PRIMARY KEY (grievance_id, scheme_id)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_grievance_schemes_scheme_id ON grievance_schemes (scheme_id)")
+
+        cursor.execute("PRAGMA table_info(schemes)")
+        scheme_columns = [col[1] for col in cursor.fetchall()]
+        cursor.execute("SELECT name, id FROM schemes")
+        scheme_ids = dict(cursor.fetchall())
+
+        print("📦 Backfilling scheme links...")
+        last_id = linked = created = 0
+        while True:
+            cursor.execute(
+                "SELECT id, suggested_schemes FROM grievances WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, CHUNK_SIZE)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            links = [(gid, parse_names(value)) for gid, value in rows]
+            for name in dict.fromkeys(name for _, names in links for name in names):
+                if name in scheme_ids:
+                    continue
+                if "is_active" in scheme_columns:
+                    cursor.execute(
+                        """INSERT INTO schemes (name, description, eligibility, rank, is_active, updated_at)
+                           VALUES (?, ?, '{}', 0, 1, CURRENT_TIMESTAMP)""",
+                        (name, REFERENCE_DESCRIPTION)
+                    )
+                else:
+                    cursor.execute("INSERT INTO schemes (name, description) VALUES (?, ?)", (name, REFERENCE_DESCRIPTION))
+                scheme_ids[name] = cursor.lastrowid
+                created += 1
+
+            cursor.executemany(
+                "INSERT OR IGNORE INTO grievance_schemes (grievance_id, scheme_id, position) VALUES (?, ?, ?)",
+                [
+                    (gid, scheme_ids[name], position)
+                    for gid, names in links
+                    for position, name in enumerate(names)
+                ]
+            )
+            linked += cursor.rowcount
+            conn.commit()
+            print(f"  ✓ Linked schemes up to grievance #{last_id}")
+
+        print(f"  ✓ {linked} links, {created} scheme names added as reference schemes")
+
+        print("🗑️ Dropping grievances.suggested_schemes...")
+        try:
+            cursor.execute("ALTER TABLE grievances DROP COLUMN suggested_schemes")
+            conn.commit()
+        except sqlite3.OperationalError as e:
+            # DROP COLUMN needs SQLite 3.35+; the app no longer reads the column either way
+            print(f"  ⚠️ Could not drop the column ({e}); it is left unused")
+            return
+
+        print("🧹 Reclaiming space...")
+        cursor.execute("VACUUM")
+        size_after = os.path.getsize(DB_PATH)
+        print(f"✅ Migration complete! {size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate_grievance_schemes()
@@ -0,0 +1,36 @@
+"""
+Database Migration: Add incident_id column
+Links grievances to the incidents found by cluster_incidents.py
+(the incidents table itself is created on startup like every other table)
+"""
+
+import sqlite3
+import os
+
+# Database path
+DB_PATH = os.path.join(os.path.dirname(__file__), "grievance.db")
+
+def migrate_add_incidents():
+    """Add incident_id column to grievances table"""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cursor = conn.cursor()
+        
+        # Check if column already exists
+        cursor.execute("PRAGMA table_info(grievances)")
+        columns = [col[1] for col in cursor.fetchall()]
+        
+        if 'incident_id' in columns:
+            print("✅ incident_id column already exists. Skipping migration.")
+            return
+        
+        print("🧩 Adding incident_id column...")
+        cursor.execute("ALTER TABLE grievances ADD COLUMN incident_id INTEGER REFERENCES incidents(id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_grievances_incident_id ON grievances (incident_id)")
+        conn.commit()
+        print("✅ Migration complete!")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate_add_incidents()
@@ -0,0 +1,50 @@
+"""
+Database Migration: Add location and eligibility columns to schemes
+State/district scope, eligibility rules, rank, active flag and update time
+used by the precomputed scheme recommendations (rebuild_scheme_recommendations.py)
+"""
+
+import sqlite3
+import os
+
+# Database path
+DB_PATH = os.path.join(os.path.dirname(__file__), "grievance.db")
+
+NEW_COLUMNS = {
+    "state": "VARCHAR",
+    "district": "VARCHAR",
+    "eligibility": "JSON",
+    "rank": "INTEGER DEFAULT 0",
+    "is_active": "BOOLEAN DEFAULT 1",
+    "updated_at": "DATETIME",
+}
+
+def migrate_add_scheme_columns():
+    """Add scheme scope and eligibility columns if missing"""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cursor = conn.cursor()
+        
+        # Check which columns already exist
+        cursor.execute("PRAGMA table_info(schemes)")
+        columns = [col[1] for col in cursor.fetchall()]
+        missing = [name for name in NEW_COLUMNS if name not in columns]
+        
+        if not missing:
+            print("✅ Scheme columns already exist. Skipping migration.")
+            return
+        
+        print("🏛️ Adding scheme columns...")
+        for name in missing:
+            cursor.execute(f"ALTER TABLE schemes ADD COLUMN {name} {NEW_COLUMNS[name]}")
+            print(f"  ✓ Added {name} column")
+        # Existing schemes count as changed so the first rebuild picks them up
+        cursor.execute("UPDATE schemes SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL")
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_schemes_updated_at ON schemes (updated_at)")
+        conn.commit()
+        print("✅ Migration complete!")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate_add_scheme_columns()
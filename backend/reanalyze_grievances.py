@@ -0,0 +1,252 @@
+"""
+Database Migration: Re-analyze stored grievances with the current analyzer
+Run after the keyword/scheme tables (ANALYZER_CONFIG_PATH) change. Grievances
+whose stored analyzer_version differs from the current one are read in
+keyset chunks, analyzed in parallel worker processes, and written back by
+this process with batched UPDATEs, one short transaction per chunk.
+
+Safe against a live database:
+- each UPDATE only applies if the row's category is still what was read, so
+  a category corrected by an admin meanwhile is never overwritten (the row
+  is skipped and reported)
+- grievances with an admin category correction keep their category, schemes
+  and confidence; only priority and the analysis explanation are refreshed
+- suggested schemes are rewritten in grievance_schemes under the same
+  condition, in the same transaction as the UPDATE
+- writers wait for locks (busy timeout) instead of failing
+
+Progress is checkpointed per analyzer version, so an interrupted run
+resumes after the last fully written chunk.
+
+    cd backend && python reanalyze_grievances.py [--workers N] [--chunk-size N] [--force] [--restart]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.codes import category_codes, priority_codes
+from app.explanations import compact
+from app.grievance_schemes import scheme_ids
+from app.ml_engine import GrievanceAnalyzer, ANALYZER_CONFIG_PATH, MIN_TEXT_LENGTH
+from app.recommendations import RecommendationMap
+
+# Database path
+DB_PATH = os.path.join(os.path.dirname(__file__), "grievance.db")
+
+# Analyzer version and last fully written grievance id of an unfinished run
+CHECKPOINT_PATH = os.path.join(os.path.dirname(__file__), ".reanalyze_grievances.checkpoint")
+
+CHUNK_SIZE = 2000
+
+# Seconds a write waits for the app's transactions to release the database
+BUSY_TIMEOUT = 30
+
+_worker_analyzer = None
+_worker_recommendations = None
+
+def _init_worker(config_path):
+    """Compile the keyword tables and load the scheme recommendations once per worker process"""
+    global _worker_analyzer, _worker_recommendations
+    _worker_analyzer = GrievanceAnalyzer(config_path=config_path)
+    _worker_recommendations = RecommendationMap(analyzer=_worker_analyzer)
+
+def _analyze_chunk(rows):
+    """
+    Analyze a chunk of (id, title, description, category code, corrected, state, district) rows.
+
+    Returns:
+        Tuple of (UPDATE parameters for uncorrected rows, for corrected rows, failed ids)
+    """
+    updates, corrected_updates, failed = [], [], []
+    valid = []
+    for row in rows:
+        gid, title, description = row[:3]
+        text = f"{description or ''} {title or ''}"
+        if len(text.strip()) < MIN_TEXT_LENGTH:
+            failed.append(gid)
+        else:
+            valid.append((row, text))
+
+    # One batch call per chunk, so optional lemmatization runs through nlp.pipe
+    analyses = _worker_analyzer.analyze_batch([text for _, text in valid])
+    for ((gid, _, _, category, corrected, state, district), _), analysis in zip(valid, analyses):
+        metadata = json.dumps(compact(analysis))
+        if corrected:
+            corrected_updates.append((analysis["priority"], metadata, gid, category))
+        else:
+            updates.append((
+                analysis["category"], analysis["priority"],
+                _worker_recommendations.lookup(analysis["category"], state, district),
+                analysis["confidence_score"], metadata, gid, category
+            ))
+    return updates, corrected_updates, failed
+
+def read_checkpoint(version):
+    """Last written id for this analyzer version (0 to start from the beginning)"""
+    try:
+        with open(CHECKPOINT_PATH) as f:
+            checkpoint = json.load(f)
+        return checkpoint["last_id"] if checkpoint.get("version") == version else 0
+    except (OSError, ValueError, KeyError):
+        return 0
+
+def write_checkpoint(version, last_id):
+    with open(CHECKPOINT_PATH, "w") as f:
+        json.dump({"version": version, "last_id": last_id}, f)
+
+def reanalyze_grievances(workers=None, chunk_size=CHUNK_SIZE, force=False, restart=False):
+    """Recompute category, priority, schemes and confidence for stale grievances"""
+    analyzer = GrievanceAnalyzer(config_path=ANALYZER_CONFIG_PATH)
+    version = analyzer.version
+    # Categories new to this config get their codes here, before the workers need them
+    for category in analyzer.categories:
+        category_codes.code(category)
+    workers = workers or os.cpu_count() or 1
+
+    conn = sqlite3.connect(DB_PATH, timeout=BUSY_TIMEOUT)
+    # Registers scheme names missing from the schemes table, between chunk writes
+    schemes_db = Session(create_engine(f"sqlite:///{DB_PATH}", connect_args={"timeout": BUSY_TIMEOUT}))
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'category_corrections'")
+        corrected_expr = (
+            "EXISTS (SELECT 1 FROM category_corrections c WHERE c.grievance_id = g.id)"
+            if cursor.fetchone() else "0"
+        )
+        stale_filter = "" if force else (
+            "AND (CASE WHEN json_valid(analysis_metadata) "
+            "THEN json_extract(analysis_metadata, '$.analyzer_version') END) IS NOT ?"
+        )
+
+        last_read = 0 if restart else read_checkpoint(version)
+        if last_read:
+            print(f"  ↻ Resuming after grievance #{last_read}")
+        print(f"  Analyzer version {version}, {workers} workers, chunks of {chunk_size}")
+
+        started = time.perf_counter()
+        updated = corrected_kept = skipped = failed = 0
+        exhausted = False
+        # Chunks in read order as [last id, future]; the checkpoint only
+        # advances past chunks whose predecessors are all written
+        in_flight = []
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(ANALYZER_CONFIG_PATH,)
+        ) as pool:
+            while in_flight or not exhausted:
+                # Keep a bounded number of chunks in flight
+                while not exhausted and len(in_flight) < workers * 2:
+                    cursor.execute(
+                        f"""SELECT id, title, description, category, {corrected_expr}, state, district
+                            FROM grievances g
+                            WHERE id > ? {stale_filter}
+                            ORDER BY id LIMIT ?""",
+                        (last_read, chunk_size) if force else (last_read, version, chunk_size)
+                    )
+                    rows = cursor.fetchall()
+                    # End the read transaction so the app's writers are never held up
+                    conn.commit()
+                    if not rows:
+                        exhausted = True
+                        break
+                    last_read = rows[-1][0]
+                    in_flight.append([last_read, pool.submit(_analyze_chunk, rows)])
+
+                if not in_flight:
+                    break
+                wait([future for _, future in in_flight], return_when=FIRST_COMPLETED)
+
+                written_up_to = None
+                while in_flight and in_flight[0][1].done():
+                    chunk_last_id, future = in_flight.pop(0)
+                    updates, corrected_updates, failed_ids = future.result()
+                    # Category and priority columns hold codes (app/codes.py)
+                    updates = [
+                        (category_codes.code(category), priority_codes.code(priority), *rest)
+                        for category, priority, *rest in updates
+                    ]
+                    corrected_updates = [(priority_codes.code(priority), *rest) for priority, *rest in corrected_updates]
+                    ids = scheme_ids(schemes_db, [name for update in updates for name in update[2]])
+                    schemes_db.commit()
+                    # SQLite has a single writer, so all writes stay in this process.
+                    # Each write applies only if the category is unchanged since it was read
+                    # (scheme links first, while the category is still the old one).
+                    cursor.executemany(
+                        """DELETE FROM grievance_schemes WHERE grievance_id = ?
+                           AND EXISTS (SELECT 1 FROM grievances WHERE id = ? AND category IS ?)""",
+                        [(gid, gid, category) for *_, gid, category in updates]
+                    )
+                    cursor.executemany(
+                        """INSERT INTO grievance_schemes (grievance_id, scheme_id, position)
+                           SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM grievances WHERE id = ? AND category IS ?)""",
+                        [
+                            (gid, ids[name], position, gid, category)
+                            for _, _, names, *_, gid, category in updates
+                            for position, name in enumerate(dict.fromkeys(names))
+                        ]
+                    )
+                    cursor.executemany(
+                        """UPDATE grievances SET category = ?, priority = ?,
+                           confidence_score = ?, analysis_metadata = ?
+                           WHERE id = ? AND category IS ?""",
+                        [(category, priority, *rest) for category, priority, _, *rest in updates]
+                    )
+                    applied = cursor.rowcount
+                    cursor.executemany(
+                        "UPDATE grievances SET priority = ?, analysis_metadata = ? WHERE id = ? AND category IS ?",
+                        corrected_updates
+                    )
+                    applied_corrected = cursor.rowcount
+                    conn.commit()
+
+                    updated += applied
+                    corrected_kept += applied_corrected
+                    skipped += len(updates) + len(corrected_updates) - applied - applied_corrected
+                    failed += len(failed_ids)
+                    written_up_to = chunk_last_id
+
+                if written_up_to is not None:
+                    write_checkpoint(version, written_up_to)
+                    elapsed = time.perf_counter() - started
+                    done = updated + corrected_kept
+                    print(f"  ✓ Re-analyzed {done} grievances up to #{written_up_to} ({done / elapsed:.0f} rows/s)")
+
+        # Finished: the next run starts from the beginning again
+        if os.path.exists(CHECKPOINT_PATH):
+            os.remove(CHECKPOINT_PATH)
+
+        elapsed = time.perf_counter() - started
+        done = updated + corrected_kept
+        rate = done / elapsed if elapsed else 0
+        print(f"\n✅ Re-analysis complete! {done} grievances in {elapsed:.1f}s ({rate:.0f} rows/s)")
+        if corrected_kept:
+            print(f"  ℹ️ {corrected_kept} grievances with admin category corrections kept their category")
+        if skipped:
+            print(f"  ℹ️ {skipped} grievances changed while being analyzed and were left as they are; re-run to pick them up")
+        if failed:
+            print(f"  ⚠️ {failed} grievances had too little text to analyze")
+        if updated:
+            print("  → Run detect_hotspots.py to refresh hotspots for the new categories")
+    finally:
+        schemes_db.close()
+        conn.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-analyze stored grievances with the current analyzer")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Grievances per chunk")
+    parser.add_argument("--force", action="store_true", help="Re-analyze grievances already at the current version")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint of an unfinished run")
+    args = parser.parse_args()
+
+    print("🧠 Re-analyzing grievances...\n")
+    reanalyze_grievances(args.workers, args.chunk_size, args.force, args.restart)
@@ -0,0 +1,119 @@
+"""
+Database Migration: Add ward columns and (re)assign wards to all grievances
+Run after the ward boundary file (WARD_BOUNDARIES_PATH) changes. Rows whose
+ward_version differs from the current boundary file are read in keyset
+chunks, located in parallel worker processes (each builds its own STRtree
+once), and written back by this process with executemany. Interrupted runs
+resume where they stopped because finished rows carry the new version.
+
+    cd backend && python reassign_wards.py [workers] [chunk_size]
+"""
+
+import sqlite3
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from app import wards
+
+# Database path
+DB_PATH = os.path.join(os.path.dirname(__file__), "grievance.db")
+
+CHUNK_SIZE = 5000
+
+_worker_index = None
+
+def add_ward_columns(cursor):
+    """Add ward_id, ward_name and ward_version columns (and index) if missing"""
+    cursor.execute("PRAGMA table_info(grievances)")
+    columns = [col[1] for col in cursor.fetchall()]
+    for column in ("ward_id", "ward_name", "ward_version"):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE grievances ADD COLUMN {column} VARCHAR")
+            print(f"  ✓ Added {column} column")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_grievances_ward_id ON grievances (ward_id)")
+
+def _init_worker(path):
+    """Load the boundary polygons once per worker process"""
+    global _worker_index
+    _worker_index = wards.WardIndex.from_geojson(path)
+
+def _assign_chunk(rows):
+    """Locate a chunk of (id, lat, lon) rows; returns UPDATE parameters"""
+    assignments = _worker_index.assign_many([(lat, lon) for _, lat, lon in rows])
+    return [
+        (ward_id, ward_name, _worker_index.version, gid)
+        for (gid, _, _), (ward_id, ward_name) in zip(rows, assignments)
+    ]
+
+def reassign_wards(workers=None, chunk_size=CHUNK_SIZE):
+    """Assign every stale grievance to the ward polygon containing it"""
+    if not os.path.exists(wards.WARD_BOUNDARIES_PATH):
+        print(f"❌ Ward boundary file not found: {wards.WARD_BOUNDARIES_PATH}")
+        return
+
+    version = wards.WardIndex.from_geojson(wards.WARD_BOUNDARIES_PATH).version
+    workers = workers or os.cpu_count() or 1
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cursor = conn.cursor()
+        add_ward_columns(cursor)
+        conn.commit()
+
+        print(f"  Boundaries version {version}, {workers} workers, chunks of {chunk_size}")
+        started = time.perf_counter()
+        last_id = 0
+        updated = 0
+        exhausted = False
+        pending = set()
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(wards.WARD_BOUNDARIES_PATH,)
+        ) as pool:
+            while pending or not exhausted:
+                # Keep a bounded number of chunks in flight
+                while not exhausted and len(pending) < workers * 2:
+                    cursor.execute(
+                        """SELECT id, latitude, longitude FROM grievances
+                           WHERE id > ? AND latitude IS NOT NULL AND longitude IS NOT NULL
+                           AND (ward_version IS NULL OR ward_version != ?)
+                           ORDER BY id LIMIT ?""",
+                        (last_id, version, chunk_size)
+                    )
+                    rows = cursor.fetchall()
+                    if not rows:
+                        exhausted = True
+                        break
+                    last_id = rows[-1][0]
+                    pending.add(pool.submit(_assign_chunk, rows))
+
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    params = future.result()
+                    # SQLite has a single writer, so all writes stay in this process
+                    cursor.executemany(
+                        "UPDATE grievances SET ward_id = ?, ward_name = ?, ward_version = ? WHERE id = ?",
+                        params
+                    )
+                    conn.commit()
+                    updated += len(params)
+                print(f"  ✓ Reassigned {updated} grievances (read up to #{last_id})")
+
+        elapsed = time.perf_counter() - started
+        rate = updated / elapsed if elapsed else 0
+        print(f"\n✅ Ward reassignment complete! {updated} grievances in {elapsed:.1f}s ({rate:.0f} rows/s)")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    print("🗺️ Reassigning grievances to wards...\n")
+    reassign_wards(
+        int(sys.argv[1]) if len(sys.argv) > 1 else None,
+        int(sys.argv[2]) if len(sys.argv) > 2 else CHUNK_SIZE
+    )
@@ -0,0 +1,18 @@
+"""
+Rebuild the server-side map cluster pyramid from existing grievances.
+Run once after upgrading, or after bulk coordinate changes:
+
+    cd backend && python rebuild_map_clusters.py
+"""
+
+from app import models, database, map_clusters
+
+if __name__ == "__main__":
+    models.Base.metadata.create_all(bind=database.engine)
+    db = database.SessionLocal()
+    try:
+        print("🗺️ Rebuilding map cluster pyramid...")
+        placed = map_clusters.rebuild_pyramid(db)
+        print(f"✅ Aggregated {placed} grievances into zoom levels 0-{map_clusters.MAX_CLUSTER_ZOOM}")
+    finally:
+        db.close()
@@ -0,0 +1,33 @@
+"""
+Rebuild the precomputed scheme suggestions per category and location.
+Run after bulk scheme imports (the admin API rebuilds after each change);
+only rows affected by schemes changed since the last build are recomputed
+unless --full is given:
+
+    cd backend && python rebuild_scheme_recommendations.py [--full]
+"""
+
+import argparse
+import time
+
+from app import models, database, recommendations
+from app.ml_engine import analyzer
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild precomputed scheme recommendations")
+    parser.add_argument("--full", action="store_true", help="Recompute every row")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=database.engine)
+    db = database.SessionLocal()
+    try:
+        print("🏛️ Rebuilding scheme recommendations...")
+        started = time.perf_counter()
+        version, written = recommendations.rebuild(db, [*analyzer.categories, "General"], full=args.full)
+        elapsed = time.perf_counter() - started
+        if version is None:
+            print(f"✅ Up to date, no suggestion changed ({elapsed:.2f}s)")
+        else:
+            print(f"✅ Build {version}: {written} rows updated in {elapsed:.2f}s")
+    finally:
+        db.close()
@@ -1,7 +1,8 @@
 """
-Test script for Admin Status Update API
+Test script for Admin Status Update and Scheme APIs
 
-This script tests the new admin endpoint for updating grievance status.
+This script tests the admin endpoints for updating grievance status and
+for editing welfare schemes.
 Run this after starting the backend server.
 
 Usage:
@@ -10,6 +11,7 @@ Usage:
 
 import requests
 import json
+from datetime import datetime
 
 API_BASE_URL = "http://127.0.0.1:8000"
 
@@ -146,5 +148,73 @@ def test_update_status():
     print('  {"status": "In Progress"}')
     print("=" * 60)
 
+def test_scheme_recommendations():
+    """Test that scheme edits rebuild the precomputed suggestions"""
+    print("=" * 60)
+    print("Testing Scheme Edits and Suggestion Rebuilds")
+    print("=" * 60)
+    
+    name = f"Test Health Scheme {datetime.now().strftime('%Y%m%d%H%M%S')}"
+    
+    def suggested(state):
+        response = requests.get(
+            f"{API_BASE_URL}/admin/scheme-recommendations",
+            params={"category": "Healthcare", "state": state}
+        )
+        response.raise_for_status()
+        return response.json().get("preview", [])
+    
+    def save(state):
+        response = requests.post(f"{API_BASE_URL}/admin/schemes", json={
+            "name": name,
+            "description": "Scheme created by test_admin_api.py",
+            "domain": "Healthcare",
+            "state": state,
+            "rank": -1
+        })
+        response.raise_for_status()
+        return response.json()
+    
+    results = []
+    
+    print("\n1. Adding a Karnataka scheme...")
+    try:
+        saved = save("Karnataka")
+        scheme_id = saved["scheme"]["id"]
+        print(f"✓ Saved scheme ID {scheme_id}, build {saved['build_version']}")
+        results.append(name in suggested("Karnataka")[:1])
+        print(f"  {'✓' if results[-1] else '❌'} Suggested first for Healthcare in Karnataka")
+    except requests.exceptions.ConnectionError:
+        print("❌ Cannot connect to backend. Please ensure it's running on http://127.0.0.1:8000")
+        return False
+    except Exception as e:
+        print(f"❌ Error adding scheme: {e}")
+        return False
+    
+    print("\n2. Moving the scheme to Kerala...")
+    try:
+        save("Kerala")
+        results.append(name not in suggested("Karnataka") and name in suggested("Kerala"))
+        print(f"  {'✓' if results[-1] else '❌'} Suggestions follow the scheme to its new state")
+    except Exception as e:
+        print(f"❌ Error moving scheme: {e}")
+        results.append(False)
+    
+    print("\n3. Retiring the scheme...")
+    try:
+        response = requests.delete(f"{API_BASE_URL}/admin/schemes/{scheme_id}")
+        response.raise_for_status()
+        results.append(name not in suggested("Kerala"))
+        print(f"  {'✓' if results[-1] else '❌'} Retired scheme is no longer suggested")
+    except Exception as e:
+        print(f"❌ Error retiring scheme: {e}")
+        results.append(False)
+    
+    print("\n" + "=" * 60)
+    print("✓ All tests completed!" if all(results) else "❌ Some checks failed. Check the output above.")
+    print("=" * 60)
+    return all(results)
+
 if __name__ == "__main__":
     test_update_status()
+    test_scheme_recommendations()
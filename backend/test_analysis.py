@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Test script for the analysis and geo building blocks
+
+Checks behaviour that needs no running server: keyword analysis, fuzzy
+correction, stored explanations, the analysis cache, ward assignment,
+hotspot and incident clustering. Rows live in an in-memory SQLite
+database; endpoint functions are called directly with its session.
+Run from the backend directory: python test_analysis.py
+"""
+
+import json
+import os
+import tempfile
+import shutil
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import ml_engine, models
+
+def print_header(text):
+    """Print formatted header"""
+    print(f"\n{'='*70}")
+    print(f"  {text}")
+    print(f"{'='*70}\n")
+
+def check(label, ok, detail=""):
+    """Print one check and return its result"""
+    print(f"  {'✅' if ok else '❌'} {label}{f' ({detail})' if detail else ''}")
+    return ok
+
+def memory_session():
+    """Session on an empty in-memory database with every table created"""
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+def test_fuzzy_real_words():
+    """Test that real words are never corrected into keywords"""
+    print_header("1. TESTING FUZZY CORRECTION")
+
+    results = []
+    if "ANALYZER_FUZZY_MAX_DISTANCE" not in os.environ:
+        results.append(check("Fuzzy correction is off by default", ml_engine.analyzer.refresh().fuzzy is None))
+
+    # Build an analyzer with correction switched on, as a deployment would opt in
+    default_distance = ml_engine.ANALYZER_FUZZY_MAX_DISTANCE
+    ml_engine.ANALYZER_FUZZY_MAX_DISTANCE = 2
+    try:
+        analyzer = ml_engine.GrievanceAnalyzer()
+    finally:
+        ml_engine.ANALYZER_FUZZY_MAX_DISTANCE = default_distance
+
+    # Real words one or two edits away from a keyword: (text, category, priority)
+    near_misses = [
+        ("There is public outrage over the new parking rules in our colony", "General", "Medium"),
+        ("A dancer group practises loudly every night near our houses", "General", "Medium"),
+        ("The builder will sever the old wooden fence next week", "General", "Medium"),
+        ("She teaches children every weekend in the community hall", "General", "Medium"),
+        ("The bride and her family asked for more chairs at the hall", "General", "Medium"),
+        ("Our garage door is jammed and the landlord does not respond", "General", "Medium"),
+    ]
+    for text, category, priority in near_misses:
+        result = analyzer.analyze(text)
+        results.append(check(
+            f"'{text[:40]}...' stays {category}/{priority}",
+            (result["category"], result["priority"]) == (category, priority),
+            f"got {result['category']}/{result['priority']}, "
+            f"fuzzy {result['analysis_explanation'].get('fuzzy_matches')}"
+        ))
+
+    # Genuine misspellings are still corrected
+    for text, category in [
+        ("No electrisity since morning in our block, please fix", "Electricity"),
+        ("The hospitl has no doctors on duty at night", "Healthcare"),
+    ]:
+        result = analyzer.analyze(text)
+        results.append(check(f"'{text[:40]}...' is {category}", result["category"] == category, result["category"]))
+
+    # Priority terms are never fuzzed
+    result = analyzer.analyze("Water supply pipe is leaking, an urgnet repair is needed")
+    results.append(check("Misspelled priority term does not raise priority", result["priority"] == "Medium", result["priority"]))
+
+    return all(results)
+
+def test_hotspots():
+    """Test that hotspots only come from precisely located grievances"""
+    print_header("2. TESTING HOTSPOT DETECTION")
+    from app import hotspots
+    
+    db = memory_session()
+    # Eight grievances geocoded to the city centre from their text, five
+    # picked on the map a few metres apart, and three picked before
+    # geocode_confidence was recorded
+    for i in range(8):
+        db.add(models.Grievance(title="Garbage", description="Garbage not collected", category="Sanitation",
+                                priority="Medium", latitude=12.9716, longitude=77.5946, geocode_confidence=0.9))
+    for i in range(5):
+        db.add(models.Grievance(title="Garbage", description="Garbage not collected", category="Sanitation",
+                                priority="Medium", latitude=12.9300 + i * 1e-4, longitude=77.6100, geocode_confidence=1.0))
+    for i in range(3):
+        db.add(models.Grievance(title="Drain", description="Drain overflowing", category="Water Supply",
+                                priority="Medium", latitude=12.9500, longitude=77.6000, geocode_confidence=None))
+    db.commit()
+    
+    found = hotspots.detect_hotspots(db, min_samples=5)
+    results = [
+        check("Only the picked cluster is a hotspot", [h.member_count for h in found] == [5],
+              [(h.category, h.member_count) for h in found]),
+        check("Picked coordinates without a confidence count as precise",
+              len(hotspots.detect_hotspots(db, min_samples=3)) == 2),
+    ]
+    
+    # Identical points are clustered as one weighted point
+    labels = hotspots.dbscan([12.97] * 50000, [77.59] * 50000, eps_km=0.5, min_samples=5)
+    results.append(check("50,000 identical points form one cluster", set(labels.tolist()) == {0}))
+    db.close()
+    
+    return all(results)
+
+def test_wards():
+    """Test boundary points and reloading of the ward boundary file"""
+    print_header("3. TESTING WARD ASSIGNMENT")
+    from app import wards
+
+    def write_boundaries(path, wards_by_box):
+        features = [
+            {"type": "Feature", "properties": {"ward_id": ward_id, "ward_name": f"Ward {ward_id}"},
+             "geometry": {"type": "Polygon", "coordinates": [[
+                 [west, south], [east, south], [east, north], [west, north], [west, south]]]}}
+            for ward_id, (west, south, east, north) in wards_by_box.items()
+        ]
+        with open(path, "w") as f:
+            json.dump({"type": "FeatureCollection", "features": features}, f)
+
+    default_path, default_interval = wards.WARD_BOUNDARIES_PATH, wards.WARD_BOUNDARIES_CHECK_INTERVAL
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "wards.geojson")
+        # Two wards side by side, sharing the edge at longitude 77.6
+        write_boundaries(path, {"1": (77.5, 12.9, 77.6, 13.0), "2": (77.6, 12.9, 77.7, 13.0)})
+        wards.WARD_BOUNDARIES_PATH, wards.WARD_BOUNDARIES_CHECK_INTERVAL = path, 0
+        try:
+            index = wards.reload_ward_index()
+            results = [
+                check("Point inside a ward", wards.assign_ward(12.95, 77.55)[0] == "1"),
+                check("Point on an outer edge", wards.assign_ward(12.9, 77.55)[0] == "1"),
+                check("Point on a shared edge goes to one ward", wards.assign_ward(12.95, 77.6)[0] == "1"),
+                check("Point outside every ward", wards.assign_ward(12.8, 77.55)[0] is None),
+            ]
+
+            # Replacing the file is picked up without an explicit reload
+            write_boundaries(path, {"3": (77.5, 12.9, 77.7, 13.0)})
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            ward_id, _, version = wards.assign_ward(12.95, 77.55)
+            results.append(check("Changed boundary file is reloaded", ward_id == "3" and version != index.version,
+                                 f"ward {ward_id}, version {version}"))
+
+            # A broken file keeps the previous boundaries
+            with open(path, "w") as f:
+                f.write("{not json")
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+            results.append(check("Broken boundary file keeps the previous wards",
+                                 wards.assign_ward(12.95, 77.55)[0] == "3"))
+
+            os.remove(path)
+            results.append(check("Removed boundary file disables assignment",
+                                 wards.assign_ward(12.95, 77.55) == (None, None, None)))
+        finally:
+            wards.WARD_BOUNDARIES_PATH, wards.WARD_BOUNDARIES_CHECK_INTERVAL = default_path, default_interval
+            wards.reload_ward_index()
+
+    return all(results)
+
+def test_map_clusters():
+    """Test incremental cluster pyramid updates against a full rebuild"""
+    print_header("4. TESTING MAP CLUSTER UPDATES")
+    from app import map_clusters
+
+    def cells(db):
+        return sorted(
+            (c.zoom, c.cell_x, c.cell_y, c.status, c.count, round(c.lat_sum, 6), round(c.lon_sum, 6))
+            for c in db.query(models.MapClusterCell).all()
+        )
+
+    db = memory_session()
+    points = [(12.9716, 77.5946), (12.9720, 77.5950), (28.7041, 77.1025)]
+    grievances = []
+    for lat, lon in points:
+        grievance = models.Grievance(title="Pothole", description="Pothole on the main road", category="Roads",
+                                     priority="Medium", latitude=lat, longitude=lon)
+        db.add(grievance)
+        map_clusters.record_grievance(db, lat, lon, "Pending")
+        grievances.append(grievance)
+    db.commit()
+
+    top = db.query(models.MapClusterCell).filter_by(zoom=0, status="Pending").one()
+    results = [check("Points in one cell add up", top.count == 3, f"count {top.count}")]
+
+    map_clusters.move_grievance(db, *points[2], "Pending", "Resolved")
+    grievances[2].status = "Resolved"
+    map_clusters.remove_grievance(db, *points[1], "Pending")
+    db.delete(grievances[1])
+    db.commit()
+    incremental = cells(db)
+    map_clusters.rebuild_pyramid(db)
+    results.append(check("Incremental updates match a rebuild", incremental == cells(db)))
+    results.append(check("Emptied cells are deleted",
+                         db.query(models.MapClusterCell).filter(models.MapClusterCell.count <= 0).count() == 0))
+    db.close()
+
+    return all(results)
+
+def test_scheme_reference_rows():
+    """Test that suggested scheme names map to one scheme row each"""
+    print_header("5. TESTING SCHEME REFERENCE ROWS")
+    from app import grievance_schemes
+
+    db = memory_session()
+    db.add(models.Scheme(name="Ayushman Bharat", description="Health insurance", domain="Healthcare"))
+    db.commit()
+    existing = db.query(models.Scheme).filter_by(name="Ayushman Bharat").one().id
+
+    first = grievance_schemes.scheme_ids(db, ["Ayushman Bharat", "Jal Jeevan Mission", "Jal Jeevan Mission"])
+    db.commit()
+    second = grievance_schemes.scheme_ids(db, ["Jal Jeevan Mission", "Ayushman Bharat"])
+    reference = db.query(models.Scheme).filter_by(name="Jal Jeevan Mission").one()
+    results = [
+        check("Existing scheme is reused", first["Ayushman Bharat"] == existing),
+        check("Unknown name gets one reference row",
+              reference.description == grievance_schemes.REFERENCE_DESCRIPTION and reference.domain is None),
+        check("Repeated lookups return the same ids", first == second, second),
+        check("No duplicate schemes", db.query(models.Scheme).count() == 2),
+    ]
+    db.close()
+
+    return all(results)
+
+def test_incident_status():
+    """Test that an incident's status reaches every member grievance"""
+    print_header("6. TESTING INCIDENT STATUS PROPAGATION")
+    from app import incidents, main_demo, map_clusters, schemas
+
+    db = memory_session()
+    text = "Water pipe burst near the bus stand, water flooding the whole road since morning"
+    reports = [
+        (text, "Pending"),
+        (text.replace("since morning", "since this morning"), "In Progress"),
+        (text + ", please help", "Pending"),
+        ("Streetlight outside the library has not worked for a week", "Pending"),
+    ]
+    for description, status in reports:
+        db.add(models.Grievance(title=description[:30], description=description, category="Water Supply",
+                                priority="High", status=status, latitude=12.9352, longitude=77.6245,
+                                location="Koramangala, Bangalore", created_at=datetime.utcnow()))
+        map_clusters.record_grievance(db, 12.9352, 77.6245, status)
+    db.commit()
+
+    found, _, _ = incidents.detect_incidents(db)
+    results = [check("Near-duplicates form one incident", [i.member_count for i in found] == [3],
+                     [i.member_count for i in found])]
+    if len(found) != 1:
+        db.close()
+        return False
+
+    response = main_demo.update_incident_status(found[0].id, schemas.GrievanceStatusUpdate(status="Resolved"), db)
+    members = db.query(models.Grievance).filter(models.Grievance.incident_id == found[0].id).all()
+    outsider = db.query(models.Grievance).filter(models.Grievance.incident_id.is_(None)).one()
+    results += [
+        check("Every member is resolved", all(g.status == "Resolved" for g in members)),
+        check("Each changed member gets a timeline entry",
+              all(g.status_history and f"incident #{found[0].id}" in g.status_history[-1]["action"] for g in members)),
+        check("Response counts the updated members", response["updated_count"] == 3, response["updated_count"]),
+        check("Other grievances are untouched", outsider.status == "Pending"),
+        check("Incident keeps the status", db.get(models.Incident, found[0].id).status == "Resolved"),
+    ]
+
+    # Resolving again changes nothing
+    response = main_demo.update_incident_status(found[0].id, schemas.GrievanceStatusUpdate(status="Resolved"), db)
+    results.append(check("Repeating the update is a no-op", response["updated_count"] == 0))
+
+    resolved = db.query(models.MapClusterCell).filter_by(zoom=0, status="Resolved").one()
+    results.append(check("Map clusters follow the new status", resolved.count == 3, resolved.count))
+    db.close()
+
+    return all(results)
+
+def test_explanation_round_trip():
+    """Test that stored explanation facts expand to the reported explanation"""
+    print_header("7. TESTING STORED EXPLANATIONS")
+    from app.explanations import compact, expand
+    from app.learner import OnlineCategoryLearner
+
+    default_distance = ml_engine.ANALYZER_FUZZY_MAX_DISTANCE
+    ml_engine.ANALYZER_FUZZY_MAX_DISTANCE = 2
+    try:
+        fuzzy_analyzer = ml_engine.GrievanceAnalyzer()
+    finally:
+        ml_engine.ANALYZER_FUZZY_MAX_DISTANCE = default_distance
+
+    results = []
+    with tempfile.TemporaryDirectory() as model_dir:
+        learner = OnlineCategoryLearner(model_dir=model_dir)
+        cases = [
+            ("High priority", ml_engine.analyzer, "Water supply pipe burst, urgent emergency repair needed now"),
+            ("Low priority", ml_engine.analyzer, "Please consider adding a bench in the park when possible, minor request"),
+            ("No keywords", ml_engine.analyzer, "Nothing in this text names any department at all"),
+            ("Hindi", ml_engine.analyzer, "हमारे इलाके में पिछले तीन दिनों से पानी नहीं आ रहा है"),
+            ("Fuzzy match", fuzzy_analyzer, "No electrisity since morning in our block, please fix"),
+            ("Learner", learner, "The hospital has no doctors on duty at night"),
+        ]
+        for label, analyzer, text in cases:
+            result = analyzer.analyze(text)
+            expanded = expand(compact(result))
+            differences = sorted(
+                key for key in set(expanded) | set(result["analysis_explanation"])
+                if expanded.get(key) != result["analysis_explanation"].get(key)
+            )
+            results.append(check(f"{label}: expand(compact(result)) is the reported explanation",
+                                 not differences, differences))
+
+    return all(results)
+
+def test_analysis_cache():
+    """Test cache hits, caller copies and invalidation on a keyword table edit"""
+    print_header("8. TESTING ANALYSIS CACHE")
+    from app.analysis_cache import AnalysisCache
+
+    default_interval = ml_engine.ANALYZER_CONFIG_CHECK_INTERVAL
+    ml_engine.ANALYZER_CONFIG_CHECK_INTERVAL = 0
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            config_path = os.path.join(tmp, "analyzer_config.json")
+            shutil.copy(ml_engine.ANALYZER_CONFIG_PATH, config_path)
+            cache = AnalysisCache(ml_engine.GrievanceAnalyzer(config_path=config_path))
+            text = "Stray dogs are chasing children near the park every evening"
+
+            first = cache.analyze(text)
+            first["suggested_schemes"].append("Caller's own scheme")
+            first["category"] = "Changed by the caller"
+            second = cache.analyze("  STRAY dogs are chasing children near the park every evening ")
+            results = [
+                check("Same text after normalization is a hit", (cache.hits, cache.misses) == (1, 1),
+                      f"{cache.hits} hits, {cache.misses} misses"),
+                check("Callers cannot change the cached result",
+                      "Caller's own scheme" not in second["suggested_schemes"]
+                      and second["category"] != "Changed by the caller"),
+            ]
+
+            # Teach the keyword tables a new word: cached results are stale
+            with open(config_path, encoding="utf-8") as f:
+                config = json.load(f)
+            category = next(iter(config["categories"]))
+            config["categories"][category].append("stray dogs")
+            with open(config_path, "w", encoding="utf-8") as f:
+                json.dump(config, f, ensure_ascii=False)
+            stat = os.stat(config_path)
+            os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+            third = cache.analyze(text)
+            stats = cache.stats()
+            results += [
+                check("Edited keyword tables invalidate the cache",
+                      stats["invalidations"] == 1 and stats["misses"] == 2, stats),
+                check("Result reflects the edit", second["category"] != category == third["category"],
+                      f"{second['category']} -> {third['category']}"),
+                check("Next lookup is a hit again", cache.analyze(text)["category"] == category and cache.hits == 2),
+            ]
+    finally:
+        ml_engine.ANALYZER_CONFIG_CHECK_INTERVAL = default_interval
+
+    return all(results)
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*70)
+    print(" CITIZEN GRIEVANCE & WELFARE INTELLIGENCE SYSTEM - ANALYSIS TEST SUITE")
+    print("="*70)
+    print(f"\nTest Start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+    test_results = {
+        "Fuzzy Real Words": test_fuzzy_real_words(),
+        "Hotspots": test_hotspots(),
+        "Wards": test_wards(),
+        "Map Clusters": test_map_clusters(),
+        "Scheme Reference Rows": test_scheme_reference_rows(),
+        "Incident Status": test_incident_status(),
+        "Explanation Round Trip": test_explanation_round_trip(),
+        "Analysis Cache": test_analysis_cache(),
+    }
+
+    # Summary
+    print_header("TEST SUMMARY")
+    for test_name, result in test_results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{test_name:.<50} {status}")
+
+    total_passed = sum(1 for r in test_results.values() if r)
+    print(f"\nTotal: {total_passed}/{len(test_results)} tests passed")
+
+    if total_passed == len(test_results):
+        print("\n✅ All tests passed!")
+    else:
+        print("\n❌ Some tests failed. Check the output above.")
+
+if __name__ == "__main__":
+    main()
@@ -86,16 +86,108 @@ def test_get_grievances():
     
     return all(results)
 
+def test_unknown_filters():
+    """Test filtering on names that have no code (empty result, not an error)"""
+    print_header("4. TESTING UNKNOWN FILTER VALUES")
+    
+    tests = [
+        ("Unknown priority", f"{BASE_URL}/grievances/?priority=urgent"),
+        ("Unknown category", f"{BASE_URL}/grievances/?category=Bogus%20Cat"),
+        ("Unknown status", f"{BASE_URL}/stats/by-city?status=Closed"),
+    ]
+    
+    results = []
+    for label, url in tests:
+        print(f"\n--- {label} ---")
+        response = requests.get(url)
+        print_response(response, f"GET {url.replace(BASE_URL, '')}")
+        data = response.json() if response.status_code == 200 else None
+        results.append(data is not None and not data.get("grievances", data.get("by_city")))
+    
+    return all(results)
+
+def test_location_confidence():
+    """Test that only picked coordinates are stored as precise"""
+    print_header("5. TESTING LOCATION CONFIDENCE")
+    
+    submissions = [
+        ("Place chosen by name", {"location": "Koramangala, Bengaluru Urban, Karnataka"}, lambda c: c is not None and c < 1.0),
+        ("Point picked on the map", {"location": "Near the bus stop", "latitude": 12.9401, "longitude": 77.6213}, lambda c: c == 1.0),
+    ]
+    
+    created = []
+    for label, location, _ in submissions:
+        response = requests.post(f"{BASE_URL}/grievances/", json={
+            "title": "Streetlight not working",
+            "description": "The streetlight outside our house has not worked for a week now.",
+            **location
+        })
+        created.append((label, response.json().get("id") if response.status_code == 200 else None))
+    
+    stored = {g["id"]: g for g in requests.get(f"{BASE_URL}/grievances/?limit=1000").json().get("grievances", [])}
+    results = []
+    for (label, grievance_id), (_, _, expected) in zip(created, submissions):
+        confidence = stored.get(grievance_id, {}).get("geocode_confidence")
+        ok = expected(confidence)
+        print(f"{'✅' if ok else '❌'} {label}: geocode_confidence = {confidence}")
+        results.append(ok)
+    
+    return all(results)
+
+def test_coded_columns():
+    """Test that coded category, priority and status columns filter and update by name"""
+    print_header("6. TESTING CODED COLUMNS")
+    
+    response = requests.post(f"{BASE_URL}/grievances/", json={
+        "title": "No water for three days",
+        "description": "There has been no water supply in our street for three days, the tap is dry.",
+        "location": "Koramangala, Bangalore"
+    })
+    created = response.json() if response.status_code == 200 else {}
+    grievance_id, category, priority = created.get("id"), created.get("category"), created.get("priority")
+    print(f"Created grievance #{grievance_id}: {category} / {priority}")
+    
+    def listed(**filters):
+        response = requests.get(f"{BASE_URL}/grievances/", params=filters)
+        return grievance_id in [g["id"] for g in response.json().get("grievances", [])]
+    
+    def stored():
+        return requests.get(f"{BASE_URL}/grievances/{grievance_id}").json()
+    
+    checks = [
+        ("Filter by category", grievance_id is not None and listed(category=category)),
+        ("Filter by category in another case", listed(category=str(category).lower())),
+        ("Filter by priority", listed(priority=priority)),
+    ]
+    
+    response = requests.patch(f"{BASE_URL}/grievances/{grievance_id}/status", json={"status": "In Progress"})
+    checks.append(("Status update is stored", response.status_code == 200 and stored().get("status") == "In Progress"))
+    
+    new_category = "Healthcare" if category != "Healthcare" else "Education"
+    response = requests.patch(f"{BASE_URL}/grievances/{grievance_id}/category", json={"category": new_category})
+    checks += [
+        ("Category correction is stored", response.status_code == 200 and stored().get("category") == new_category),
+        ("Corrected category matches its filter", listed(category=new_category)),
+        ("Old category no longer matches", not listed(category=category)),
+    ]
+    
+    response = requests.patch(f"{BASE_URL}/grievances/{grievance_id}/status", json={"status": "Closed"})
+    checks.append(("Unknown status is rejected", response.status_code == 400 and stored().get("status") == "In Progress"))
+    
+    for label, ok in checks:
+        print(f"{'✅' if ok else '❌'} {label}")
+    return all(ok for _, ok in checks)
+
 def test_statistics():
     """Test statistics endpoint"""
-    print_header("4. TESTING STATISTICS")
+    print_header("7. TESTING STATISTICS")
     response = requests.get(f"{BASE_URL}/stats/")
     print_response(response, "GET /stats/")
     return response.status_code == 200
 
 def test_validation():
     """Test input validation"""
-    print_header("5. TESTING INPUT VALIDATION")
+    print_header("8. TESTING INPUT VALIDATION")
     
     invalid_grievances = [
         {
@@ -145,6 +237,9 @@ def main():
         "Root Endpoint": test_root(),
         "Create Grievance": test_create_grievance(),
         "Get Grievances": test_get_grievances(),
+        "Unknown Filters": test_unknown_filters(),
+        "Location Confidence": test_location_confidence(),
+        "Coded Columns": test_coded_columns(),
         "Statistics": test_statistics(),
         "Validation": test_validation(),
     }
@@ -0,0 +1,82 @@
+"""
+Map Rendering Benchmark
+Compares the per-marker folium map with the fast client-side map at
+1k, 10k and 100k points: time to build the map, time to render its HTML,
+and the size of the HTML shipped to the browser.
+
+    python benchmarks/bench_map_render.py
+    python benchmarks/bench_map_render.py --sizes 1000 10000 --legacy-max 10000
+"""
+
+import argparse
+import random
+import sys
+import os
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import folium
+from components.map_view import (
+    STATUS_COLORS, create_grievance_map, create_fast_grievance_map,
+    get_fast_map_points, compute_data_version
+)
+
+API_BASE_URL = "http://127.0.0.1:8000"
+
+def make_grievances(n, seed=42):
+    """Synthetic grievances spread over India"""
+    rng = random.Random(seed)
+    statuses = list(STATUS_COLORS)
+    return [
+        {
+            "id": i + 1,
+            "title": f"Synthetic grievance {i + 1} about local services",
+            "status": rng.choice(statuses),
+            "category": rng.choice(["Sanitation", "Water Supply", "Electricity", "Roads"]),
+            "priority": rng.choice(["High", "Medium", "Low"]),
+            "location": "Benchmark",
+            "latitude": rng.uniform(8.0, 34.0),
+            "longitude": rng.uniform(69.0, 92.0)
+        }
+        for i in range(n)
+    ]
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+def bench_legacy(grievances):
+    m, build = timed(lambda: create_grievance_map(grievances, use_clustering=True))
+    html, render = timed(lambda: folium.Figure().add_child(m).render())
+    return build, render, len(html)
+
+def bench_fast(grievances):
+    (rows, statuses), prepare = timed(lambda: get_fast_map_points(grievances))
+    _, version = timed(lambda: compute_data_version(rows))
+    m, build = timed(lambda: create_fast_grievance_map(rows, statuses, API_BASE_URL))
+    html, render = timed(lambda: folium.Figure().add_child(m).render())
+    return prepare + build, render, len(html), version
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark grievance map rendering")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--legacy-max", type=int, default=100000,
+                        help="Skip the per-marker map above this many points")
+    args = parser.parse_args()
+
+    print(f"{'points':>8} | {'mode':<7} | {'build s':>8} | {'render s':>8} | {'total s':>8} | {'HTML MB':>8}")
+    print("-" * 62)
+    for n in args.sizes:
+        grievances = make_grievances(n)
+        if n <= args.legacy_max:
+            build, render, size = bench_legacy(grievances)
+            print(f"{n:>8} | {'legacy':<7} | {build:>8.2f} | {render:>8.2f} | {build + render:>8.2f} | {size / 1e6:>8.2f}")
+        build, render, size, version = bench_fast(grievances)
+        print(f"{n:>8} | {'fast':<7} | {build:>8.2f} | {render:>8.2f} | {build + render:>8.2f} | {size / 1e6:>8.2f}")
+        print(f"{'':>8}   cache hit costs only the data version hash: {version * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
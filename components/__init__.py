@@ -1,5 +1,5 @@
 # Components package
 from .timeline import render_timeline
-from .map_view import render_grievance_map, create_grievance_map
+from .map_view import render_grievance_map, create_grievance_map, render_cluster_map, render_heatmap
 
 __all__ = ['render_timeline']
@@ -7,22 +7,27 @@ import folium
 from streamlit_folium import st_folium
 import streamlit as st
 
-def render_location_picker(default_location=(20.5937, 78.9629), zoom=5):
+def render_location_picker(default_location=(20.5937, 78.9629), zoom=5, area=None):
     """
     Render an interactive map for location picking
     
     Args:
         default_location: Tuple of (lat, lon) for initial map center
         zoom: Initial zoom level
+        area: Optional (lat, lon) of a place chosen by name; the map centres
+            on it, but it is not a picked location
     
     Returns:
         Tuple of (latitude, longitude) if location clicked, else None
     """
     
-    # Create map centered on India or user's last location
+    # Create map centered on India, the chosen area or user's last location
     if 'picked_lat' in st.session_state and st.session_state.picked_lat:
         center = (st.session_state.picked_lat, st.session_state.picked_lon)
         zoom = 13
+    elif area:
+        center = area
+        zoom = 12
     else:
         center = default_location
     
@@ -41,6 +46,14 @@ def render_location_picker(default_location=(20.5937, 78.9629), zoom=5):
             icon=folium.Icon(color='red', icon='map-pin', prefix='fa')
         ).add_to(m)
     
+    elif area:
+        folium.Marker(
+            location=list(area),
+            popup="Selected area (approximate)",
+            tooltip="Click map to mark the exact spot",
+            icon=folium.Icon(color='blue', icon='map-marker', prefix='fa')
+        ).add_to(m)
+    
     # Add click instruction
     folium.map.Marker(
         [center[0], center[1]],
@@ -60,10 +73,13 @@ def render_location_picker(default_location=(20.5937, 78.9629), zoom=5):
         returned_objects=["last_clicked"]
     )
     
-    # Check if user clicked on map
-    if map_data and map_data.get("last_clicked"):
-        clicked_lat = map_data["last_clicked"]["lat"]
-        clicked_lon = map_data["last_clicked"]["lng"]
+    # Check if user clicked on map (the map keeps reporting its last click,
+    # so only a click we have not seen yet replaces the picked location)
+    last_clicked = map_data.get("last_clicked") if map_data else None
+    if last_clicked and last_clicked != st.session_state.get('last_map_click'):
+        st.session_state.last_map_click = last_clicked
+        clicked_lat = last_clicked["lat"]
+        clicked_lon = last_clicked["lng"]
         
         # Store in session state
         st.session_state.picked_lat = clicked_lat
@@ -3,10 +3,15 @@ Interactive Map Component
 Displays grievances on an interactive map with color-coded markers
 """
 
+import hashlib
+import json
+import math
 import folium
-from folium.plugins import MarkerCluster
+import requests
+from folium.plugins import MarkerCluster, HeatMap, FastMarkerCluster
 import streamlit as st
-from streamlit_folium import folium_static
+import streamlit.components.v1 as components
+from streamlit_folium import folium_static, st_folium
 from location_utils import get_india_center
 
 # Status color mapping
@@ -25,6 +30,26 @@ STATUS_ICONS = {
     'Rejected': 'times-circle'
 }
 
+# Status legend shown on marker maps
+STATUS_LEGEND_HTML = '''
+<div style="position: fixed; 
+            bottom: 50px; right: 50px; width: 180px; height: auto; 
+            background-color: white; z-index:9999; font-size:14px;
+            border:2px solid grey; border-radius: 5px; padding: 10px">
+    <p style="margin: 0 0 10px 0; font-weight: bold;">Grievance Status</p>
+    <p style="margin: 5px 0;"><i class="fa fa-circle" style="color:red"></i> Pending</p>
+    <p style="margin: 5px 0;"><i class="fa fa-circle" style="color:orange"></i> In Progress</p>
+    <p style="margin: 5px 0;"><i class="fa fa-circle" style="color:green"></i> Resolved</p>
+    <p style="margin: 5px 0;"><i class="fa fa-circle" style="color:gray"></i> Rejected</p>
+</div>
+'''
+
+# Initial viewport for the server-clustered map (min_lon, min_lat, max_lon, max_lat)
+INDIA_BBOX = (68.0, 6.5, 97.5, 37.5)
+
+# Session state key holding the current server-clustered map viewport
+CLUSTER_VIEW_KEY = 'cluster_map_view'
+
 def get_marker_color(status):
     """Get marker color based on grievance status"""
     return STATUS_COLORS.get(status, 'blue')
@@ -130,23 +155,11 @@ def create_grievance_map(grievances, center=None, zoom_start=5, use_clustering=T
         ).add_to(marker_group)
     
     # Add legend
-    legend_html = '''
-    <div style="position: fixed; 
-                bottom: 50px; right: 50px; width: 180px; height: auto; 
-                background-color: white; z-index:9999; font-size:14px;
-                border:2px solid grey; border-radius: 5px; padding: 10px">
-        <p style="margin: 0 0 10px 0; font-weight: bold;">Grievance Status</p>
-        <p style="margin: 5px 0;"><i class="fa fa-circle" style="color:red"></i> Pending</p>
-        <p style="margin: 5px 0;"><i class="fa fa-circle" style="color:orange"></i> In Progress</p>
-        <p style="margin: 5px 0;"><i class="fa fa-circle" style="color:green"></i> Resolved</p>
-        <p style="margin: 5px 0;"><i class="fa fa-circle" style="color:gray"></i> Rejected</p>
-    </div>
-    '''
-    m.get_root().html.add_child(folium.Element(legend_html))
+    m.get_root().html.add_child(folium.Element(STATUS_LEGEND_HTML))
     
     return m
 
-def render_grievance_map(grievances, height=600, use_clustering=True):
+def render_grievance_map(grievances, height=600, use_clustering=True, hotspots=None):
     """
     Render grievance map in Streamlit
     
@@ -154,6 +167,7 @@ def render_grievance_map(grievances, height=600, use_clustering=True):
         grievances: List of grievances with latitude/longitude
         height: Map height in pixels
         use_clustering: Whether to use marker clustering
+        hotspots: Optional hotspots to overlay (from fetch_hotspots)
     """
     if not grievances:
         st.info("📍 No grievances with location data to display on map")
@@ -171,9 +185,476 @@ def render_grievance_map(grievances, height=600, use_clustering=True):
     
     # Create map
     m = create_grievance_map(valid_grievances, use_clustering=use_clustering)
+    if hotspots:
+        add_hotspot_layer(m, hotspots)
     
     # Display map
     folium_static(m, width=None, height=height)
     
     # Show statistics
     st.caption(f"📊 Showing {len(valid_grievances)} grievances on map")
+
+
+# ============ FAST CLIENT-SIDE RENDERING ============
+
+# Marker construction runs in the browser: Python only ships compact
+# [lat, lon, id, status_index] rows, and popups are fetched from the API
+# when a marker is opened instead of being pre-rendered for every point.
+FAST_MARKER_CALLBACK = """
+var statuses = %(statuses)s;
+var apiBase = %(api_base_url)s;
+
+function escapeHtml(value) {
+    return String(value === null || value === undefined ? 'N/A' : value)
+        .replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;').replace(/'/g, '&#39;');
+}
+
+function popupHtml(g, color) {
+    return '<div style="width: 250px; font-family: Arial, sans-serif;">' +
+        '<h4 style="margin: 0 0 10px 0; color: #0066cc;">🆔 #' + escapeHtml(g.id) + '</h4>' +
+        '<p style="margin: 5px 0;"><b>Title:</b><br/>' + escapeHtml((g.title || 'N/A').slice(0, 60)) + '...</p>' +
+        '<p style="margin: 5px 0;"><b>Status:</b> <span style="color: ' + color + '; font-weight: bold;">' +
+            escapeHtml(g.status) + '</span></p>' +
+        '<p style="margin: 5px 0;"><b>Category:</b> ' + escapeHtml(g.category) + '</p>' +
+        '<p style="margin: 5px 0;"><b>Priority:</b> ' + escapeHtml(g.priority) + '</p>' +
+        '<p style="margin: 5px 0;"><b>Location:</b> ' + escapeHtml(g.location) + '</p>' +
+        '</div>';
+}
+
+var callback = function (row) {
+    var status = statuses[row[3]] || ['Unknown', 'blue'];
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: 7, color: status[1], fillColor: status[1], fillOpacity: 0.8, weight: 1
+    });
+    marker.bindTooltip('#' + row[2] + ' - ' + status[0]);
+    marker.bindPopup('Loading grievance #' + row[2] + '...', {maxWidth: 300});
+    var loaded = false;
+    marker.on('popupopen', function (e) {
+        if (loaded) { return; }
+        fetch(apiBase + '/grievances/' + row[2])
+            .then(function (response) {
+                if (!response.ok) { throw new Error(response.status); }
+                return response.json();
+            })
+            .then(function (g) { loaded = true; e.popup.setContent(popupHtml(g, status[1])); })
+            .catch(function () { e.popup.setContent('Could not load grievance #' + row[2]); });
+    });
+    return marker;
+};
+"""
+
+def get_fast_map_points(grievances):
+    """
+    Reduce grievances to compact marker rows for client-side rendering
+    
+    Args:
+        grievances: List of grievance dictionaries with lat, lon fields
+    
+    Returns:
+        Tuple of (rows as [lat, lon, id, status_index], list of status names)
+    """
+    statuses = list(STATUS_COLORS)
+    status_index = {status: i for i, status in enumerate(statuses)}
+    rows = []
+    for g in grievances:
+        lat, lon = g.get('latitude'), g.get('longitude')
+        if lat is None or lon is None:
+            continue
+        status = g.get('status', 'Unknown')
+        if status not in status_index:
+            status_index[status] = len(statuses)
+            statuses.append(status)
+        rows.append([lat, lon, g.get('id'), status_index[status]])
+    return rows, statuses
+
+def compute_data_version(rows):
+    """Hash marker rows so a cached map is reused only while the data is unchanged"""
+    return hashlib.sha1(json.dumps(rows, separators=(',', ':')).encode()).hexdigest()[:16]
+
+def create_fast_grievance_map(rows, statuses, api_base_url, use_clustering=True, center=None, zoom_start=5):
+    """
+    Create a map whose markers are built in the browser from compact rows
+    
+    Args:
+        rows: Marker rows as [lat, lon, id, status_index]
+        statuses: Status names indexed by status_index
+        api_base_url: Backend base URL the browser fetches popups from
+        use_clustering: Whether to cluster markers
+        center: Tuple of (lat, lon) for map center. Defaults to India center
+        zoom_start: Initial zoom level
+    
+    Returns:
+        folium.Map object
+    """
+    if center is None:
+        center = get_india_center()
+    
+    # Canvas rendering keeps tens of thousands of circle markers responsive
+    m = folium.Map(
+        location=center,
+        zoom_start=zoom_start,
+        tiles='OpenStreetMap',
+        control_scale=True,
+        prefer_canvas=True
+    )
+    
+    callback = FAST_MARKER_CALLBACK % {
+        'statuses': json.dumps([[status, get_marker_color(status)] for status in statuses]),
+        'api_base_url': json.dumps(api_base_url.rstrip('/'))
+    }
+    options = {'chunkedLoading': True}
+    if not use_clustering:
+        # Clustering disabled from zoom level 0 keeps the same fast code path
+        options['disableClusteringAtZoom'] = 0
+    FastMarkerCluster(rows, callback=callback, name='Grievances', options=options).add_to(m)
+    
+    m.get_root().html.add_child(folium.Element(STATUS_LEGEND_HTML))
+    return m
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def build_fast_map_html(data_version, filters_key, api_base_url, use_clustering, hotspots_key, _rows, _statuses, _hotspots=None):
+    """
+    Build (or reuse) the HTML for a fast-rendered map
+    
+    Cached on the data version, filters and hotspot set; the underscored
+    arguments are not hashed by Streamlit, so cache lookups stay cheap even
+    for 100k points.
+    
+    Returns:
+        Complete HTML document for the map
+    """
+    m = create_fast_grievance_map(_rows, _statuses, api_base_url, use_clustering=use_clustering)
+    if _hotspots:
+        add_hotspot_layer(m, _hotspots)
+    return folium.Figure().add_child(m).render()
+
+def render_fast_grievance_map(grievances, api_base_url, height=600, use_clustering=True, filters=None, hotspots=None):
+    """
+    Render grievances with client-side marker construction and lazy popups
+    
+    Args:
+        grievances: List of grievances with latitude/longitude
+        api_base_url: Backend base URL for popup details
+        height: Map height in pixels
+        use_clustering: Whether to cluster markers
+        filters: Dict of active filters (part of the cache key)
+        hotspots: Optional hotspots to overlay (from fetch_hotspots)
+    """
+    rows, statuses = get_fast_map_points(grievances or [])
+    if not rows:
+        st.warning("⚠️ No grievances have location coordinates yet")
+        return
+    
+    html = build_fast_map_html(
+        compute_data_version(rows),
+        tuple(sorted((filters or {}).items())),
+        api_base_url,
+        use_clustering,
+        tuple(h.get('id') for h in hotspots or []),
+        rows,
+        statuses,
+        hotspots
+    )
+    components.html(html, height=height + 10)
+    
+    st.caption(f"📊 Showing {len(rows)} grievances on map (click a marker to load details)")
+
+
+# ============ SERVER-SIDE CLUSTERED MAP ============
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_map_clusters(api_base_url, bbox, zoom, statuses=None):
+    """
+    Fetch precomputed clusters for a viewport from the backend
+    
+    Args:
+        api_base_url: Backend base URL
+        bbox: Tuple of (min_lon, min_lat, max_lon, max_lat)
+        zoom: Map zoom level
+        statuses: Optional tuple of statuses to include
+    
+    Returns:
+        Dict with "mode" of "clusters" or "markers"
+    """
+    params = {
+        'bbox': ','.join(f"{v:.5f}" for v in bbox),
+        'zoom': zoom
+    }
+    if statuses:
+        params['status'] = ','.join(statuses)
+    response = requests.get(f"{api_base_url}/map/clusters", params=params, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+def get_cluster_color(by_status):
+    """Colour a cluster by its most common status"""
+    if not by_status:
+        return 'blue'
+    dominant = max(by_status.items(), key=lambda item: item[1])[0]
+    return get_marker_color(dominant)
+
+def create_cluster_map(data, center, zoom_start):
+    """
+    Create a map from server-side cluster aggregates
+    
+    Args:
+        data: Response from the /map/clusters endpoint
+        center: Tuple of (lat, lon) for map center
+        zoom_start: Zoom level the data was fetched for
+    
+    Returns:
+        folium.Map object
+    """
+    m = folium.Map(
+        location=center,
+        zoom_start=zoom_start,
+        tiles='OpenStreetMap',
+        control_scale=True
+    )
+    
+    if data.get('mode') == 'markers':
+        for grievance in data.get('markers', []):
+            status = grievance.get('status', 'Unknown')
+            folium.Marker(
+                location=[grievance['latitude'], grievance['longitude']],
+                popup=folium.Popup(create_popup_html(grievance), max_width=300),
+                tooltip=f"#{grievance.get('id')} - {(grievance.get('title') or 'N/A')[:30]}...",
+                icon=folium.Icon(color=get_marker_color(status), icon=get_marker_icon(status), prefix='fa')
+            ).add_to(m)
+        return m
+    
+    for cluster in data.get('clusters', []):
+        count = cluster['count']
+        breakdown = ', '.join(f"{status}: {n}" for status, n in sorted(cluster['by_status'].items()))
+        folium.CircleMarker(
+            location=[cluster['latitude'], cluster['longitude']],
+            radius=8 + 6 * math.log10(count + 1),
+            color=get_cluster_color(cluster['by_status']),
+            fill=True,
+            fill_opacity=0.6,
+            tooltip=f"{count} grievance(s) - {breakdown}"
+        ).add_to(m)
+        folium.Marker(
+            location=[cluster['latitude'], cluster['longitude']],
+            icon=folium.DivIcon(html=f"""
+                <div style="font-size: 11px; font-weight: bold; color: #1a1a1a;
+                            transform: translate(-50%, -50%); text-align: center;">{count}</div>
+            """)
+        ).add_to(m)
+    
+    return m
+
+def render_cluster_map(api_base_url, statuses=None, height=600, hotspots=None):
+    """
+    Render a server-clustered grievance map in Streamlit
+    
+    Only aggregates for the visible area are fetched. Panning or zooming
+    updates the stored viewport and refetches; above the backend's maximum
+    cluster zoom the API switches to individual markers.
+    
+    Args:
+        api_base_url: Backend base URL
+        statuses: Optional list of statuses to include
+        height: Map height in pixels
+        hotspots: Optional hotspots to overlay (from fetch_hotspots)
+    """
+    view = st.session_state.get(CLUSTER_VIEW_KEY) or {
+        'bbox': INDIA_BBOX,
+        'zoom': 5,
+        'center': get_india_center()
+    }
+    
+    try:
+        data = fetch_map_clusters(api_base_url, view['bbox'], view['zoom'], tuple(statuses) if statuses else None)
+    except Exception as e:
+        st.error(f"Error fetching map clusters: {str(e)}")
+        return
+    
+    m = create_cluster_map(data, view['center'], view['zoom'])
+    if hotspots:
+        add_hotspot_layer(m, hotspots)
+    map_state = st_folium(
+        m,
+        height=height,
+        use_container_width=True,
+        returned_objects=['bounds', 'zoom', 'center'],
+        key='cluster_map'
+    )
+    
+    if data.get('mode') == 'markers':
+        note = " (truncated)" if data.get('truncated') else ""
+        st.caption(f"📍 Showing {len(data.get('markers', []))} individual grievances{note}")
+    else:
+        total = sum(c['count'] for c in data.get('clusters', []))
+        st.caption(f"📊 Showing {total} grievances in {len(data.get('clusters', []))} clusters")
+    
+    # Refetch when the user pans or zooms
+    bounds = (map_state or {}).get('bounds') or {}
+    south_west, north_east = bounds.get('_southWest'), bounds.get('_northEast')
+    if south_west and north_east and south_west.get('lat') is not None and map_state.get('zoom') is not None:
+        new_view = {
+            'bbox': tuple(round(v, 3) for v in (
+                south_west['lng'], south_west['lat'], north_east['lng'], north_east['lat']
+            )),
+            'zoom': int(map_state['zoom']),
+            'center': (map_state['center']['lat'], map_state['center']['lng'])
+        }
+        if new_view['bbox'] != tuple(view['bbox']) or new_view['zoom'] != view['zoom']:
+            st.session_state[CLUSTER_VIEW_KEY] = new_view
+            st.rerun()
+
+
+# ============ DENSITY HEATMAP ============
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_heatmap(api_base_url, category=None, priority=None, days=None, resolution=0.1):
+    """
+    Fetch the grievance density grid from the backend
+    
+    Args:
+        api_base_url: Backend base URL
+        category: Optional category filter
+        priority: Optional priority filter
+        days: Optional window of recent days
+        resolution: Grid cell size in degrees
+    
+    Returns:
+        Dict with "cells" as [lat, lon, count] lists
+    """
+    params = {'resolution': resolution}
+    if category:
+        params['category'] = category
+    if priority:
+        params['priority'] = priority
+    if days:
+        params['days'] = days
+    response = requests.get(f"{api_base_url}/map/heatmap", params=params, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+def create_heatmap_map(heatmap_data, center=None, zoom_start=5):
+    """
+    Create a map with a density heatmap layer from aggregated grid cells
+    
+    Args:
+        heatmap_data: Response from the /map/heatmap endpoint
+        center: Tuple of (lat, lon) for map center. Defaults to India center
+        zoom_start: Initial zoom level
+    
+    Returns:
+        folium.Map object
+    """
+    if center is None:
+        center = get_india_center()
+    
+    m = folium.Map(
+        location=center,
+        zoom_start=zoom_start,
+        tiles='OpenStreetMap',
+        control_scale=True
+    )
+    
+    # Weights are normalised so the densest cell is fully saturated
+    max_count = heatmap_data.get('max_count') or 1
+    points = [[lat, lon, count / max_count] for lat, lon, count in heatmap_data.get('cells', [])]
+    if points:
+        HeatMap(
+            points,
+            name='Grievance Density',
+            min_opacity=0.3,
+            radius=18,
+            blur=15,
+            max_zoom=12
+        ).add_to(m)
+        folium.LayerControl().add_to(m)
+    
+    return m
+
+def render_heatmap(api_base_url, category=None, priority=None, days=None, resolution=0.1, height=600, hotspots=None):
+    """
+    Render a grievance density heatmap in Streamlit
+    
+    Args:
+        api_base_url: Backend base URL
+        category: Optional category filter
+        priority: Optional priority filter
+        days: Optional window of recent days
+        resolution: Grid cell size in degrees
+        height: Map height in pixels
+        hotspots: Optional hotspots to overlay (from fetch_hotspots)
+    """
+    try:
+        data = fetch_heatmap(api_base_url, category, priority, days, resolution)
+    except Exception as e:
+        st.error(f"Error fetching heatmap: {str(e)}")
+        return
+    
+    if not data.get('cells'):
+        st.info("📍 No grievances with location data match these filters")
+        return
+    
+    m = create_heatmap_map(data)
+    if hotspots:
+        add_hotspot_layer(m, hotspots)
+    folium_static(m, width=None, height=height)
+    st.caption(f"🔥 Density of {data.get('total', 0)} grievances in {len(data['cells'])} grid cells of {data.get('resolution')}°")
+
+
+# ============ HOTSPOTS ============
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_hotspots(api_base_url, category=None):
+    """
+    Fetch hotspots found by the latest detection run
+    
+    Args:
+        api_base_url: Backend base URL
+        category: Optional category filter
+    
+    Returns:
+        List of hotspot dicts
+    """
+    params = {'category': category} if category else {}
+    response = requests.get(f"{api_base_url}/map/hotspots", params=params, timeout=10)
+    response.raise_for_status()
+    return response.json().get('hotspots', [])
+
+def add_hotspot_layer(m, hotspots):
+    """
+    Overlay hotspots on a map as a toggleable layer of circles
+    
+    Args:
+        m: folium.Map to draw on
+        hotspots: List of hotspot dicts from the /map/hotspots endpoint
+    
+    Returns:
+        The folium.FeatureGroup holding the circles
+    """
+    layer = folium.FeatureGroup(name='Hotspots', overlay=True, control=True)
+    for hotspot in hotspots:
+        place = hotspot.get('city') or 'Unknown area'
+        popup_html = f"""
+        <div style="font-family: Arial, sans-serif; min-width: 200px;">
+            <h4 style="margin: 0 0 8px 0; color: #c0392b;">🚨 {hotspot.get('category', 'N/A')} hotspot</h4>
+            <p style="margin: 4px 0;"><b>Grievances:</b> {hotspot.get('member_count', 0)}</p>
+            <p style="margin: 4px 0;"><b>Near:</b> {place}</p>
+            <p style="margin: 4px 0;"><b>First reported:</b> {(hotspot.get('first_reported_at') or 'N/A')[:10]}</p>
+            <p style="margin: 4px 0;"><b>Latest:</b> {(hotspot.get('last_reported_at') or 'N/A')[:10]}</p>
+        </div>
+        """
+        # Keep very tight clusters visible at city zoom levels
+        radius_m = max(hotspot.get('radius_km') or 0, 0.2) * 1000
+        folium.Circle(
+            location=[hotspot['latitude'], hotspot['longitude']],
+            radius=radius_m,
+            color='#c0392b',
+            weight=2,
+            fill=True,
+            fill_color='#e74c3c',
+            fill_opacity=0.35,
+            popup=folium.Popup(popup_html, max_width=300),
+            tooltip=f"🚨 {hotspot.get('member_count', 0)} {hotspot.get('category', '')} grievances near {place}"
+        ).add_to(layer)
+    layer.add_to(m)
+    return layer
@@ -1,9 +1,12 @@
 """
 Location Utilities
-Generate mock coordinates for grievances in Indian cities
+Coordinates for grievances in Indian cities
 """
 
 import random
+import requests
+
+API_BASE_URL = "http://127.0.0.1:8000"
 
 # Major Indian cities with coordinates
 INDIAN_CITIES = {
@@ -65,31 +68,45 @@ def generate_random_coordinates(city_name=None):
     
     return (lat, lon, city_name)
 
-def parse_location_to_coordinates(location_text, grievance_id=None):
+def geocode_location(location_text, api_base_url=API_BASE_URL):
     """
-    Parse location text to coordinates
-    For demo, uses mock coordinates based on city keywords
-    Uses grievance_id for consistent city selection if no location provided
+    Look up the known place named in location text via GET /locations/geocode
+    
+    Returns:
+        The matched place (dict with name, latitude, longitude, ...), or None
+        if no place is recognised or the backend is unreachable
     """
-    if not location_text:
-        # Use grievance_id to consistently pick a city
-        if grievance_id is not None:
-            cities = list(INDIAN_CITIES.keys())
-            city_index = grievance_id % len(cities)
-            city_name = cities[city_index]
-        else:
-            city_name = get_random_city()
-        return generate_random_coordinates(city_name)
+    try:
+        response = requests.get(f"{api_base_url}/locations/geocode", params={"q": location_text}, timeout=5)
+        response.raise_for_status()
+        return response.json().get("match")
+    except Exception:
+        return None
+
+def parse_location_to_coordinates(location_text, grievance_id=None, api_base_url=API_BASE_URL):
+    """
+    Parse location text to coordinates
+    Asks the backend's offline gazetteer, so the same text always resolves
+    to the same place with no random jitter.
+    Uses grievance_id for consistent city selection if no place is recognised
     
-    location_lower = location_text.lower()
+    Returns:
+        Tuple of (lat, lon, city_name)
+    """
+    match = geocode_location(location_text, api_base_url) if location_text else None
+    if match is not None:
+        return (match["latitude"], match["longitude"], match["name"])
     
-    # Check if any city name is in the location text
-    for city in INDIAN_CITIES.keys():
-        if city.lower() in location_lower:
-            return generate_random_coordinates(city)
+    if grievance_id is not None:
+        # Use grievance_id to consistently pick a city
+        cities = list(INDIAN_CITIES.keys())
+        city_name = cities[grievance_id % len(cities)]
+    else:
+        # Default to Delhi if no match (capital city)
+        city_name = 'Delhi'
     
-    # Default to Delhi if no match (capital city)
-    return generate_random_coordinates('Delhi')
+    lat, lon = INDIAN_CITIES[city_name]
+    return (lat, lon, city_name)
 
 def get_india_center():
     """Get center coordinates for India"""
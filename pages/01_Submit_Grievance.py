@@ -167,19 +167,73 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from components.location_picker import render_location_picker
 
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_location_suggestions(query):
+    try:
+        response = requests.get(
+            "http://localhost:8000/locations/suggest",
+            params={"q": query, "limit": 8},
+            timeout=5
+        )
+        response.raise_for_status()
+        return response.json().get("suggestions", [])
+    except Exception:
+        return []
+
+# Search for a known place (English, Hindi, Telugu or Tamil spelling)
+location_query = st.text_input(
+    "🔎 Search Your Area",
+    placeholder="e.g., Koramangala, हैदराबाद, சென்னை",
+    help="Start typing a city or locality name and pick it from the suggestions"
+)
+if location_query.strip():
+    suggestions = fetch_location_suggestions(location_query.strip())
+    if suggestions:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            selected_index = st.selectbox(
+                "Suggestions",
+                range(len(suggestions)),
+                format_func=lambda i: suggestions[i]['label'] + (
+                    f" ({suggestions[i]['matched']})" if suggestions[i]['matched'] != suggestions[i]['name'] else ""
+                )
+            )
+        with col2:
+            st.write("")
+            if st.button("📍 Use This Place", type="secondary"):
+                # Only the name is sent; the backend geocodes it with its real
+                # (approximate) confidence. Picked coordinates mean a map click.
+                choice = suggestions[selected_index]
+                st.session_state.picked_lat = None
+                st.session_state.picked_lon = None
+                st.session_state.area_coords = (choice['latitude'], choice['longitude'])
+                st.session_state.location_label = choice['label']
+                st.rerun()
+    else:
+        st.caption("No matching places found - you can still click on the map")
+
 # Render interactive map
-picked_coords = render_location_picker()
+previous_pick = (st.session_state.picked_lat, st.session_state.picked_lon)
+picked_coords = render_location_picker(area=st.session_state.get('area_coords'))
+if picked_coords and picked_coords != previous_pick:
+    # A new map click replaces the place chosen by name
+    st.session_state.area_coords = None
+    st.session_state.location_label = ''
 
 # Show picked coordinates
-if picked_coords:
-    lat, lon = picked_coords
-    st.success(f"✅ Location Marked: {lat:.6f}°N, {lon:.6f}°E")
+if picked_coords or st.session_state.get('area_coords'):
+    if picked_coords:
+        lat, lon = picked_coords
+        st.success(f"✅ Location Marked: {lat:.6f}°N, {lon:.6f}°E")
+    else:
+        st.info(f"📍 Area: {st.session_state.location_label} - click the map to mark the exact spot")
     
     # Optional: Add location description
     col1, col2 = st.columns([3, 1])
     with col1:
         grievance_location = st.text_input(
             "Location Description (Optional)",
+            value=st.session_state.get('location_label', ''),
             placeholder="e.g., Near City Hospital, Main Road",
             help="Add a description to help identify the location"
         )
@@ -187,6 +241,8 @@ if picked_coords:
         if st.button("🗑️ Clear Location", type="secondary"):
             st.session_state.picked_lat = None
             st.session_state.picked_lon = None
+            st.session_state.area_coords = None
+            st.session_state.location_label = ''
             st.rerun()
 else:
     st.info("👆 Click on the map above to mark your location")
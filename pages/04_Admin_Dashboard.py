@@ -248,6 +248,12 @@ try:
         
         st.markdown(f"**Showing {len(filtered_grievances)} of {len(grievances)} grievances**")
         
+        # Categories an admin can correct a grievance to
+        try:
+            analyzer_categories = [*requests.get("http://localhost:8000/admin/analyzer", timeout=10).json().get('categories', []), "General"]
+        except Exception:
+            analyzer_categories = []
+        
         if filtered_grievances:
             for grievance in filtered_grievances[:20]:  # Show latest 20
                 with st.expander(f"📌 {grievance.get('id')} - {grievance.get('title')}"):
@@ -315,11 +321,30 @@ try:
                         )
                     
                     with col2:
-                        st.empty()
+                        current_category = grievance.get('category', 'General')
+                        category_options = analyzer_categories if current_category in analyzer_categories else [current_category, *analyzer_categories]
+                        new_category = st.selectbox(
+                            "Correct Category",
+                            category_options,
+                            index=category_options.index(current_category),
+                            key=f"category_{grievance.get('id')}"
+                        )
                     
                     with col3:
                         if st.button("💾 Save Changes", key=f"save_{grievance.get('id')}"):
                             try:
+                                # Category corrections also train the online category learner
+                                if new_category != current_category:
+                                    response = requests.patch(
+                                        f"http://localhost:8000/grievances/{grievance.get('id')}/category",
+                                        json={"category": new_category, "corrected_by": st.session_state.get('admin_user') or "admin"},
+                                        timeout=10
+                                    )
+                                    if response.status_code == 200:
+                                        st.toast(f"🏷️ Category corrected to {new_category}!", icon="✅")
+                                    else:
+                                        st.error(f"❌ Failed to correct category: {response.status_code}")
+                                
                                 # Call API to update status
                                 response = requests.patch(
                                     f"http://localhost:8000/grievances/{grievance.get('id')}/status",
@@ -411,6 +436,140 @@ except Exception as e:
 
 st.divider()
 
+# Incidents: groups of near-duplicate grievances handled as one work order
+st.markdown("### 🧩 Incidents")
+
+try:
+    incidents_response = requests.get("http://localhost:8000/incidents", timeout=10)
+
+    if incidents_response.status_code == 200:
+        incidents = [i for i in incidents_response.json().get('incidents', []) if i.get('member_count', 0) > 0]
+
+        if not incidents:
+            st.info("No incidents found yet. Run cluster_incidents.py on the backend to group related grievances.")
+        else:
+            st.caption(f"{len(incidents)} incidents · {sum(i['member_count'] for i in incidents)} grouped grievances")
+
+            for incident in incidents:
+                place = incident.get('city') or incident.get('district') or "Unknown location"
+                with st.expander(
+                    f"#{incident['id']} · {incident.get('title') or 'Untitled'} · {incident.get('category')} · "
+                    f"{place} · {incident['member_count']} grievances ({incident['open_count']} open) · {incident.get('status')}"
+                ):
+                    col1, col2 = st.columns([2, 1])
+                    with col1:
+                        incident_status = st.selectbox(
+                            "Update Status of All Grievances",
+                            ["Pending", "In Progress", "Resolved"],
+                            index=["Pending", "In Progress", "Resolved"].index(incident.get('status', 'Pending'))
+                            if incident.get('status') in ["Pending", "In Progress", "Resolved"] else 0,
+                            key=f"incident_status_{incident['id']}"
+                        )
+                    with col2:
+                        if st.button("💾 Apply to Incident", key=f"incident_save_{incident['id']}"):
+                            response = requests.patch(
+                                f"http://localhost:8000/incidents/{incident['id']}/status",
+                                json={"status": incident_status},
+                                timeout=30
+                            )
+                            if response.status_code == 200:
+                                st.toast(f"🔄 {response.json().get('message')}", icon="✅")
+                                st.rerun()
+                            else:
+                                st.error(f"❌ Failed to update incident: {response.status_code}")
+
+except Exception as e:
+    st.markdown(f"""
+        <div class="error-message">
+        ⚠️ Could not load incidents: {str(e)}
+        </div>
+    """, unsafe_allow_html=True)
+
+st.divider()
+
+# Shadow evaluation of candidate analyzers
+st.markdown("### 🧪 Candidate Analyzer Shadow Mode")
+
+try:
+    shadow_response = requests.get("http://localhost:8000/admin/shadow", timeout=10)
+
+    if shadow_response.status_code == 200:
+        shadow = shadow_response.json()
+
+        if not shadow.get('enabled'):
+            st.info("No candidate analyzer is running in shadow mode. Set SHADOW_CANDIDATES on the backend to compare one with the live analyzer.")
+        else:
+            st.caption(
+                f"Sampling {shadow.get('sample_rate', 0):.0%} of submissions · "
+                f"{shadow.get('enqueued', 0)} evaluated · {shadow.get('dropped', 0)} dropped (queue full)"
+            )
+
+            for name, result in shadow.get('agreement', {}).items():
+                st.markdown(f"**{name}**")
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Samples", result.get('samples', 0))
+                with col2:
+                    agreement = result.get('category_agreement')
+                    st.metric("Category Agreement", f"{agreement:.1%}" if agreement is not None else "—")
+                with col3:
+                    agreement = result.get('priority_agreement')
+                    st.metric("Priority Agreement", f"{agreement:.1%}" if agreement is not None else "—")
+
+                with st.expander("View Category Confusion Matrix (rows: live, columns: candidate)"):
+                    confusion = pd.DataFrame(result.get('category_confusion', {})).T.fillna(0).astype(int)
+                    st.dataframe(confusion, use_container_width=True)
+
+                disagreements = result.get('recent_disagreements', [])
+                if disagreements:
+                    with st.expander(f"View Recent Disagreements ({len(disagreements)})"):
+                        st.table(pd.DataFrame([
+                            {
+                                'Grievance': d.get('grievance_id'),
+                                'Live': f"{d['live']['category']} / {d['live']['priority']}",
+                                'Candidate': f"{d['candidate']['category']} / {d['candidate']['priority']}",
+                                'Text': d.get('text', '')
+                            }
+                            for d in reversed(disagreements)
+                        ]))
+
+            # Latency histograms, one column per backend
+            latency = shadow.get('latency', {})
+            if latency:
+                st.markdown("**Analysis Latency by Backend**")
+                histogram = pd.DataFrame({
+                    name: {
+                        (f"≤ {b['le_ms']} ms" if b['le_ms'] is not None else "slower"): b['count']
+                        for b in hist.get('buckets', [])
+                    }
+                    for name, hist in latency.items()
+                })
+                st.bar_chart(histogram)
+                st.table(pd.DataFrame([
+                    {
+                        'Backend': name,
+                        'Samples': hist.get('count', 0),
+                        'Mean (ms)': hist.get('mean_ms'),
+                        'p50 ≤ (ms)': hist.get('p50_ms_le'),
+                        'p99 ≤ (ms)': hist.get('p99_ms_le'),
+                        'Max (ms)': hist.get('max_ms')
+                    }
+                    for name, hist in latency.items()
+                ]))
+
+            if st.button("🔄 Reset Shadow Metrics"):
+                requests.post("http://localhost:8000/admin/shadow/reset", timeout=10)
+                st.rerun()
+
+except Exception as e:
+    st.markdown(f"""
+        <div class="error-message">
+        ⚠️ Could not load shadow evaluation: {str(e)}
+        </div>
+    """, unsafe_allow_html=True)
+
+st.divider()
+
 # Export section
 st.markdown("### 📥 Export Data")
 
@@ -11,9 +11,10 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from components.map_view import render_grievance_map
+from components.map_view import (
+    render_grievance_map, render_fast_grievance_map, render_cluster_map, render_heatmap, fetch_hotspots
+)
 from language_selector import language_selector, t, init_language
-from location_utils import parse_location_to_coordinates
 
 # Initialize language
 init_language()
@@ -72,6 +73,17 @@ def fetch_grievances():
         st.error(f"Error fetching grievances: {str(e)}")
         return []
 
+@st.cache_data(ttl=30)
+def fetch_city_counts(status=None, category=None, priority=None):
+    try:
+        params = {k: v for k, v in {'status': status, 'category': category, 'priority': priority}.items() if v}
+        response = requests.get(f"{API_BASE_URL}/stats/by-city", params=params, timeout=10)
+        response.raise_for_status()
+        return response.json().get("by_city", [])
+    except Exception as e:
+        st.error(f"Error fetching city statistics: {str(e)}")
+        return []
+
 # Get grievances
 grievances = fetch_grievances()
 
@@ -81,29 +93,8 @@ if grievances:
     for g in grievances[:3]:
         st.sidebar.text(f"ID {g.get('id')}: {g.get('latitude', 'NULL')}, {g.get('longitude', 'NULL')}")
 
-# Note: Coordinates should come from database
-# Only generate for old grievances that don't have coordinates
-import random
-for grievance in grievances:
-    # ONLY generate if coordinates are truly missing (None or 0)
-    if (grievance.get('latitude') is None or grievance.get('latitude') == 0 or
-        grievance.get('longitude') is None or grievance.get('longitude') == 0):
-        # Use grievance ID as seed for consistent coordinates
-        random.seed(grievance.get('id', 0))
-        lat, lon, city = parse_location_to_coordinates(
-            grievance.get('location', ''),
-            grievance_id=grievance.get('id', 0)
-        )
-        grievance['latitude'] = lat
-        grievance['longitude'] = lon
-        grievance['city'] = city
-        # Reset random seed
-        random.seed()
-    else:
-        # Use database coordinates (manually marked or previously saved)
-        # Extract city name from location if available
-        grievance['city'] = grievance.get('location', 'Unknown').split(',')[0] if grievance.get('location') else 'Unknown'
-
+# Coordinates are resolved by the backend when a grievance is written (and by
+# migrate_coordinates.py for older rows), so this page does no geocoding
 
 # Sidebar filters
 st.sidebar.markdown("### 🔍 Filters")
@@ -155,31 +146,93 @@ st.sidebar.metric("🟢 Resolved", resolved)
 # Map options
 st.sidebar.markdown("---")
 st.sidebar.markdown("### ⚙️ Map Options")
-use_clustering = st.sidebar.checkbox("Enable Marker Clustering", value=True)
+map_mode = st.sidebar.radio(
+    "Map Mode",
+    ["Server Clusters", "Heatmap", "All Markers"],
+    help="Server Clusters loads precomputed aggregates for the visible area and scales to large datasets"
+)
+if map_mode == "Heatmap":
+    heatmap_days = st.sidebar.slider("Last N Days", 1, 365, 30)
+    heatmap_resolution = st.sidebar.select_slider(
+        "Grid Resolution (°)", options=[0.02, 0.05, 0.1, 0.25, 0.5], value=0.1
+    )
+show_hotspots = st.sidebar.checkbox(
+    "Show Hotspots", value=True,
+    help="Areas where many grievances of one category were reported within days"
+)
+use_clustering = st.sidebar.checkbox("Enable Marker Clustering", value=True, disabled=map_mode != "All Markers")
+fast_rendering = st.sidebar.checkbox(
+    "Fast Rendering", value=True, disabled=map_mode != "All Markers",
+    help="Build markers in the browser and load popup details on click"
+)
 map_height = st.sidebar.slider("Map Height (px)", 400, 800, 600, 50)
 
+# Hotspots from the latest detection run
+hotspots = []
+if show_hotspots:
+    try:
+        hotspots = fetch_hotspots(API_BASE_URL, selected_category if selected_category != 'All' else None)
+    except Exception as e:
+        st.sidebar.warning(f"Hotspots unavailable: {str(e)}")
+
 # Main content
 if filtered_grievances:
+    # Alert on active hotspots
+    for hotspot in hotspots[:3]:
+        st.error(
+            f"🚨 Hotspot: {hotspot['member_count']} {hotspot['category']} grievances within "
+            f"{hotspot['radius_km']:.1f} km near {hotspot.get('city') or 'an unknown area'} "
+            f"since {(hotspot.get('first_reported_at') or '')[:10]}"
+        )
+    
     # Show map
-    render_grievance_map(filtered_grievances, height=map_height, use_clustering=use_clustering)
+    if map_mode == "Server Clusters":
+        if selected_category != 'All' or selected_priority != 'All':
+            st.caption("ℹ️ Server clusters are filtered by status only")
+        render_cluster_map(
+            API_BASE_URL,
+            statuses=[selected_status] if selected_status != 'All' else None,
+            height=map_height,
+            hotspots=hotspots
+        )
+    elif map_mode == "Heatmap":
+        render_heatmap(
+            API_BASE_URL,
+            category=selected_category if selected_category != 'All' else None,
+            priority=selected_priority if selected_priority != 'All' else None,
+            days=heatmap_days,
+            resolution=heatmap_resolution,
+            height=map_height,
+            hotspots=hotspots
+        )
+    elif fast_rendering:
+        render_fast_grievance_map(
+            filtered_grievances,
+            API_BASE_URL,
+            height=map_height,
+            use_clustering=use_clustering,
+            filters={'status': selected_status, 'category': selected_category, 'priority': selected_priority},
+            hotspots=hotspots
+        )
+    else:
+        render_grievance_map(filtered_grievances, height=map_height, use_clustering=use_clustering, hotspots=hotspots)
     
     # Show breakdown by city
     st.markdown("---")
     st.subheader("📍 Grievances by City")
     
-    city_counts = {}
-    for g in filtered_grievances:
-        city = g.get('city', 'Unknown')
-        city_counts[city] = city_counts.get(city, 0) + 1
-    
-    # Sort by count
-    sorted_cities = sorted(city_counts.items(), key=lambda x: x[1], reverse=True)
+    # City is reverse geocoded at submission, so the backend answers with one GROUP BY
+    sorted_cities = fetch_city_counts(
+        status=selected_status if selected_status != 'All' else None,
+        category=selected_category if selected_category != 'All' else None,
+        priority=selected_priority if selected_priority != 'All' else None
+    )
     
     # Display top cities
     cols = st.columns(4)
-    for idx, (city, count) in enumerate(sorted_cities[:8]):
+    for idx, entry in enumerate(sorted_cities[:8]):
         with cols[idx % 4]:
-            st.metric(city, count)
+            st.metric(entry['city'], entry['count'])
     
 else:
     st.info("📍 No grievances match the selected filters")